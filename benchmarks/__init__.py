@@ -0,0 +1,5 @@
+"""
+Benchmarks for silver-garbanzo: synthetic data generation (synthetic.py), stage
+benchmarks (bench_normalize.py, bench_report.py) and the regression-gated suite
+(bench_suite.py).
+"""
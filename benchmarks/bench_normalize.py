@@ -0,0 +1,61 @@
+"""
+bench_normalize.py — Normalize stage benchmark.
+
+Builds a synthetic raw bank export (currency-formatted amounts, parenthesized negatives,
+mixed-case transaction types, untidy descriptions) and times normalize() on it.
+
+Usage:
+    python benchmarks/bench_normalize.py [--rows 5000000] [--seed 0]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+
+def make_raw_frame(rows: int, seed: int = 0):
+    """Return a DataFrame shaped like a raw bank CSV with `rows` rows."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    merchants = np.array(
+        [f"  MERCHANT {i:04d}   STORE #{i % 97}  " for i in range(5000)], dtype=object
+    )
+    cents = rng.integers(1, 500_000, size=rows)
+    formatted = np.array([f"${c // 100:,}.{c % 100:02d}" for c in cents], dtype=object)
+    negative = rng.random(rows) < 0.1
+    formatted[negative] = "(" + formatted[negative] + ")"
+    types = np.array(["DEBIT", "credit", "DR", "Cr", "WITHDRAWAL", "DEPOSIT", "FEE"])
+    dates = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 366, rows), "D")
+    return pd.DataFrame({
+        "Date": dates.strftime("%Y-%m-%d"),
+        "Description": merchants[rng.integers(0, len(merchants), rows)],
+        "Amount": formatted,
+        "Transaction_Type": types[rng.integers(0, len(types), rows)],
+    })
+
+
+def main(argv=None):
+    from silver_garbanzo.normalize import normalize
+
+    parser = argparse.ArgumentParser(description="Benchmark the normalize stage")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"Generating {args.rows:,} rows...")
+    df = make_raw_frame(args.rows, args.seed)
+    start = time.perf_counter()
+    out, warnings = normalize(df, account="bench")
+    elapsed = time.perf_counter() - start
+    print(f"normalize: {elapsed:.2f} s ({len(out) / elapsed:,.0f} rows/s)")
+    for warning in warnings:
+        print(f"  warning: {warning}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+bench_report.py — Period report benchmark.
+
+Builds a decade of synthetic categorized transactions and times period_totals() for
+each frequency and period_reports() for all four at once.
+
+Usage:
+    python benchmarks/bench_report.py [--rows 5000000] [--years 10] [--seed 0]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+
+def make_transactions(rows: int, years: int = 10, seed: int = 0):
+    """Return categorized transactions (date, amount, category, account) spanning `years`."""
+    import numpy as np
+    import pandas as pd
+
+    from silver_garbanzo.schema import ACCOUNT, AMOUNT, CATEGORY, DATE
+
+    rng = np.random.default_rng(seed)
+    categories = [f"Category {i:02d}" for i in range(40)]
+    return pd.DataFrame({
+        DATE: pd.Timestamp("2016-01-01")
+        + pd.to_timedelta(rng.integers(0, 365 * years, rows), "D"),
+        AMOUNT: rng.normal(-25, 150, rows).round(2),
+        CATEGORY: pd.Categorical.from_codes(rng.integers(0, len(categories), rows), categories),
+        ACCOUNT: pd.Categorical.from_codes(
+            rng.integers(0, 3, rows), ["checking", "savings", "card"]
+        ),
+    })
+
+
+def main(argv=None):
+    from silver_garbanzo.report import FREQUENCIES, period_reports, period_totals
+    from silver_garbanzo.schema import CATEGORY
+
+    parser = argparse.ArgumentParser(description="Benchmark period reports")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"Generating {args.rows:,} rows over {args.years} years...")
+    df = make_transactions(args.rows, args.years, args.seed)
+    for freq in FREQUENCIES:
+        start = time.perf_counter()
+        totals = period_totals(df, freq, by=(CATEGORY,))
+        elapsed = time.perf_counter() - start
+        print(f"{freq:>9} by category: {elapsed:.3f} s ({len(totals):,} rows)")
+    start = time.perf_counter()
+    period_reports(df, by=(CATEGORY,))
+    print(f"all frequencies: {time.perf_counter() - start:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
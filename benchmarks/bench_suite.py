@@ -0,0 +1,246 @@
+"""
+bench_suite.py — Benchmark suite with baseline regression gates.
+
+For each scale, generates contract-named synthetic exports (see synthetic.py), a
+registry and a config of matching size, then times:
+
+    ingest                 ingest_batch over every export (fresh registry)
+    ingest_store           the same with the columnar store (only if pyarrow is installed)
+    overlap_check_cold     check_range_overlap with the registry index not yet loaded
+    overlap_check_1000     1,000 check_range_overlap calls against the loaded index
+    registry_append        append_range_registry (rewrite mode)
+    registry_append_journal  append_range_registry (journal mode)
+    config_validation      load_config with no cache (validate and compile every file)
+
+Each timing is the best of --repeat runs. Results are compared against a baseline JSON
+(state/benchmarks/baseline.json by default, local like the rest of state/); a metric
+that is slower than its baseline by more than --tolerance (and by more than 5 ms) is a
+regression and makes the run exit non-zero. --save-baseline records the current results.
+
+Usage:
+    python benchmarks/bench_suite.py [--scales 10k,100k] [--repeat 3] [--tolerance 0.25]
+                                     [--baseline PATH] [--save-baseline]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from typing import NamedTuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import (  # noqa: E402
+    account_names,
+    month_starts,
+    write_config,
+    write_exports,
+    write_registry,
+)
+
+BASELINE_FORMAT = 1
+DEFAULT_BASELINE = os.path.join("state", "benchmarks", "baseline.json")
+# Differences below this are timer noise, whatever the relative change
+MIN_REGRESSION_SECONDS = 0.005
+# Registry ranges per account start in 1900, so at most 100 years fit before the exports
+_MAX_RANGES_PER_ACCOUNT = 1200
+
+
+class Scale(NamedTuple):
+    """Size of one benchmark run."""
+    rows: int
+    accounts: int
+    months: int
+    registry_ranges: int
+    rules: int
+
+
+SCALES = {
+    "10k": Scale(rows=10_000, accounts=4, months=3, registry_ranges=1_000, rules=50),
+    "100k": Scale(rows=100_000, accounts=8, months=12, registry_ranges=5_000, rules=200),
+    "1m": Scale(rows=1_000_000, accounts=16, months=24, registry_ranges=20_000, rules=500),
+    "10m": Scale(rows=10_000_000, accounts=32, months=60, registry_ranges=50_000, rules=1_000),
+}
+
+
+def best_of(repeat: int, run, setup=None) -> float:
+    """Return the fastest of `repeat` timed run() calls; setup() runs untimed before each."""
+    best = float("inf")
+    for i in range(repeat):
+        args = setup(i) if setup is not None else ()
+        start = time.perf_counter()
+        run(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_scale(scale: Scale, workdir: str, repeat: int = 3) -> dict[str, float]:
+    """Generate data for `scale` under `workdir` and return {metric: seconds}."""
+    from silver_garbanzo import overlap
+    from silver_garbanzo.config import load_config
+    from silver_garbanzo.contracts import append_range_registry
+    from silver_garbanzo.ingest import StoreTarget, ingest_batch
+    from silver_garbanzo.overlap import check_range_overlap
+
+    exports = write_exports(
+        os.path.join(workdir, "raw"), scale.rows, scale.accounts, scale.months
+    )
+    config_dir = os.path.join(workdir, "config")
+    write_config(config_dir, scale.rules, overrides=scale.rules, splits=scale.rules // 10)
+    registry_accounts = max(scale.accounts, -(-scale.registry_ranges // _MAX_RANGES_PER_ACCOUNT))
+    registry = os.path.join(workdir, "registry", "ingested_ranges.csv")
+    write_registry(registry, scale.registry_ranges, registry_accounts)
+    results = {}
+
+    def fresh_registry(i):
+        path = os.path.join(workdir, f"ingest-{i}", "ingested_ranges.csv")
+        shutil.copyfile(registry, _makedirs_for(path))
+        return (path,)
+
+    def ingest(path, store=None):
+        with redirect_stdout(io.StringIO()):
+            result = ingest_batch(exports, registry_path=path, store=store)
+        if result.rejected:
+            raise RuntimeError(f"Benchmark ingest rejected files: {result.rejected[:3]}")
+
+    results["ingest"] = best_of(repeat, ingest, fresh_registry)
+    config = load_config(config_dir, write_cache=False)
+    try:
+        from silver_garbanzo.store import require_pyarrow
+
+        require_pyarrow()
+    except RuntimeError:
+        pass
+    else:
+        def ingest_store(path):
+            ingest(path, StoreTarget(config, os.path.join(os.path.dirname(path), "store")))
+
+        results["ingest_store"] = best_of(repeat, ingest_store, fresh_registry)
+
+    # New ranges after the generated exports, one per account, never overlapping
+    probe_start = month_starts(scale.months + 1)[-1]
+    probes = [
+        (account, probe_start, probe_start.replace(day=28))
+        for account in account_names(registry_accounts)
+    ]
+
+    def cold_check():
+        overlap._INDEX_CACHE.clear()
+        check_range_overlap(*probes[0], registry_path=registry)
+
+    def warm_checks():
+        for i in range(1000):
+            check_range_overlap(*probes[i % len(probes)], registry_path=registry)
+
+    results["overlap_check_cold"] = best_of(repeat, cold_check)
+    results["overlap_check_1000"] = best_of(repeat, warm_checks)
+
+    for metric, journal in (("registry_append", False), ("registry_append_journal", True)):
+        def append(path, journal=journal):
+            account, start, end = probes[0]
+            append_range_registry(account, start, end, "probe.csv", path, journal=journal)
+
+        results[metric] = best_of(repeat, append, fresh_registry)
+
+    results["config_validation"] = best_of(
+        repeat, lambda: load_config(config_dir, write_cache=False)
+    )
+    return results
+
+
+def _makedirs_for(path: str) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[tuple]:
+    """
+    Compare {scale: {metric: seconds}} results against a baseline's results.
+    Returns:
+        (scale, metric, baseline_seconds, seconds) for each regression: slower than the
+        baseline by more than `tolerance` (a fraction) and by more than 5 ms.
+    """
+    regressions = []
+    for scale, metrics in results.items():
+        for metric, seconds in metrics.items():
+            base = baseline.get(scale, {}).get(metric)
+            if base is None:
+                continue
+            if seconds > base * (1 + tolerance) and seconds - base > MIN_REGRESSION_SECONDS:
+                regressions.append((scale, metric, base, seconds))
+    return regressions
+
+
+def load_baseline(path: str) -> dict:
+    """Return the baseline's {scale: {metric: seconds}}, or {} if there is none."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if data.get("format") != BASELINE_FORMAT:
+        raise ValueError(f"Unsupported benchmark baseline format in {path}")
+    return data["results"]
+
+
+def save_baseline(path: str, results: dict) -> None:
+    """Merge `results` into the baseline at `path` (other scales are kept)."""
+    merged = load_baseline(path)
+    merged.update(results)
+    data = {
+        "format": BASELINE_FORMAT,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": merged,
+    }
+    with open(_makedirs_for(path), "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument(
+        "--scales", default="10k,100k", help=f"Comma-separated scales ({', '.join(SCALES)})"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    names = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in names if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+    baseline = load_baseline(args.baseline)
+    results = {}
+    for name in names:
+        print(f"[{name}] generating {SCALES[name].rows:,} rows...")
+        workdir = tempfile.mkdtemp(prefix=f"sg-bench-{name}-")
+        try:
+            results[name] = run_scale(SCALES[name], workdir, args.repeat)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        for metric, seconds in results[name].items():
+            base = baseline.get(name, {}).get(metric)
+            change = f"{(seconds / base - 1) * 100:+6.1f}%" if base else "    new"
+            print(f"[{name}] {metric:<24} {seconds:9.4f} s  {change}")
+
+    regressions = compare(results, baseline, args.tolerance)
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+    for scale, metric, base, seconds in regressions:
+        print(f"[REGRESSION] {scale} {metric}: {seconds:.4f} s vs baseline {base:.4f} s")
+    return 1 if regressions and not args.save_baseline else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
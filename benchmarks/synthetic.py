@@ -0,0 +1,151 @@
+"""
+synthetic.py — Synthetic bank exports and state for benchmarks.
+
+Generates CSV exports that follow the filename contract (`<account>__YYYY-MM.csv`, every
+date inside the month), with realistic description cardinality: merchants are drawn from
+a Zipf distribution over a pool that grows with the data, and a share of rows carry
+unique reference numbers, as transfers and checks do in real exports. Also builds
+registries and config directories of a given size.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+# Share of rows whose description is unique (transfer/check reference numbers)
+UNIQUE_SHARE = 0.05
+_PREFIXES = ("POS PURCHASE", "CHECKCARD", "ACH DEBIT", "RECURRING", "ONLINE PMT")
+_MERCHANTS = (
+    "GROCERY MART", "FUEL STOP", "COFFEE HOUSE", "PHARMACY", "HARDWARE", "BOOKSTORE",
+    "PIZZERIA", "STREAMING", "TELECOM", "UTILITY CO", "INSURANCE", "GYM", "TAXI",
+    "AIRLINE", "HOTEL", "PET SUPPLY", "DEPT STORE", "ELECTRONICS", "BAKERY", "CINEMA",
+)
+_CITIES = ("SPRINGFIELD", "RIVERTON", "LAKEWOOD", "FAIRVIEW", "MADISON", "GEORGETOWN")
+
+
+def account_names(count: int) -> list[str]:
+    """Return `count` distinct account names."""
+    return [f"acct{i:03d}" for i in range(count)]
+
+
+def month_starts(count: int, first: str = "2020-01") -> list[datetime]:
+    """Return `count` consecutive month starts beginning with `first` (YYYY-MM)."""
+    year, month = map(int, first.split("-"))
+    starts = []
+    for _ in range(count):
+        starts.append(datetime(year, month, 1))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return starts
+
+
+def merchant_pool(size: int, rng) -> list[str]:
+    """Return `size` distinct merchant descriptions."""
+    return [
+        f"{_PREFIXES[rng.integers(len(_PREFIXES))]} "
+        f"{_MERCHANTS[i % len(_MERCHANTS)]} #{i // len(_MERCHANTS):04d} "
+        f"{_CITIES[rng.integers(len(_CITIES))]}"
+        for i in range(size)
+    ]
+
+
+def make_export(rows: int, month_start: datetime, rng, merchants: list[str]):
+    """
+    Return one month of raw export rows (Date, Description, Amount, Transaction_Type).
+    Amounts are magnitudes; Transaction_Type carries the sign, as in most bank exports.
+    """
+    import numpy as np
+    import pandas as pd
+
+    start = pd.Timestamp(month_start)
+    days = start.days_in_month
+    dates = np.sort(rng.integers(0, days, rows))
+    picks = np.minimum(rng.zipf(1.3, rows) - 1, len(merchants) - 1)
+    descriptions = np.asarray(merchants, dtype=object)[picks]
+    unique = rng.random(rows) < UNIQUE_SHARE
+    refs = rng.integers(10**8, 10**9, int(unique.sum()))
+    descriptions[unique] = [f"TRANSFER REF {r}" for r in refs]
+    credit = rng.random(rows) < 0.15
+    amounts = np.round(rng.lognormal(3.2, 1.1, rows), 2)
+    amounts[credit] *= 20
+    return pd.DataFrame({
+        "Date": (start + pd.to_timedelta(dates, "D")).strftime("%Y-%m-%d"),
+        "Description": descriptions,
+        "Amount": amounts,
+        "Transaction_Type": np.where(credit, "CREDIT", "DEBIT"),
+    })
+
+
+def write_exports(
+    directory: str, rows: int, accounts: int = 4, months: int = 12, seed: int = 0,
+    first_month: str = "2020-01",
+) -> list[str]:
+    """
+    Write `rows` transactions as accounts × months contract-named CSV exports.
+    Returns:
+        The CSV paths, sorted.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    merchants = merchant_pool(min(50_000, max(500, rows // 200)), rng)
+    os.makedirs(directory, exist_ok=True)
+    files = [(a, m) for a in account_names(accounts) for m in month_starts(months, first_month)]
+    per_file = np.full(len(files), rows // len(files))
+    per_file[: rows % len(files)] += 1
+    paths = []
+    for (account, month), count in zip(files, per_file):
+        path = os.path.join(directory, f"{account}__{month:%Y-%m}.csv")
+        make_export(int(count), month, rng, merchants).to_csv(
+            path, index=False, float_format="%.2f"
+        )
+        paths.append(path)
+    return sorted(paths)
+
+
+def write_registry(path: str, ranges: int, accounts: int = 4, first_month: str = "1900-01"):
+    """
+    Write a registry of `ranges` non-overlapping monthly ranges spread over `accounts`.
+    Ranges start at `first_month`, well before generated exports, so they never overlap.
+    """
+    from silver_garbanzo.contracts import FilenameRange, append_ranges_registry
+
+    names = account_names(accounts)
+    per_account = -(-ranges // accounts)
+    starts = month_starts(per_account + 1, first_month)
+    entries = []
+    for i in range(ranges):
+        account = names[i % accounts]
+        n = i // accounts
+        entries.append(FilenameRange(
+            account,
+            starts[n],
+            starts[n + 1] - timedelta(days=1),
+            f"{account}__{starts[n]:%Y-%m}.csv",
+        ))
+    append_ranges_registry(entries, path)
+    return entries
+
+
+def write_config(directory: str, rules: int, overrides: int = 0, splits: int = 0, seed: int = 0):
+    """Write rules.json (and overrides.csv/splits.csv if requested) of the given sizes."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "rules.json"), "w", encoding="utf-8") as f:
+        json.dump([
+            {"category": f"Category {i % 40:02d}",
+             "pattern": f"{_MERCHANTS[i % len(_MERCHANTS)]} #{i:04d}"}
+            for i in range(rules)
+        ], f)
+    if overrides:
+        with open(os.path.join(directory, "overrides.csv"), "w", encoding="utf-8") as f:
+            f.write("key,category\n")
+            f.writelines(f"TRANSFER REF {10**8 + i},Transfers\n" for i in range(overrides))
+    if splits:
+        with open(os.path.join(directory, "splits.csv"), "w", encoding="utf-8") as f:
+            f.write("fingerprint,category,amount\n")
+            f.writelines(
+                f"{rng.integers(2**63):016x},Category {i % 40:02d},{i % 100}.50\n"
+                for i in range(splits)
+            )
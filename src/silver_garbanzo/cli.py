@@ -4,23 +4,179 @@ cli.py — Command-line interface entry point.
 
 This module provides the CLI for Silver Garbanzo, handling argument parsing, config validation,
 and invoking the ingestion process. It is the user-facing entry point for all operations.
+
+Heavy modules (pandas, via ingest) are imported inside the command functions, after
+argument parsing and config validation, so `--help` and fast-fail paths start quickly.
 """
 
 import argparse
 import os
-import time
-import tracemalloc
+import sys
+from functools import partial
 
-from .ingest import ingest
+COMMANDS = ("ingest", "recategorize", "report", "watch", "serve", "submit", "registry")
 
 
+def _cache_dir(registry_path=None):
+    """Return the cache directory, next to the registry (state/cache)."""
+    from .contracts import default_registry_path
 
-def run_cli(args=None):
+    registry_path = (
+        registry_path
+        or os.environ.get("SILVER_GARBANZO_REGISTRY_PATH")
+        or default_registry_path()
+    )
+    return os.path.join(os.path.dirname(os.path.abspath(registry_path)), "cache")
+
+
+def _load_config(dry_run=False):
     """
-    Run the Silver Garbanzo CLI. Accepts an optional list of arguments for testability.
+    Validate and compile the config, or print every problem and exit.
+    The validation cache (see _cache_dir) is only read, never written, in dry-run mode.
+    """
+    from .config import ConfigError, load_config
+
+    try:
+        return load_config(cache_dir=_cache_dir(), write_cache=not dry_run)
+    except ConfigError as e:
+        _print_config_errors(e.errors)
+        exit(1)
+
+
+def _print_config_errors(errors, note=None):
+    """Print a config validation failure with one line per problem."""
+    print(f"[CONFIG VALIDATION FAILED] {note}" if note else "[CONFIG VALIDATION FAILED]")
+    for err in errors:
+        print(f"  - {err}")
+
+
+def _report_batch(result, csv_paths):
+    """Print warnings, rejections and, for multi-file runs, a per-account summary."""
+    from .ingest import summarize_batch
+
+    for csv_path, warning in result.warnings:
+        if len(csv_paths) > 1:
+            print(f"[WARNING] {os.path.basename(csv_path)}: {warning}")
+        else:
+            print(f"[WARNING] {warning}")
+    for csv_path, error in result.rejected:
+        if len(csv_paths) > 1:
+            print(f"[ERROR] {os.path.basename(csv_path)}: {error}")
+        else:
+            print(f"[ERROR] {error}")
+    if len(csv_paths) > 1:
+        for account, (ok, bad) in summarize_batch(result).items():
+            print(f"[SUMMARY] {account}: {ok} accepted, {bad} rejected")
+
+
+def _report_event(prefix, config_note, event, payload):
+    """
+    The report(event, payload) callback of watch and serve, bound with partial: `prefix`
+    tags their own messages and `config_note` says what happens while the config is broken.
+    """
+    if event == "config" and payload is None:
+        print(f"{prefix} Config changed; reloaded")
+    elif event == "config":
+        _print_config_errors(payload.errors, config_note)
+    else:
+        result, paths = payload
+        _report_batch(result, paths)
+    sys.stdout.flush()
+
+
+def _config_watcher(registry_path=None):
+    """
+    Return a ConfigWatcher for long-running commands, with the config already loaded, or
+    print every problem and exit. The validation cache lives next to the registry.
+    """
+    from .config import ConfigError
+    from .watch import ConfigWatcher
+
+    config_watcher = ConfigWatcher(cache_dir=_cache_dir(registry_path))
+    try:
+        config_watcher.get()
+    except ConfigError as e:
+        _print_config_errors(e.errors)
+        exit(1)
+    return config_watcher
+
+
+def _store_dir(registry_path=None):
+    """Return the store directory, or print why the store is unavailable and exit."""
+    from .store import default_store_dir, require_pyarrow
+
+    try:
+        require_pyarrow()
+    except RuntimeError as e:
+        print(f"[ERROR] {e}")
+        exit(1)
+    return default_store_dir(registry_path)
+
+
+def _profile(run, json_path=None, cprofile_path=None):
+    """
+    Run `run()` under a per-stage Profiler and print (or write) the profile.
+    Peak memory is the process's peak RSS; tracemalloc is only used where RSS is not
+    available, since it slows down every allocation.
+    """
+    from .profiling import Profiler, format_report, peak_rss
+
+    print("[PROFILE] Profiling ingest performance and memory usage...")
+    tracing = peak_rss() is None
+    if tracing:
+        import tracemalloc
+
+        tracemalloc.start()
+    profiler = Profiler()
+    cprofile = None
+    if cprofile_path:
+        import cProfile
+
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+    try:
+        with profiler.activate():
+            result = run()
+    finally:
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(cprofile_path)
+    report = profiler.report()
+    if tracing:
+        report["peak_rss_bytes"] = None
+        report["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    peak = report["peak_rss_bytes"] or report.get("peak_traced_bytes", 0)
+    print(f"[PROFILE] Time elapsed: {report['total_seconds']:.3f} seconds")
+    print(f"[PROFILE] Peak memory usage: {peak / 1024:.1f} KiB")
+    for line in format_report(report):
+        print(line)
+    if cprofile_path:
+        print(f"[PROFILE] cProfile stats written to {cprofile_path}")
+    if json_path:
+        import json
+
+        if json_path == "-":
+            print(json.dumps(report))
+        else:
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"[PROFILE] JSON profile written to {json_path}")
+    return result
+
+
+def run_ingest(args):
+    """
+    Validate and ingest one or more CSV files (the default command).
     """
-    parser = argparse.ArgumentParser(description="Silver Garbanzo CLI")
-    parser.add_argument("csv_file", help="Path to CSV file to ingest")
+    parser = argparse.ArgumentParser(
+        prog="silver-garbanzo ingest", description="Silver Garbanzo CLI"
+    )
+    parser.add_argument(
+        "csv_files",
+        nargs="+",
+        help="CSV files, directories, or glob patterns (e.g. 'data/raw/**/*.csv') to ingest",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -29,45 +185,47 @@ def run_cli(args=None):
     parser.add_argument(
         "--profile",
         action="store_true",
-        help="Profile ingest performance and memory usage",
+        help="Profile ingest performance and memory usage, per stage",
+    )
+    parser.add_argument(
+        "--profile-json",
+        metavar="PATH",
+        help="Write the per-stage profile as JSON to PATH ('-' for stdout); implies --profile",
+    )
+    parser.add_argument(
+        "--profile-cprofile",
+        metavar="PATH",
+        help="Also run cProfile and dump its stats to PATH (read with pstats); implies --profile",
+    )
+    parser.add_argument(
+        "--journal",
+        action="store_true",
+        help="Record ranges with a crash-safe journal append instead of a registry rewrite",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Validate files in N worker processes (overlap checks and commits stay serial)",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        metavar="ROWS",
+        help="Stream each CSV in chunks of ROWS rows to bound peak memory on large exports",
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help="Also normalize, categorize and write transactions to the columnar store "
+        "(state/store; requires pyarrow)",
     )
     parsed_args = parser.parse_args(args)
 
     # Validate config files before proceeding (fail fast if any are missing or malformed)
-    from .config_validation import validate_overrides_csv, validate_rules_json, validate_splits_csv
-    config_dir = os.environ.get("SILVER_GARBANZO_CONFIG_DIR")
-    if not config_dir:
-        config_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config")
-    errors = []
-    # rules.json (required): must exist and be valid
-    rules_path = os.path.join(config_dir, "rules.json")
-    if os.path.exists(rules_path):
-        try:
-            validate_rules_json(rules_path)
-        except Exception as e:
-            errors.append(str(e))
-    else:
-        errors.append("Missing required config: rules.json")
-    # overrides.csv (optional): validate if present
-    overrides_path = os.path.join(config_dir, "overrides.csv")
-    if os.path.exists(overrides_path):
-        try:
-            validate_overrides_csv(overrides_path)
-        except Exception as e:
-            errors.append(str(e))
-    # splits.csv (optional): validate if present
-    splits_path = os.path.join(config_dir, "splits.csv")
-    if os.path.exists(splits_path):
-        try:
-            validate_splits_csv(splits_path)
-        except Exception as e:
-            errors.append(str(e))
-    # If any config errors were found, print and exit
-    if errors:
-        print("[CONFIG VALIDATION FAILED]")
-        for err in errors:
-            print(f"  - {err}")
-        exit(1)
+    config = _load_config(parsed_args.dry_run)
 
     # Indicate dry-run mode to the user
     if parsed_args.dry_run:
@@ -76,31 +234,497 @@ def run_cli(args=None):
     # Support test isolation: allow registry path override via env var
     registry_path = os.environ.get("SILVER_GARBANZO_REGISTRY_PATH")
 
+    from .ingest import discover_inputs, ingest_batch, store_target
+
+    csv_paths = discover_inputs(parsed_args.csv_files)
+    if not csv_paths:
+        print(f"[ERROR] No CSV files match: {' '.join(parsed_args.csv_files)}")
+        exit(1)
+
+    store = None
+    if parsed_args.store:
+        store = store_target(config, _store_dir(registry_path), _cache_dir(registry_path))
+
+    run = partial(
+        ingest_batch,
+        csv_paths,
+        dry_run=parsed_args.dry_run,
+        registry_path=registry_path if registry_path else None,
+        journal=parsed_args.journal,
+        jobs=parsed_args.jobs,
+        chunksize=parsed_args.chunksize,
+        store=store,
+    )
+    if parsed_args.profile or parsed_args.profile_json or parsed_args.profile_cprofile:
+        result = _profile(run, parsed_args.profile_json, parsed_args.profile_cprofile)
+    else:
+        result = run()
+    _report_batch(result, csv_paths)
+    if result.rejected:
+        exit(1)
+
+
+def run_recategorize(args):
+    """
+    Bring stored transactions up to date with the current rules and overrides.
+    """
+    parser = argparse.ArgumentParser(
+        prog="silver-garbanzo recategorize",
+        description="Re-categorize stored transactions after rules.json or overrides.csv change",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report how many rows would change without rewriting the store",
+    )
+    parsed_args = parser.parse_args(args)
+    config = _load_config(parsed_args.dry_run)
+    if parsed_args.dry_run:
+        print("[DRY-RUN] No state or output files will be written.")
+
+    from .recategorize import recategorize_store
+
+    store_dir = _store_dir(os.environ.get("SILVER_GARBANZO_REGISTRY_PATH"))
+    result = recategorize_store(store_dir, config, dry_run=parsed_args.dry_run)
+    if result.files_updated and not parsed_args.dry_run:
+        from .rollups import refresh_rollups
+
+        refresh_rollups(store_dir, config)
+    prefix = "[DRY-RUN] Would recategorize" if parsed_args.dry_run else "Recategorized"
+    print(
+        f"{prefix}: {result.rows_changed} of {result.rows} rows changed category "
+        f"({result.files_updated} of {result.files} files out of date)"
+    )
+
+
+def run_report(args):
+    """
+    Print period totals (and optionally uncategorized transactions) from the store.
+    """
+    from .report import FREQUENCIES
+
+    parser = argparse.ArgumentParser(
+        prog="silver-garbanzo report",
+        description="Report spend, income, net and count by period from the transaction store",
+    )
+    parser.add_argument(
+        "--freq",
+        choices=list(FREQUENCIES),
+        default="monthly",
+        help="Report period (default: monthly)",
+    )
+    parser.add_argument(
+        "--by-category",
+        action="store_true",
+        help="Total by period and category instead of by period only",
+    )
+    parser.add_argument(
+        "--account",
+        action="append",
+        metavar="ACCOUNT",
+        help="Only report this account (may be repeated)",
+    )
+    parser.add_argument(
+        "--uncategorized",
+        action="store_true",
+        help="Also list uncategorized transactions",
+    )
+    parser.add_argument(
+        "--rule-stats",
+        action="store_true",
+        help="Also list matches and throughput per rules.json rule over stored descriptions",
+    )
+    parsed_args = parser.parse_args(args)
+    config = _load_config()
+    store_dir = _store_dir(os.environ.get("SILVER_GARBANZO_REGISTRY_PATH"))
+
+    from .report import period_totals, rollup, uncategorized
+    from .rollups import refresh_rollups, rollup_frame
+    from .schema import ACCOUNT, AMOUNT, CATEGORY, DATE, DESCRIPTION, FINGERPRINT
+    from .splits import apply_splits
+    from .store import read_store
+
+    by = (CATEGORY,) if parsed_args.by_category else ()
+    df = None
+    warnings = []
+    # Weeks straddle months and listings need rows, so those read transactions
+    if parsed_args.freq == "weekly" or parsed_args.uncategorized:
+        columns = [DATE, AMOUNT, CATEGORY, ACCOUNT, DESCRIPTION]
+        if config.splits:
+            columns.append(FINGERPRINT)
+        df = read_store(store_dir, columns=columns, accounts=parsed_args.account)
+        if config.splits:
+            df, warnings = apply_splits(df, config.splits)
+    if parsed_args.freq == "weekly":
+        totals = period_totals(df, parsed_args.freq, by)
+    else:
+        rollups, rollup_warnings = refresh_rollups(
+            store_dir, config, accounts=parsed_args.account
+        )
+        # A listing already applied splits to the same transactions; don't warn twice
+        seen = set(warnings)
+        warnings = warnings + [w for w in rollup_warnings if w not in seen]
+        totals = rollup(rollup_frame(rollups, parsed_args.account), parsed_args.freq, by)
+    for warning in warnings:
+        print(f"[WARNING] {warning}")
+    if totals.empty:
+        print("No stored transactions to report (ingest with --store first).")
+        return
+    print(totals.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+    if parsed_args.uncategorized:
+        listing = uncategorized(df.drop(columns=[FINGERPRINT], errors="ignore"))
+        print(f"\nUncategorized transactions: {len(listing)}")
+        if not listing.empty:
+            print(listing.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+    if parsed_args.rule_stats:
+        from .categorize import categorize, rule_stats
+        from .schema import RULE_ID
+
+        # Stored rule ids may predate the current rules, so match the descriptions again
+        descriptions = read_store(store_dir, columns=[DESCRIPTION], accounts=parsed_args.account)
+        matched, _ = categorize(descriptions, config.rules, config.overrides)
+        stats = rule_stats(matched[DESCRIPTION], matched[RULE_ID], config.rules)
+        print(f"\nRule matches over {len(matched)} stored transactions:")
+        print(stats.to_string(
+            index=False,
+            formatters={"share": "{:.1%}".format, "rows_per_sec": "{:,.0f}".format},
+        ))
+
+
+def run_watch(args):
+    """
+    Watch a directory and ingest CSV exports as they land, keeping config and registry warm.
+    """
+    parser = argparse.ArgumentParser(
+        prog="silver-garbanzo watch",
+        description="Ingest new CSV exports from a directory as they appear (Ctrl-C to stop)",
+    )
+    parser.add_argument(
+        "directory",
+        nargs="?",
+        default=os.path.join("data", "raw"),
+        help="Directory to watch, recursively (default: data/raw)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=2.0,
+        metavar="SECONDS",
+        help="Seconds between directory polls (default: 2)",
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="Only ingest files unmodified for this long (default: 1)",
+    )
+    parser.add_argument(
+        "--journal",
+        action="store_true",
+        help="Record ranges with a crash-safe journal append instead of a registry rewrite",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1, metavar="N", help="Validate files in N worker processes"
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=None, metavar="ROWS", help="Stream CSVs in chunks"
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help="Also write transactions to the columnar store (requires pyarrow)",
+    )
+    parsed_args = parser.parse_args(args)
+    if not os.path.isdir(parsed_args.directory):
+        print(f"[ERROR] Not a directory: {parsed_args.directory}")
+        exit(1)
+
+    from .watch import watch
+
+    registry_path = os.environ.get("SILVER_GARBANZO_REGISTRY_PATH")
+    config_watcher = _config_watcher(registry_path)
+    store_dir = _store_dir(registry_path) if parsed_args.store else None
+
+    report = partial(_report_event, "[WATCH]", "New files wait until the config is fixed")
+    print(f"[WATCH] Watching {parsed_args.directory} for new CSV files (Ctrl-C to stop)")
+    sys.stdout.flush()
+    try:
+        watch(
+            parsed_args.directory,
+            report,
+            registry_path=registry_path,
+            interval=parsed_args.interval,
+            settle=parsed_args.settle,
+            journal=parsed_args.journal,
+            jobs=parsed_args.jobs,
+            chunksize=parsed_args.chunksize,
+            store_dir=store_dir,
+            config_watcher=config_watcher,
+        )
+    except KeyboardInterrupt:
+        print("[WATCH] Stopped")
+
+
+def run_serve(args):
+    """
+    Serve ingest requests from concurrent local submitters, committing them one at a time.
+    """
+    parser = argparse.ArgumentParser(
+        prog="silver-garbanzo serve",
+        description="Accept ingest requests on a local socket and commit them through one "
+        "writer (Ctrl-C to stop)",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Unix socket to listen on (default: ingest.sock next to the registry)",
+    )
+    parser.add_argument(
+        "--journal",
+        action="store_true",
+        help="Record ranges with a crash-safe journal append instead of a registry rewrite",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Validate files in N shared worker processes (commits stay serial)",
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=None, metavar="ROWS", help="Stream CSVs in chunks"
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help="Also write transactions to the columnar store (requires pyarrow)",
+    )
+    parsed_args = parser.parse_args(args)
+
+    from .server import IngestServer
+
+    registry_path = os.environ.get("SILVER_GARBANZO_REGISTRY_PATH")
+    config_watcher = _config_watcher(registry_path)
+    store_dir = _store_dir(registry_path) if parsed_args.store else None
+
+    report = partial(_report_event, "[SERVE]", "Requests fail until the config is fixed")
+    import pandas  # noqa: F401  (imported once so the first request does not pay for it)
+
+    server = IngestServer(
+        parsed_args.socket,
+        registry_path=registry_path,
+        jobs=parsed_args.jobs,
+        chunksize=parsed_args.chunksize,
+        journal=parsed_args.journal,
+        store_dir=store_dir,
+        config_watcher=config_watcher,
+        report=report,
+    )
     try:
-        if parsed_args.profile:
-            print("[PROFILE] Profiling ingest performance and memory usage...")
-            tracemalloc.start()
-            start_time = time.perf_counter()
-            ingest(
-                parsed_args.csv_file,
-                dry_run=parsed_args.dry_run,
-                registry_path=registry_path if registry_path else None,
+        server.bind()
+    except RuntimeError as e:
+        server.close()
+        print(f"[ERROR] {e}")
+        exit(1)
+    print(f"[SERVE] Listening on {server.socket_path} (Ctrl-C to stop)")
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("[SERVE] Stopped")
+    finally:
+        server.close()
+
+
+def run_submit(args):
+    """
+    Submit CSV files to a running ingest server and report the result like `ingest`.
+    """
+    parser = argparse.ArgumentParser(
+        prog="silver-garbanzo submit",
+        description="Ingest CSV files through a running `silver-garbanzo serve`",
+    )
+    parser.add_argument(
+        "csv_files",
+        nargs="+",
+        help="CSV files, directories, or glob patterns (e.g. 'data/raw/**/*.csv') to ingest",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Run all validations and overlap checks but do not write any state",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Server socket (default: ingest.sock next to the registry)",
+    )
+    parsed_args = parser.parse_args(args)
+
+    from .ingest import discover_inputs
+    from .server import batch_result, default_socket_path, submit
+
+    csv_paths = discover_inputs(parsed_args.csv_files)
+    if not csv_paths:
+        print(f"[ERROR] No CSV files match: {' '.join(parsed_args.csv_files)}")
+        exit(1)
+    socket_path = parsed_args.socket or default_socket_path(
+        os.environ.get("SILVER_GARBANZO_REGISTRY_PATH")
+    )
+    try:
+        response = submit(csv_paths, socket_path, dry_run=parsed_args.dry_run)
+    except (OSError, RuntimeError) as e:
+        print(f"[ERROR] {e}")
+        exit(1)
+    if not response["ok"]:
+        print(f"[ERROR] {response['error']}")
+        for err in response.get("errors", []):
+            print(f"  - {err}")
+        exit(1)
+    result = batch_result(response)
+    for r in result.accepted:
+        if parsed_args.dry_run:
+            print(
+                f"[DRY-RUN] Would append to registry: {r.account}, "
+                f"{r.start_date.date()}-{r.end_date.date()}, {r.filename}"
             )
-            end_time = time.perf_counter()
-            current, peak = tracemalloc.get_traced_memory()
-            tracemalloc.stop()
-            print(f"[PROFILE] Time elapsed: {end_time - start_time:.3f} seconds")
-            print(f"[PROFILE] Peak memory usage: {peak / 1024:.1f} KiB")
         else:
-            ingest(
-                parsed_args.csv_file,
-                dry_run=parsed_args.dry_run,
-                registry_path=registry_path if registry_path else None,
-            )
-    except ValueError as e:
-        print(f"[ERROR] {e}")
+            print(f"Ingested: {r.filename} ({r.start_date.date()}-{r.end_date.date()})")
+    _report_batch(result, csv_paths)
+    if result.rejected:
         exit(1)
 
+
+def _date(value):
+    """argparse type for YYYY-MM-DD dates."""
+    from datetime import datetime
+
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a YYYY-MM-DD date: {value!r}")
+
+
+def run_registry(args):
+    """
+    Query the range registry: coverage gaps, coverage statistics, and who covers a date.
+    """
+    parser = argparse.ArgumentParser(
+        prog="silver-garbanzo registry",
+        description="Inspect the ingested-range registry",
+    )
+    queries = parser.add_subparsers(dest="query", required=True, metavar="QUERY")
+    period = argparse.ArgumentParser(add_help=False)
+    period.add_argument(
+        "--account",
+        action="append",
+        metavar="NAME",
+        help="Only this account (repeatable; default: every account in the registry)",
+    )
+    period.add_argument(
+        "--from",
+        dest="start_date",
+        type=_date,
+        metavar="YYYY-MM-DD",
+        help="Period start (default: each account's first covered day)",
+    )
+    period.add_argument(
+        "--to",
+        dest="end_date",
+        type=_date,
+        metavar="YYYY-MM-DD",
+        help="Period end (default: each account's last covered day)",
+    )
+    queries.add_parser(
+        "gaps", parents=[period], help="List days no ingested file covers, per account"
+    )
+    queries.add_parser(
+        "coverage",
+        parents=[period],
+        help="Per account: ranges, first and last ingested date, covered and gap days",
+    )
+    who = queries.add_parser("who-covers", help="Show which file covers each date")
+    who.add_argument("dates", nargs="+", type=_date, metavar="YYYY-MM-DD")
+    who.add_argument(
+        "--account", action="append", metavar="NAME", help="Only this account (repeatable)"
+    )
+    parsed_args = parser.parse_args(args)
+
+    from .registry import coverage, coverage_gaps, who_covers
+
+    registry_path = os.environ.get("SILVER_GARBANZO_REGISTRY_PATH")
+    if parsed_args.query == "who-covers":
+        found = who_covers(
+            parsed_args.dates, accounts=parsed_args.account, registry_path=registry_path
+        )
+        for date in sorted(set(parsed_args.dates)):
+            matches = [c for c in found if c.date == date]
+            if not matches:
+                print(f"{date.date()}: not covered")
+            for c in matches:
+                print(
+                    f"{date.date()}: {c.account} {c.source_file} "
+                    f"({c.start_date.date()}-{c.end_date.date()})"
+                )
+        return
+    query = dict(
+        accounts=parsed_args.account,
+        start_date=parsed_args.start_date,
+        end_date=parsed_args.end_date,
+        registry_path=registry_path,
+    )
+    if parsed_args.query == "gaps":
+        gaps = coverage_gaps(**query)
+        for g in gaps:
+            print(f"{g.account}: {g.start_date.date()} to {g.end_date.date()} ({g.days} days)")
+        print(
+            f"[SUMMARY] {len(gaps)} gap(s), {sum(g.days for g in gaps)} uncovered day(s)"
+            if gaps
+            else "No coverage gaps"
+        )
+        return
+    rows = coverage(**query)
+    if not rows:
+        print("The registry records no ranges")
+        return
+    width = max(len("account"), *(len(r.account) for r in rows))
+    print(
+        f"{'account':<{width}}  {'ranges':>6}  {'first':<10}  {'last':<10}  "
+        f"{'covered_days':>12}  {'gap_days':>8}"
+    )
+    for r in rows:
+        first = r.first_date.date().isoformat() if r.first_date else "-"
+        last = r.last_date.date().isoformat() if r.last_date else "-"
+        print(
+            f"{r.account:<{width}}  {r.ranges:>6}  {first:<10}  {last:<10}  "
+            f"{r.covered_days:>12}  {r.gap_days:>8}"
+        )
+
+
+def run_cli(args=None):
+    """
+    Run the Silver Garbanzo CLI. Accepts an optional list of arguments for testability.
+    The first argument may name a command (see COMMANDS); without one, `ingest` is run.
+    """
+    args = list(sys.argv[1:] if args is None else args)
+    command = args.pop(0) if args and args[0] in COMMANDS else "ingest"
+    if command == "ingest":
+        run_ingest(args)
+    elif command == "recategorize":
+        run_recategorize(args)
+    elif command == "report":
+        run_report(args)
+    elif command == "watch":
+        run_watch(args)
+    elif command == "serve":
+        run_serve(args)
+    elif command == "submit":
+        run_submit(args)
+    elif command == "registry":
+        run_registry(args)
+
+
 def main():
     run_cli()
 
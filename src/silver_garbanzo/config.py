@@ -0,0 +1,199 @@
+"""
+config.py — Config loading.
+
+This module validates and parses the config files once and returns compiled objects that
+later stages use directly: rules.json becomes CompiledRules, overrides.csv becomes
+CompiledOverrides, and splits.csv becomes a map of fingerprint -> [(category, amount)].
+
+Validated results are cached on disk (state/cache/config.pickle by default). The cache is
+keyed by each file's path, mtime, size and SHA-256 digest: an unchanged stat skips the
+file entirely, and a touched-but-identical file is re-hashed but not re-validated. The
+cache is private local state; it is never written in dry-run mode.
+"""
+
+import gc
+import os
+import pickle
+import tempfile
+import time
+from typing import NamedTuple
+
+from .categorize import (
+    CompiledOverrides,
+    CompiledRules,
+    combine_digests,
+    compile_overrides,
+    compile_rules,
+    file_sha256,
+)
+from .config_validation import (
+    VALIDATION_VERSION,
+    RowErrors,
+    validate_overrides_csv,
+    validate_rules_json,
+    validate_splits_csv,
+)
+
+RULES_FILE = "rules.json"
+OVERRIDES_FILE = "overrides.csv"
+SPLITS_FILE = "splits.csv"
+CACHE_FILE = "config.pickle"
+# Bump when the cached objects change shape so stale caches are ignored. Caches are also
+# ignored when written under another config_validation.VALIDATION_VERSION.
+CACHE_FORMAT = 2
+# A file modified this recently could change again within the same mtime tick without
+# changing size, so its stat stamp is not trusted (it is re-hashed on the next load)
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+class ConfigError(RuntimeError):
+    """Config validation failed; `errors` holds one message per invalid or missing file."""
+
+    def __init__(self, errors: list[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+class Config(NamedTuple):
+    """Validated, compiled config."""
+    rules: CompiledRules
+    overrides: CompiledOverrides | None
+    splits: dict[str, list[tuple[str, float]]]
+    file_digests: dict[str, str]
+    digest: str
+
+
+def default_config_dir() -> str:
+    """Return the config directory: $SILVER_GARBANZO_CONFIG_DIR or config/ in the repo root."""
+    config_dir = os.environ.get("SILVER_GARBANZO_CONFIG_DIR")
+    if config_dir:
+        return config_dir
+    return os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "config"))
+
+
+def _load_rules(path):
+    return compile_rules(validate_rules_json(path))
+
+
+def _load_overrides(path):
+    return compile_overrides(validate_overrides_csv(path))
+
+
+def _load_splits(path):
+    splits = {}
+    # Millions of new lists and tuples would trigger repeated full collections, none of
+    # which can free anything while the rows are read and the map is built
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for fingerprint, category, amount in validate_splits_csv(path):
+            parts = splits.get(fingerprint)
+            if parts is None:
+                splits[fingerprint] = [(category, amount)]
+            else:
+                parts.append((category, amount))
+    finally:
+        if enabled:
+            gc.enable()
+    return splits
+
+
+# file name -> (loader, required)
+_LOADERS = {
+    RULES_FILE: (_load_rules, True),
+    OVERRIDES_FILE: (_load_overrides, False),
+    SPLITS_FILE: (_load_splits, False),
+}
+
+
+def _read_cache(cache_path):
+    try:
+        with open(cache_path, "rb") as f:
+            cache = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("format") != CACHE_FORMAT:
+        return {}
+    if cache.get("validation") != VALIDATION_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def _write_cache(cache_path, entries):
+    cache_dir = os.path.dirname(cache_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    with tempfile.NamedTemporaryFile("wb", delete=False, dir=cache_dir) as tf:
+        pickle.dump(
+            {"format": CACHE_FORMAT, "validation": VALIDATION_VERSION, "files": entries}, tf
+        )
+        temp_path = tf.name
+    os.replace(temp_path, cache_path)
+
+
+def load_config(config_dir: str = None, cache_dir: str = None, write_cache: bool = True) -> Config:
+    """
+    Validate and compile rules.json (required), overrides.csv and splits.csv (optional).
+    Args:
+        config_dir: Directory holding the config files (default: see default_config_dir).
+        cache_dir: Directory for the validation cache; None disables the cache.
+        write_cache: If False, an existing cache is used but never created or updated.
+    Returns:
+        Config with compiled objects; `digest` identifies the rules and overrides contents.
+    Raises:
+        ConfigError: Listing every missing required file and every validation failure
+            (every bad row, for overrides.csv and splits.csv).
+    """
+    if config_dir is None:
+        config_dir = default_config_dir()
+    cache_path = os.path.join(cache_dir, CACHE_FILE) if cache_dir else None
+    cached = _read_cache(cache_path) if cache_path else {}
+    entries = {}
+    loaded = {}
+    digests = {}
+    errors = []
+    changed = False
+    for name, (loader, required) in _LOADERS.items():
+        path = os.path.abspath(os.path.join(config_dir, name))
+        if not os.path.exists(path):
+            if required:
+                errors.append(f"Missing required config: {name}")
+            loaded[name] = None
+            digests[name] = ""
+            continue
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if time.time_ns() - st.st_mtime_ns < _RACY_WINDOW_NS:
+            stamp = None
+        entry = cached.get(path)
+        if entry is None or stamp is None or entry["stamp"] != stamp:
+            sha256 = file_sha256(path)
+            if entry is None or entry["sha256"] != sha256:
+                try:
+                    value = loader(path)
+                except RowErrors as e:
+                    errors.extend(e.errors)
+                    continue
+                except Exception as e:
+                    errors.append(str(e))
+                    continue
+                entry = {"sha256": sha256, "value": value}
+            entry = dict(entry, stamp=stamp)
+            changed = True
+        entries[path] = entry
+        loaded[name] = entry["value"]
+        digests[name] = entry["sha256"]
+    if errors:
+        raise ConfigError(errors)
+    if cache_path and write_cache and (changed or set(entries) != set(cached)):
+        try:
+            _write_cache(cache_path, entries)
+        except OSError:
+            # The cache only saves time; failing to write it must not fail the run
+            pass
+    return Config(
+        rules=loaded[RULES_FILE],
+        overrides=loaded[OVERRIDES_FILE],
+        splits=loaded[SPLITS_FILE] or {},
+        file_digests=digests,
+        digest=combine_digests(digests[RULES_FILE], digests[OVERRIDES_FILE]),
+    )
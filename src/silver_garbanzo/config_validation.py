@@ -28,31 +28,177 @@ def validate_rules_json(path):
                 raise ValueError(f"rules.json item {i} pattern regex error: {e}")
     except Exception as e:
         raise RuntimeError(f"rules.json: {e}")
+    return data
+
+class RowErrors(RuntimeError):
+    """A config CSV has invalid rows; `errors` holds one message per problem found."""
+
+    def __init__(self, errors: list[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+# Bump whenever a validator accepts less than before (new checks), so config files
+# validated and cached by an older version are validated again
+VALIDATION_VERSION = 2
+# Rows listed per kind of problem; further rows with the same problem are only counted
+MAX_REPORTED_ROWS = 20
+
+
+def _read_config_csv(path, name, columns):
+    """
+    Open a config CSV whose header must be exactly `columns`.
+    Uses the csv module, not pandas: config is validated before any CSV work starts, and
+    the CLI's fast-fail paths must not pay for the pandas import.
+    Returns:
+        Iterator of (row, fields) per non-blank record after the header, numbered from 2
+        like the file's lines. Fields are not stripped, and missing ones are absent. A
+        record the csv module cannot parse raises RuntimeError while iterating.
+    """
+    f = open(path, newline='', encoding='utf-8')
+    reader = csv.reader(f)
+    try:
+        header = next(reader, None)
+    except csv.Error as e:
+        f.close()
+        raise ValueError(f"malformed header: {e}")
+    if header != columns:
+        f.close()
+        raise ValueError(f"{name} must have headers: {','.join(columns)}")
+    return _records(f, reader, name)
+
+
+def _records(f, reader, name):
+    with f:
+        row = 1
+        try:
+            for fields in reader:
+                if fields:
+                    row += 1
+                    yield row, fields
+        except csv.Error as e:
+            raise RuntimeError(f"{name}: malformed row {row + 1}: {e}")
+
+
+def _row_errors(name, problems) -> list[str]:
+    """
+    Return `<name>: row N <problem>` for (row, problem) pairs, listing at most
+    MAX_REPORTED_ROWS.
+    """
+    errors = [f"{name}: row {row} {problem}" for row, problem in problems[:MAX_REPORTED_ROWS]]
+    if len(problems) > MAX_REPORTED_ROWS:
+        errors.append(
+            f"{name}: ... and {len(problems) - MAX_REPORTED_ROWS:,} more rows like: "
+            f"{problems[0][1]}"
+        )
+    return errors
+
+
+def _duplicate_errors(name, first_rows, repeats, describe) -> list[str]:
+    """
+    Return `<name>: rows N, M: <describe(key)>` per repeated key, in order of first use.
+    Args:
+        first_rows: key -> row of its first use.
+        repeats: key -> rows of its later uses, for repeated keys only.
+    """
+    groups = sorted(repeats.items(), key=lambda item: first_rows[item[0]])
+    errors = [
+        f"{name}: rows {', '.join(map(str, [first_rows[key], *rows]))}: {describe(key)}"
+        for key, rows in groups[:MAX_REPORTED_ROWS]
+    ]
+    if len(groups) > MAX_REPORTED_ROWS:
+        errors.append(f"{name}: ... and {len(groups) - MAX_REPORTED_ROWS:,} more duplicates")
+    return errors
+
+
+def _extra_fields(fields, width):
+    return f"has extra field(s): {','.join(fields[width:])}"
+
 
 def validate_overrides_csv(path):
+    """
+    Validate overrides.csv in one pass, reporting every bad row at once.
+    Every row needs a non-empty key and category, and a key may appear only once (the
+    first of several matching keys wins, so a repeated key makes its later categories
+    dead entries that look live).
+    Returns:
+        List of {'key': ..., 'category': ...} dicts, in file order.
+    Raises:
+        RuntimeError: For a bad header or malformed file; RowErrors (listing each
+            problem) for bad rows.
+    """
+    name = "overrides.csv"
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            if reader.fieldnames != ['key', 'category']:
-                raise ValueError("overrides.csv must have headers: key,category")
-            for i, row in enumerate(reader):
-                if 'key' not in row or 'category' not in row:
-                    raise ValueError(f"overrides.csv row {i+2} missing 'key' or 'category'")
+        records = _read_config_csv(path, name, ['key', 'category'])
     except Exception as e:
         raise RuntimeError(f"overrides.csv: {e}")
+    missing, extra = [], []
+    first_rows, repeats = {}, {}
+    overrides = []
+    for row, fields in records:
+        if len(fields) > 2:
+            extra.append((row, _extra_fields(fields, 2)))
+        key, category = (fields + ['', ''])[:2]
+        if not key or not category:
+            missing.append((row, "missing 'key' or 'category'"))
+            continue
+        first = first_rows.setdefault(key, row)
+        if first != row:
+            repeats.setdefault(key, []).append(row)
+        overrides.append({'key': key, 'category': category})
+    errors = _row_errors(name, missing) + _row_errors(name, extra)
+    errors += _duplicate_errors(name, first_rows, repeats, lambda key: f"duplicate key {key!r}")
+    if errors:
+        raise RowErrors(errors)
+    return overrides
+
 
 def validate_splits_csv(path):
+    """
+    Validate splits.csv in one pass, reporting every bad row at once.
+    A fingerprint may be split into several categories, but into each only once.
+    Returns:
+        List of (fingerprint, category, amount) tuples with amount as a float, in file
+        order.
+    Raises:
+        RuntimeError: For a bad header or malformed file; RowErrors (listing each
+            problem) for bad rows.
+    """
+    name = "splits.csv"
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            if reader.fieldnames != ['fingerprint', 'category', 'amount']:
-                raise ValueError("splits.csv must have headers: fingerprint,category,amount")
-            for i, row in enumerate(reader):
-                if 'fingerprint' not in row or 'category' not in row or 'amount' not in row:
-                    raise ValueError(f"splits.csv row {i+2} missing required fields")
-                try:
-                    float(row['amount'])
-                except ValueError:
-                    raise ValueError(f"splits.csv row {i+2} amount not a float: {row['amount']}")
+        records = _read_config_csv(path, name, ['fingerprint', 'category', 'amount'])
     except Exception as e:
         raise RuntimeError(f"splits.csv: {e}")
+    missing, bad_amounts, extra = [], [], []
+    first_rows, repeats = {}, {}
+    splits = []
+    for row, fields in records:
+        if len(fields) > 3:
+            extra.append((row, _extra_fields(fields, 3)))
+        fingerprint, category, text = (fields + ['', '', ''])[:3]
+        if not fingerprint or not category or not text:
+            missing.append((row, "missing required fields"))
+            continue
+        try:
+            amount = float(text)
+        except ValueError:
+            amount = None
+        # float() accepts "nan", which is no amount either
+        if amount is None or amount != amount:
+            bad_amounts.append((row, f"amount not a float: {text}"))
+        key = (fingerprint, category)
+        first = first_rows.setdefault(key, row)
+        if first != row:
+            repeats.setdefault(key, []).append(row)
+        splits.append((fingerprint, category, amount))
+    errors = _row_errors(name, missing) + _row_errors(name, bad_amounts)
+    errors += _row_errors(name, extra)
+    errors += _duplicate_errors(
+        name,
+        first_rows,
+        repeats,
+        lambda key: f"duplicate split of fingerprint {key[0]!r} into {key[1]!r}",
+    )
+    if errors:
+        raise RowErrors(errors)
+    return splits
@@ -11,11 +11,16 @@ contracts and safety for ingest operations.
 
 
 import csv
+import io
 import os
 import re
 import tempfile
+import zlib
 from datetime import datetime, timedelta
-from typing import NamedTuple
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 REQUIRED_HEADERS = ["Date", "Description", "Amount", "Transaction_Type"]
 
@@ -37,32 +42,80 @@ def validate_csv_headers(headers: list[str]) -> None:
     # if extra:
     #     raise ValueError(f"Unexpected header(s): {extra}. Required: {REQUIRED_HEADERS}")
 
-def validate_csv_date_range(rows: list[dict], start_date, end_date) -> None:
+def find_out_of_range_dates(rows, start_date, end_date, row_offset: int = 0):
     """
-    Validate that all dates in the CSV fall within the declared filename range.
+    Parse the 'Date' column and locate rows outside the declared range.
+
+    The column is parsed in one vectorized call and invalid or out-of-range rows are
+    located with boolean masks, so large exports never go through a per-row Python loop.
     Args:
-        rows: List of dicts, each representing a CSV row with a 'Date' field.
+        rows: DataFrame with a 'Date' column (a list of row dicts is also accepted).
         start_date: datetime, start of allowed range (inclusive)
         end_date: datetime, end of allowed range (inclusive)
+        row_offset: Number of data rows preceding `rows` in the file, so that row
+            numbers stay file-relative when a file is validated in chunks.
+    Returns:
+        (dates, out_of_range): the parsed dates as a datetime64 Series aligned with the
+        input rows, and a list of (row number, raw date) for rows outside the range.
     Raises:
-        ValueError: If any row's date is outside the allowed range.
+        ValueError: If any row's date is invalid.
     """
-    out_of_range = []
-    for i, row in enumerate(rows):
-        try:
-            # Parse the date string in each row
-            date = datetime.strptime(row["Date"], "%Y-%m-%d")
-        except Exception as e:
-            # Raise a clear error if the date format is invalid
-            raise ValueError(f"Row {i+1}: Invalid date format '{row['Date']}' ({e})")
-        # Check if the date is within the allowed range
-        if not (start_date <= date <= end_date):
-            out_of_range.append((i+1, row["Date"]))
+    # pandas is imported on first use so filename checks stay fast (see cli startup)
+    import numpy as np
+    import pandas as pd
+
+    if not isinstance(rows, pd.DataFrame):
+        rows = pd.DataFrame(list(rows), columns=["Date"])
+    raw = rows["Date"]
+    dates = pd.to_datetime(raw, format="%Y-%m-%d", errors="coerce")
+    invalid = dates.isna().to_numpy()
+    if invalid.any():
+        # Only rows pandas could not parse fall back to strptime: this reproduces the
+        # exact error text for the first bad row and keeps strptime's leniency
+        # (e.g. non-padded months) for any row pandas rejected but strptime accepts.
+        for i in np.flatnonzero(invalid):
+            value = raw.iat[i]
+            try:
+                parsed = datetime.strptime(value, "%Y-%m-%d")
+            except Exception as e:
+                # Raise a clear error if the date format is invalid
+                raise ValueError(
+                    f"Row {row_offset + i + 1}: Invalid date format '{value}' ({e})"
+                )
+            dates.iat[i] = parsed
+    # Check that every date is within the allowed range
+    outside = ((dates < start_date) | (dates > end_date)).to_numpy()
+    positions = np.flatnonzero(outside)
+    out_of_range = list(
+        zip((positions + row_offset + 1).tolist(), raw.iloc[positions].tolist())
+    )
+    return dates, out_of_range
+
+
+def raise_out_of_range(out_of_range: list) -> None:
+    """Raise the contract error for out-of-range rows, if there are any."""
     if out_of_range:
         # Report all out-of-range dates at once
         raise ValueError(f"CSV contains dates outside filename-declared range: {out_of_range}")
 
 
+def validate_csv_date_range(rows, start_date, end_date) -> "pd.Series":
+    """
+    Validate that all dates in the CSV fall within the declared filename range.
+    Args:
+        rows: DataFrame with a 'Date' column (a list of row dicts is also accepted).
+        start_date: datetime, start of allowed range (inclusive)
+        end_date: datetime, end of allowed range (inclusive)
+    Returns:
+        The parsed 'Date' column as a datetime64 Series, aligned with the input rows.
+    Raises:
+        ValueError: If any row's date is invalid or outside the allowed range.
+    """
+    dates, out_of_range = find_out_of_range_dates(rows, start_date, end_date)
+    raise_out_of_range(out_of_range)
+    return dates
+
+
 
 
 class FilenameRange(NamedTuple):
@@ -147,53 +200,269 @@ def parse_filename_range(filename: str) -> FilenameRange:
         f"<account>__YYYY-MM-DD__YYYY-MM-DD.csv"
     )
 
-def append_range_registry(
-    account: str,
-    start_date: datetime,
-    end_date: datetime,
-    source_file: str,
-    registry_path: str = None
-) -> None:
+REGISTRY_HEADERS = ["account", "start_date", "end_date", "source_file", "ingested_at"]
+
+# Journal mode: each append is one fsync'd line "<seq>,<row fields>,<crc32>" in
+# <registry>.journal; compaction folds the journal back into the canonical CSV.
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_COMPACT_THRESHOLD = 1000
+
+
+def default_registry_path() -> str:
+    """Return the canonical registry path (state/ingested_ranges.csv in the repo root)."""
+    registry_path = os.path.join(
+        os.path.dirname(__file__), '..', '..', 'state', 'ingested_ranges.csv'
+    )
+    return os.path.normpath(registry_path)
+
+
+def registry_version(registry_path: str = None) -> tuple:
     """
-    Append a successfully ingested range to the registry CSV atomically.
+    Return a cheap version stamp for the registry (canonical CSV plus journal).
+    The stamp changes whenever either file is appended to, rewritten, or replaced.
+    """
+    if registry_path is None:
+        registry_path = default_registry_path()
+    stamp = []
+    for path in (registry_path, registry_path + JOURNAL_SUFFIX):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            stamp.append(None)
+        else:
+            stamp.append((st.st_ino, st.st_size, st.st_mtime_ns))
+    return tuple(stamp)
+
+
+def _journal_line(seq: int, row: list[str]) -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator='').writerow([seq, *row])
+    payload = buf.getvalue()
+    return f"{payload},{zlib.crc32(payload.encode('utf-8')):08x}\n".encode('utf-8')
+
+
+def _read_journal(journal_path: str) -> tuple[list[list[str]], int]:
+    """
+    Read the valid prefix of a registry journal.
+    Returns:
+        (rows, valid_bytes): journal rows in sequence order, and the byte length of the
+        valid prefix. A torn or corrupt tail (crash mid-append) ends the prefix.
+    """
+    try:
+        with open(journal_path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return [], 0
+    rows = []
+    offset = 0
+    while offset < len(data):
+        end = data.find(b'\n', offset)
+        if end < 0:
+            break
+        payload, _, crc = data[offset:end].rpartition(b',')
+        if not payload or crc != b'%08x' % zlib.crc32(payload):
+            break
+        fields = next(csv.reader([payload.decode('utf-8')]))
+        if fields[0] != str(len(rows) + 1) or len(fields) != len(REGISTRY_HEADERS) + 1:
+            break
+        rows.append(fields[1:])
+        offset = end + 1
+    return rows, offset
+
+
+def _fsync_dir(path: str) -> None:
+    # Make a newly created or replaced directory entry durable (not supported on Windows)
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def read_range_registry(registry_path: str = None) -> list[dict]:
+    """
+    Read every recorded range from the registry CSV and its journal, if any.
     Args:
-        account: Account name
-        start_date: Range start (datetime)
-        end_date: Range end (datetime)
-        source_file: Source filename
         registry_path: Path to registry CSV (default: state/ingested_ranges.csv)
+    Returns:
+        List of row dicts keyed by REGISTRY_HEADERS, canonical rows first and then
+        journal rows. Empty if the registry does not exist yet.
     """
     if registry_path is None:
-        registry_path = os.path.join(
-            os.path.dirname(__file__), '..', '..', 'state', 'ingested_ranges.csv'
-        )
-        registry_path = os.path.normpath(registry_path)
-    state_dir = os.path.dirname(registry_path)
-    os.makedirs(state_dir, exist_ok=True)
-    ingested_at = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-    row = [
-        account,
-        start_date.strftime('%Y-%m-%d'),
-        end_date.strftime('%Y-%m-%d'),
-        source_file,
-        ingested_at,
-    ]
-    # Read existing rows
+        registry_path = default_registry_path()
     rows = []
     if os.path.isfile(registry_path):
         with open(registry_path, newline='', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            rows = list(reader)
-    if not rows:
-        rows = [['account', 'start_date', 'end_date', 'source_file', 'ingested_at']]
-    rows.append(row)
-    # Write to temp file
+            rows = list(csv.DictReader(f))
+    journal_rows, _ = _read_journal(registry_path + JOURNAL_SUFFIX)
+    if journal_rows:
+        # A crash between compaction's replace and its journal unlink leaves journal
+        # rows that are already in the canonical CSV; they sit at its tail.
+        tail = {tuple(r[h] for h in REGISTRY_HEADERS) for r in rows[-len(journal_rows):]}
+        for fields in journal_rows:
+            if tuple(fields) not in tail:
+                rows.append(dict(zip(REGISTRY_HEADERS, fields)))
+    return rows
+
+
+def _write_registry(rows: list[dict], registry_path: str) -> None:
+    """Write the full registry to a temp file, fsync it, and atomically replace the CSV."""
+    state_dir = os.path.dirname(registry_path)
     with tempfile.NamedTemporaryFile(
         'w', delete=False, dir=state_dir, newline='', encoding='utf-8'
     ) as tf:
-        writer = csv.writer(tf)
+        writer = csv.DictWriter(tf, fieldnames=REGISTRY_HEADERS, extrasaction='ignore')
+        writer.writeheader()
         writer.writerows(rows)
+        tf.flush()
+        os.fsync(tf.fileno())
         temp_path = tf.name
     # Atomically replace registry
     os.replace(temp_path, registry_path)
+    _fsync_dir(state_dir)
+
+
+def compact_range_registry(registry_path: str = None) -> None:
+    """
+    Fold the registry journal into the canonical CSV (atomic replace), then drop it.
+    Crash-safe at every step: readers skip journal rows already present in the CSV.
+    """
+    from .locks import registry_write_lock
+
+    if registry_path is None:
+        registry_path = default_registry_path()
+    with registry_write_lock(registry_path):
+        _compact_registry(registry_path)
+
+
+def _compact_registry(registry_path: str) -> None:
+    journal_path = registry_path + JOURNAL_SUFFIX
+    if not os.path.exists(journal_path):
+        return
+    _write_registry(read_range_registry(registry_path), registry_path)
+    os.remove(journal_path)
+    _fsync_dir(os.path.dirname(registry_path))
+
+
+def _append_journal(rows: list[list[str]], registry_path: str) -> None:
+    journal_path = registry_path + JOURNAL_SUFFIX
+    existing, valid_bytes = _read_journal(journal_path)
+    created = not os.path.exists(journal_path)
+    seq = len(existing)
+    lines = []
+    for row in rows:
+        seq += 1
+        lines.append(_journal_line(seq, row))
+    fd = os.open(journal_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        # Drop a torn tail left by a crash so the new records follow the valid prefix
+        if os.fstat(fd).st_size != valid_bytes:
+            os.ftruncate(fd, valid_bytes)
+        os.lseek(fd, valid_bytes, os.SEEK_SET)
+        os.write(fd, b''.join(lines))
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    if created:
+        _fsync_dir(os.path.dirname(registry_path))
+    if seq >= JOURNAL_COMPACT_THRESHOLD:
+        _compact_registry(registry_path)
+
+
+class RegistryConflict(RuntimeError):
+    """The registry changed after the caller's overlap checks (see append_ranges_registry)."""
+
+
+def append_ranges_registry(
+    ranges: list[FilenameRange],
+    registry_path: str = None,
+    journal: bool = False,
+    expected_version: tuple = None,
+) -> tuple:
+    """
+    Append several ingested ranges to the registry in one atomic write.
+    The write holds the registry write lock (see locks.py), so concurrent appends from
+    other processes are never lost.
+    Args:
+        ranges: FilenameRange entries (account, start_date, end_date, filename) to record.
+        registry_path: Path to registry CSV (default: state/ingested_ranges.csv)
+        journal: Append fsync'd, checksummed records to <registry>.journal instead of
+            rewriting the CSV; the journal is compacted every JOURNAL_COMPACT_THRESHOLD
+            records, so an append costs the same regardless of registry size.
+        expected_version: registry_version() the caller checked overlaps against. If the
+            registry has changed since, nothing is written.
+    Returns:
+        The registry version after the write.
+    Raises:
+        RegistryConflict: If the registry no longer has `expected_version`; re-check
+            against the current registry and retry.
+    """
+    from .locks import registry_write_lock
+
+    if registry_path is None:
+        registry_path = default_registry_path()
+    with registry_write_lock(registry_path):
+        version = registry_version(registry_path)
+        if expected_version is not None and version != expected_version:
+            raise RegistryConflict(f"Registry {registry_path} changed during the ingest")
+        if not ranges:
+            return version
+        _append_ranges(ranges, registry_path, journal)
+        return registry_version(registry_path)
+
 
+def _append_ranges(ranges: list[FilenameRange], registry_path: str, journal: bool) -> None:
+    state_dir = os.path.dirname(registry_path)
+    os.makedirs(state_dir, exist_ok=True)
+    ingested_at = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    new_rows = [
+        [
+            r.account,
+            r.start_date.strftime('%Y-%m-%d'),
+            r.end_date.strftime('%Y-%m-%d'),
+            r.filename,
+            ingested_at,
+        ]
+        for r in ranges
+    ]
+    if journal:
+        _append_journal(new_rows, registry_path)
+        return
+    # Rewrite mode: fold any pending journal in first, as its own crash-safe step. Appending
+    # in the same rewrite would put the new rows after the journal's, where readers'
+    # duplicate check (which looks at the CSV's tail) cannot find them after a crash
+    # before the journal is removed.
+    _compact_registry(registry_path)
+    rows = read_range_registry(registry_path)
+    rows.extend(dict(zip(REGISTRY_HEADERS, row)) for row in new_rows)
+    _write_registry(rows, registry_path)
+
+
+def append_range_registry(
+    account: str,
+    start_date: datetime,
+    end_date: datetime,
+    source_file: str,
+    registry_path: str = None,
+    journal: bool = False
+) -> None:
+    """
+    Append a successfully ingested range to the registry CSV atomically.
+    Args:
+        account: Account name
+        start_date: Range start (datetime)
+        end_date: Range end (datetime)
+        source_file: Source filename
+        registry_path: Path to registry CSV (default: state/ingested_ranges.csv)
+        journal: Use a journal append instead of a rewrite (see append_ranges_registry).
+    """
+    append_ranges_registry(
+        [FilenameRange(account, start_date, end_date, source_file)],
+        registry_path,
+        journal=journal,
+    )
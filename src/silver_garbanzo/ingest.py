@@ -1,51 +1,588 @@
-
 """
 ingest.py — Ingestion orchestration.
 
 This module coordinates the ingestion process, including loading CSVs, validating
 headers and date ranges, checking for overlaps, and updating the registry. It acts as
 the main entry point for ingest operations, delegating validation and contract logic to
-other modules.
+other modules. With a StoreTarget, files are also normalized, fingerprinted and
+categorized, and their transactions written to the columnar store (see store.py).
+
+pandas is imported inside the functions that read CSVs, so filename contract failures
+and other fast-fail paths never pay its import cost.
 """
 
+import glob
 import os
-
-import pandas as pd
+import re
+from functools import partial
+from typing import TYPE_CHECKING, NamedTuple
 
 from .contracts import (
-    append_range_registry,
+    FilenameRange,
+    RegistryConflict,
+    append_ranges_registry,
+    default_registry_path,
+    find_out_of_range_dates,
     parse_filename_range,
+    raise_out_of_range,
+    registry_version,
     validate_csv_date_range,
     validate_csv_headers,
 )
-from .overlap import check_range_overlap
+from .locks import account_locks
+from .overlap import (
+    RangeIndex,
+    record_ranges,
+    versioned_range_index,
+)
+from .profiling import Profiler, stage
+
+if TYPE_CHECKING:
+    from .categorize import CategoryCache
+    from .config import Config
+
+
+class BatchResult(NamedTuple):
+    """
+    Outcome of a batch ingest: accepted ranges, (path, error) for rejected files, and
+    (path, warning) for accepted files' stage warnings.
+    """
+    accepted: list[FilenameRange]
+    rejected: list[tuple[str, str]]
+    warnings: list[tuple[str, str]] = []
+
+
+class StoreTarget(NamedTuple):
+    """
+    Where and how to store transactions: loaded config, store root (None: don't write) and
+    an optional CategoryCache for the config (see store_target).
+    """
+    config: "Config"
+    store_dir: str | None
+    category_cache: "CategoryCache | None" = None
+
+
+class FileResult(NamedTuple):
+    """Per-file outcome of the contract stages: exactly one of range_info/error is None."""
+    range_info: FilenameRange | None
+    error: str | None
+    staged: list[tuple[str, str]] = []
+    warnings: list[str] = []
+    profile: dict | None = None
+
+
+# "<count> <message>" warnings; counts from several chunks of one file are summed
+_COUNTED_WARNING = re.compile(r"^(\d+) (.*)$", re.DOTALL)
+
+
+def store_target(config: "Config", store_dir: str | None, cache_dir: str = None) -> StoreTarget:
+    """
+    Return a StoreTarget with the CategoryCache for `config` loaded from `cache_dir`
+    (None: no cache). Build one per batch: commit_batch saves the cache after committing
+    store files, so it is never written in dry-run mode.
+    """
+    cache = None
+    if cache_dir:
+        from .categorize import CategoryCache
 
+        cache = CategoryCache(cache_dir, config.digest)
+    return StoreTarget(config, store_dir, cache)
 
-def ingest(csv_path, dry_run=False, registry_path=None):
+
+def discover_inputs(patterns: list[str]) -> list[str]:
+    """
+    Expand CLI inputs into CSV paths.
+    Glob patterns (including recursive `**`) are expanded and sorted, directories are
+    searched recursively for `*.csv`, and plain paths are passed through unchanged so a
+    missing file is reported by the ingest itself. Duplicates are dropped, order is kept.
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(pattern)
+                for name in names
+                if name.lower().endswith('.csv')
+            )
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        paths.extend(matches)
+    return list(dict.fromkeys(paths))
+
+
+def validate_file(csv_path, chunksize=None) -> FilenameRange:
+    """
+    Run the per-file contract stages: filename range, CSV load, headers, and dates.
+    Args:
+        csv_path: CSV file to validate.
+        chunksize: If set, stream the file in chunks of this many rows so peak memory
+            depends on the chunk size rather than the file size (see validate_file_chunked).
+    Returns:
+        The FilenameRange declared by the file's name.
+    Raises:
+        ValueError: If any contract is violated.
+    """
     # Extract filename and parse the declared date range and account
     filename = os.path.basename(csv_path)
-    range_info = parse_filename_range(filename)
-    account = range_info.account
-    start_date = range_info.start_date
-    end_date = range_info.end_date
+    with stage("filename_parse"):
+        range_info = parse_filename_range(filename)
+    if chunksize:
+        validate_file_chunked(csv_path, range_info, chunksize)
+        return range_info
+    import pandas as pd
+
     # Load the CSV file into a DataFrame
-    df = pd.read_csv(csv_path)
+    with stage("csv_read") as s:
+        df = pd.read_csv(csv_path)
+        s.rows = len(df)
     # Validate that the headers match the required schema
-    validate_csv_headers(list(df.columns))
-    # Convert DataFrame rows to dicts for validation
-    rows = df.to_dict(orient="records")
+    with stage("header_check"):
+        validate_csv_headers(list(df.columns))
     # Ensure all dates in the CSV are within the declared filename range
-    validate_csv_date_range(rows, start_date, end_date)
-    # Check for overlapping date ranges in the registry for this account
-    check_range_overlap(account, start_date, end_date, registry_path)
-    # If dry-run, do not write to the registry, just report what would happen
-    if dry_run:
-        print(
-            f"[DRY-RUN] Would append to registry: {account}, "
-            f"{start_date.date()}-{end_date.date()}, {filename}"
+    with stage("date_validation", rows=len(df)):
+        validate_csv_date_range(df, range_info.start_date, range_info.end_date)
+    return range_info
+
+
+def _timed_chunks(chunks):
+    """Yield CSV chunks, timing each read as the csv_read stage."""
+    chunks = iter(chunks)
+    while True:
+        with stage("csv_read") as s:
+            chunk = next(chunks, None)
+            s.rows = len(chunk) if chunk is not None else None
+        if chunk is None:
+            return
+        yield chunk
+
+
+def validate_file_chunked(csv_path, range_info: FilenameRange, chunksize: int) -> None:
+    """
+    Validate headers once and dates chunk by chunk, reading only the Date column.
+    Row numbers in errors are file-relative, and out-of-range rows from every chunk are
+    reported together, exactly as for a whole-file validation.
+    Raises:
+        ValueError: If any contract is violated.
+    """
+    import pandas as pd
+
+    with stage("header_check"):
+        validate_csv_headers(list(pd.read_csv(csv_path, nrows=0).columns))
+    out_of_range = []
+    row_offset = 0
+    for chunk in _timed_chunks(pd.read_csv(csv_path, usecols=["Date"], chunksize=chunksize)):
+        with stage("date_validation", rows=len(chunk)):
+            _, chunk_out_of_range = find_out_of_range_dates(
+                chunk, range_info.start_date, range_info.end_date, row_offset=row_offset
+            )
+        out_of_range.extend(chunk_out_of_range)
+        row_offset += len(chunk)
+    raise_out_of_range(out_of_range)
+
+
+def transform_transactions(
+    df, account: str, config: "Config", dates=None, row_offset=0, cache=None
+):
+    """
+    Run the normalize, fingerprint and categorize stages on raw CSV rows.
+    `cache` is an optional CategoryCache for `config` (see categorize).
+    Returns:
+        (df, warnings): canonical, categorized rows and the stages' warnings.
+    Raises:
+        ValueError: If an amount cannot be parsed.
+    """
+    from .categorize import categorize
+    from .normalize import add_fingerprints, normalize
+
+    frame, warnings = normalize(df, account=account, dates=dates, row_offset=row_offset)
+    frame, fingerprint_warnings = add_fingerprints(frame)
+    frame, category_warnings = categorize(frame, config.rules, config.overrides, cache)
+    return frame, warnings + fingerprint_warnings + category_warnings
+
+
+def _merge_counted_warnings(warnings: list[str]) -> list[str]:
+    """Sum the counts of identical "<count> <message>" warnings, keeping first-seen order."""
+    counts = {}
+    for warning in warnings:
+        match = _COUNTED_WARNING.match(warning)
+        if match is None:
+            counts.setdefault(warning, None)
+        else:
+            key = match.group(2)
+            counts[key] = (counts.get(key) or 0) + int(match.group(1))
+    return [key if count is None else f"{count} {key}" for key, count in counts.items()]
+
+
+def process_file(csv_path, range_info: FilenameRange, target: StoreTarget, chunksize=None):
+    """
+    Validate a file and stage its transactions for the store in one pass.
+    Each chunk (or the whole file) is checked against the declared date range and run
+    through transform_transactions; rows are staged in the store only if every chunk
+    passes, and nothing is written when target.store_dir is None.
+    Returns:
+        (staged, warnings): staged store files (see store.commit_staged) and warnings.
+    Raises:
+        ValueError: If any contract is violated; staged files are removed first.
+    """
+    import pandas as pd
+
+    from .store import PartitionWriter
+
+    with stage("header_check"):
+        validate_csv_headers(list(pd.read_csv(csv_path, nrows=0).columns))
+    if chunksize:
+        chunks = _timed_chunks(pd.read_csv(csv_path, chunksize=chunksize))
+    else:
+        with stage("csv_read") as s:
+            chunks = [pd.read_csv(csv_path)]
+            s.rows = len(chunks[0])
+    writer = None
+    if target.store_dir is not None:
+        writer = PartitionWriter(
+            target.store_dir,
+            range_info.account,
+            range_info.filename,
+            {"config_digest": target.config.digest},
         )
-        return True
-    # Write the ingested range to the registry (atomic update)
-    append_range_registry(account, start_date, end_date, filename, registry_path)
-    print(f"Ingested: {filename} ({start_date.date()}-{end_date.date()})")
+    out_of_range = []
+    warnings = []
+    row_offset = 0
+    try:
+        for chunk in chunks:
+            with stage("date_validation", rows=len(chunk)):
+                dates, chunk_out_of_range = find_out_of_range_dates(
+                    chunk, range_info.start_date, range_info.end_date, row_offset=row_offset
+                )
+            out_of_range.extend(chunk_out_of_range)
+            # Once the file is known to fail, later chunks are only range-checked
+            if not out_of_range:
+                with stage("transform", rows=len(chunk)):
+                    frame, chunk_warnings = transform_transactions(
+                        chunk,
+                        range_info.account,
+                        target.config,
+                        dates,
+                        row_offset,
+                        target.category_cache,
+                    )
+                warnings.extend(chunk_warnings)
+                if writer is not None:
+                    with stage("store_write", rows=len(frame)):
+                        writer.write(frame)
+            row_offset += len(chunk)
+        raise_out_of_range(out_of_range)
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    staged = writer.close() if writer is not None else []
+    return staged, _merge_counted_warnings(warnings)
+
+
+def _validate_worker(csv_path, chunksize=None, store=None, profile=False) -> FileResult:
+    """
+    Process-pool entry point: run the per-file stages and return a FileResult.
+    With `profile`, the stages are profiled here and returned in FileResult.profile.
+    """
+    if profile:
+        profiler = Profiler()
+        with profiler.activate():
+            result = _validate_worker(csv_path, chunksize, store)
+        return result._replace(profile=profiler.stages)
+    try:
+        if store is None:
+            return FileResult(validate_file(csv_path, chunksize), None)
+        with stage("filename_parse"):
+            range_info = parse_filename_range(os.path.basename(csv_path))
+        staged, warnings = process_file(csv_path, range_info, store, chunksize)
+        return FileResult(range_info, None, staged, warnings)
+    except (ValueError, OSError) as e:
+        return FileResult(None, str(e))
+
+
+def validate_files(
+    csv_paths, jobs=1, chunksize=None, store=None, executor=None
+) -> list[FileResult]:
+    """
+    Run the per-file contract stages for many files, optionally in a process pool.
+    Args:
+        csv_paths: Files to validate.
+        jobs: Number of worker processes; 1 validates in-process.
+        chunksize: Stream each file in chunks of this many rows (see validate_file).
+        store: StoreTarget; if given, files are also transformed and staged for the store
+            (see process_file).
+        executor: A running concurrent.futures executor to validate in instead of a new
+            pool (`jobs` is then ignored); shared by callers that validate many batches.
+    Returns:
+        FileResult per file, in input order.
+    """
+    in_process = executor is None and (jobs <= 1 or len(csv_paths) <= 1)
+    if not in_process and store is not None and store.category_cache is not None:
+        # Workers would categorize with a copy of the cache (pickled for every file) and
+        # their new entries would be lost, so the cache only serves in-process runs
+        store = store._replace(category_cache=None)
+    worker = partial(_validate_worker, chunksize=chunksize, store=store)
+    if executor is not None and csv_paths:
+        return list(executor.map(worker, csv_paths))
+    if jobs <= 1 or len(csv_paths) <= 1:
+        return [worker(p) for p in csv_paths]
+    from concurrent.futures import ProcessPoolExecutor
+
+    from .profiling import active
+
+    profiler = active()
+    worker = partial(worker, profile=profiler is not None)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(csv_paths))) as pool:
+        results = list(pool.map(worker, csv_paths))
+    if profiler is not None:
+        for result in results:
+            profiler.merge(result.profile or {})
+    return results
+
+
+def ingest(csv_path, dry_run=False, registry_path=None, journal=False, chunksize=None):
+    """
+    Ingest a single file: ingest_batch for one path, with its rejection raised.
+    Returns:
+        True once the range is recorded (in dry-run mode: once it would be).
+    Raises:
+        ValueError: If any contract is violated or the range overlaps the registry.
+    """
+    result = ingest_batch(
+        [csv_path],
+        dry_run=dry_run,
+        registry_path=registry_path,
+        journal=journal,
+        chunksize=chunksize,
+    )
+    if result.rejected:
+        raise ValueError(result.rejected[0][1])
     return True
+
+
+def ingest_batch(
+    csv_paths,
+    dry_run=False,
+    registry_path=None,
+    journal=False,
+    jobs=1,
+    chunksize=None,
+    store: StoreTarget = None,
+) -> BatchResult:
+    """
+    Validate many files against one registry load and commit them in one write.
+    Each file goes through the per-file contract stages (see validate_files), in up to
+    `jobs` worker processes since they are independent per file. Overlaps are then
+    checked serially, in input order, against the registry and against files accepted
+    earlier in the same batch, so a batch never records two overlapping ranges. All
+    accepted ranges are appended to the registry together; rejected files are reported
+    and never recorded.
+    With `store`, accepted files' transactions are committed to the store just before the
+    registry write (and never in dry-run mode), and the report rollups of the months they
+    touch are refreshed after it.
+    Returns:
+        BatchResult with accepted ranges (in input order), (path, error) rejections and
+        (path, warning) stage warnings for accepted files.
+    """
+    if store is not None and dry_run:
+        store = store._replace(store_dir=None)
+    validated = validate_batch(csv_paths, jobs=jobs, chunksize=chunksize, store=store)
+    return commit_batch(
+        csv_paths,
+        validated,
+        dry_run=dry_run,
+        registry_path=registry_path,
+        journal=journal,
+        store=store,
+    )
+
+
+def validate_batch(
+    csv_paths, jobs=1, chunksize=None, store: StoreTarget = None, executor=None
+) -> dict[str, FileResult]:
+    """
+    The per-file half of ingest_batch: every stage that does not read the registry.
+    Args:
+        csv_paths, jobs, chunksize: As for ingest_batch.
+        store: StoreTarget; files are staged (not committed) for the store if its
+            store_dir is set.
+        executor: See validate_files.
+    Returns:
+        FileResult per path. Filename contract failures are rejected up front, before any
+        CSV (or pandas) work.
+    """
+    validated = {}
+    with stage("filename_parse"):
+        for csv_path in csv_paths:
+            try:
+                parse_filename_range(os.path.basename(csv_path))
+            except ValueError as e:
+                validated[csv_path] = FileResult(None, str(e))
+    pending = [p for p in csv_paths if p not in validated]
+    validated.update(zip(
+        pending,
+        validate_files(
+            pending, jobs=jobs, chunksize=chunksize, store=store, executor=executor
+        ),
+    ))
+    return validated
+
+
+def commit_batch(
+    csv_paths,
+    validated: dict[str, FileResult],
+    dry_run=False,
+    registry_path=None,
+    journal=False,
+    store: StoreTarget = None,
+) -> BatchResult:
+    """
+    The registry half of ingest_batch: check overlaps, then commit store files and ranges.
+    Overlaps are checked optimistically, without locks. The accounts' lock stripes are
+    then taken, and if the registry changed in the meantime the checks are repeated
+    against it, so parallel commits (from any process) never record overlapping ranges
+    or lose each other's ranges. See locks.py.
+    Args:
+        csv_paths: Files in input order (the order overlaps are resolved in).
+        validated: FileResult per path, from validate_batch.
+        dry_run, registry_path, journal, store: As for ingest_batch.
+    Returns:
+        BatchResult, as for ingest_batch.
+    """
+    if registry_path is None:
+        registry_path = default_registry_path()
+    # (input position, path, error), so rejections are reported in input order
+    rejected = []
+    candidates = []
+    for i, csv_path in enumerate(csv_paths):
+        result = validated[csv_path]
+        if result.error is not None:
+            rejected.append((i, csv_path, result.error))
+        else:
+            candidates.append((i, csv_path, result))
+    with stage("registry_load"):
+        version, registry_index = versioned_range_index(registry_path)
+    passed = _check_overlaps(candidates, registry_index, rejected)
+    if dry_run:
+        for _, _, result in passed:
+            r = result.range_info
+            print(
+                f"[DRY-RUN] Would append to registry: {r.account}, "
+                f"{r.start_date.date()}-{r.end_date.date()}, {r.filename}"
+            )
+        return _batch_result(passed, rejected)
+    if not passed:
+        return _batch_result(passed, rejected)
+    # Hold the accounts' lock stripes from the final check until the ranges are recorded,
+    # so a parallel ingest of the same accounts cannot pass its checks in between
+    with account_locks(registry_path, {result.range_info.account for _, _, result in passed}):
+        if registry_version(registry_path) != version:
+            # Another process committed since the checks: re-check against its ranges
+            with stage("registry_load"):
+                version, registry_index = versioned_range_index(registry_path)
+            passed = _check_overlaps(passed, registry_index, rejected)
+        accepted = [result.range_info for _, _, result in passed]
+        staged = [entry for _, _, result in passed for entry in result.staged]
+        if staged:
+            from .store import commit_staged, write_config_snapshot
+
+            # Store files land before the registry entry: a crash in between leaves files
+            # that the re-run of the same ingest replaces
+            with stage("store_commit"):
+                write_config_snapshot(store.store_dir, store.config)
+                commit_staged(staged)
+        # Record every accepted range in a single registry write
+        with stage("registry_write"):
+            while True:
+                try:
+                    after = append_ranges_registry(
+                        accepted, registry_path, journal=journal, expected_version=version
+                    )
+                    break
+                except RegistryConflict:
+                    # Another account's commit landed after the checks. Ours hold their
+                    # stripes, so nothing can overlap them since: retry on the new version
+                    version = registry_version(registry_path)
+            record_ranges(accepted, registry_path, before=version, after=after)
+    for r in accepted:
+        print(f"Ingested: {r.filename} ({r.start_date.date()}-{r.end_date.date()})")
+    if staged:
+        from .rollups import refresh_rollups
+
+        # Only the months this batch wrote are recomputed
+        with stage("rollup_refresh"):
+            refresh_rollups(store.store_dir, store.config)
+        if store.category_cache is not None:
+            try:
+                store.category_cache.save()
+            except OSError:
+                # The cache only saves time; failing to write it must not fail the run
+                pass
+    return _batch_result(passed, rejected)
+
+
+def _check_overlaps(candidates, registry_index: RangeIndex, rejected: list) -> list:
+    """
+    Check (position, path, FileResult) candidates, in order, against the registry and
+    against candidates passed earlier. Failures are appended to `rejected` and their
+    staged store files discarded.
+    Returns:
+        The candidates that passed.
+    """
+    batch_index = RangeIndex()
+    passed = []
+    for i, csv_path, result in candidates:
+        range_info = result.range_info
+        try:
+            account = range_info.account
+            start_date = range_info.start_date
+            end_date = range_info.end_date
+            with stage("overlap_check"):
+                registry_index.check(account, start_date, end_date)
+                batch_index.check(account, start_date, end_date)
+        except ValueError as e:
+            rejected.append((i, csv_path, str(e)))
+            _discard(result.staged)
+            continue
+        batch_index.add(account, start_date, end_date, range_info.filename)
+        passed.append((i, csv_path, result))
+    return passed
+
+
+def _batch_result(passed, rejected) -> BatchResult:
+    return BatchResult(
+        [result.range_info for _, _, result in passed],
+        [(csv_path, error) for _, csv_path, error in sorted(rejected, key=lambda r: r[0])],
+        [(csv_path, w) for _, csv_path, result in passed for w in result.warnings],
+    )
+
+
+def _discard(staged):
+    if staged:
+        from .store import discard_staged
+
+        discard_staged(staged)
+
+
+def summarize_batch(result: BatchResult) -> dict[str, tuple[int, int]]:
+    """
+    Count accepted and rejected files per account.
+    Files whose name does not follow the filename contract are counted under '<unknown>'.
+    Returns:
+        Mapping of account -> (accepted, rejected), sorted by account.
+    """
+    counts = {}
+    for r in result.accepted:
+        ok, bad = counts.get(r.account, (0, 0))
+        counts[r.account] = (ok + 1, bad)
+    for csv_path, _ in result.rejected:
+        try:
+            account = parse_filename_range(os.path.basename(csv_path)).account
+        except ValueError:
+            account = '<unknown>'
+        ok, bad = counts.get(account, (0, 0))
+        counts[account] = (ok, bad + 1)
+    return dict(sorted(counts.items()))
@@ -0,0 +1,101 @@
+"""
+locks.py — Cross-process registry locks.
+
+Parallel ingests (cron jobs, the ingest server, manual runs) coordinate through lock
+files in `<registry>.locks/`:
+
+- Account stripes (`account-NN.lock`). An ingest holds the stripes of the accounts it
+  commits, from its final overlap check until its ranges are in the registry. Two
+  ingests of one account therefore never both pass their checks. Ingests of different
+  accounts usually hold different stripes and do not wait for each other. Accounts map
+  to LOCK_STRIPES stripes by CRC32, which is stable across processes (unlike hash()).
+- The write lock (`write.lock`). It is held only while the registry files are read and
+  rewritten or appended to (see contracts.append_ranges_registry), so commits of
+  different accounts serialize only for that short write.
+
+Stripes are always taken in ascending order and before the write lock, so lock holders
+cannot deadlock. Locks are flock() locks (msvcrt byte locks on Windows). They belong to
+an open file, so they exclude other threads as well as other processes, and the OS
+releases them if the holder dies. Lock files are never deleted; they are empty.
+"""
+
+import os
+import time
+import zlib
+from contextlib import ExitStack, contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCKS_SUFFIX = ".locks"
+WRITE_LOCK = "write.lock"
+LOCK_STRIPES = 64
+
+
+def lock_dir(registry_path: str) -> str:
+    """Return the directory holding a registry's lock files."""
+    return os.path.abspath(registry_path) + LOCKS_SUFFIX
+
+
+def account_stripe(account: str) -> int:
+    """Return the lock stripe an account maps to."""
+    return zlib.crc32(account.encode("utf-8")) % LOCK_STRIPES
+
+
+def _acquire(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            time.sleep(0.05)
+
+
+def _release(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path: str):
+    """Hold an exclusive lock on `path` (created if missing), waiting until it is free."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        _acquire(fd)
+        try:
+            yield
+        finally:
+            _release(fd)
+    finally:
+        os.close(fd)
+
+
+def registry_write_lock(registry_path: str):
+    """Return a context manager holding the registry's write lock."""
+    return file_lock(os.path.join(lock_dir(registry_path), WRITE_LOCK))
+
+
+@contextmanager
+def account_locks(registry_path: str, accounts):
+    """
+    Hold the stripe locks of `accounts` (in ascending stripe order).
+    Must not be entered while holding the write lock.
+    """
+    stripes = sorted({account_stripe(a) for a in accounts})
+    with ExitStack() as stack:
+        for stripe in stripes:
+            stack.enter_context(
+                file_lock(os.path.join(lock_dir(registry_path), f"account-{stripe:02d}.lock"))
+            )
+        yield
@@ -0,0 +1,293 @@
+"""
+normalize.py — Normalization stage.
+
+This module turns a validated bank CSV (Date, Description, Amount, Transaction_Type) into
+the canonical schema (see schema.py): parsed dates, cleaned descriptions, and signed float
+amounts. Downstream stages assume its output.
+
+Every step is column-wise. Amount and description cleanup run once per distinct value
+(bank exports repeat both heavily) with pre-compiled regexes, and Transaction_Type is
+mapped to a sign through its categorical codes, so no step loops over rows in Python.
+
+Fingerprints (the splits.csv key) are version-stable; see fingerprints() for the exact
+encoding and docs/decisions/0007-transaction-fingerprint.md for the compatibility rules.
+"""
+
+import re
+
+from .schema import ACCOUNT, AMOUNT, DATE, DESCRIPTION, FINGERPRINT, TRANSACTION_TYPE
+
+# Transaction_Type values (case- and whitespace-insensitive) and the sign they give the
+# amount's magnitude. Unknown types keep the amount's own sign and are reported.
+TRANSACTION_TYPE_SIGNS = {
+    "DEBIT": -1,
+    "DR": -1,
+    "WITHDRAWAL": -1,
+    "CREDIT": 1,
+    "CR": 1,
+    "DEPOSIT": 1,
+}
+
+# "(12.50)" is a negative amount: "(" becomes a minus sign and ")" is dropped, as are
+# currency symbols
+_AMOUNT_TRANSLATION = {
+    ord("("): "-",
+    ord(")"): None,
+    **{ord(c): None for c in "$£¥¢"},
+    **{c: None for c in range(0x20A0, 0x20D0)},  # Unicode currency symbols block
+}
+# Commas followed by exactly three digits; "12,50" (a decimal comma) is left to fail
+_THOUSANDS_SEPARATOR = re.compile(r"(?<=[0-9]),(?=[0-9]{3}(?![0-9]))")
+# Whitespace at either end of a value or after its sign (newline separates values, see
+# _parse_amount_text); whitespace inside the number, as in "12 34", is left to fail
+_AMOUNT_PADDING = re.compile(r"^[^\S\n]+|[^\S\n]+$|(?<=[-+])[^\S\n]+", re.MULTILINE)
+# Characters float() accepts beyond a plain decimal number ("1e5", "inf", "1_000", ...)
+_NON_DECIMAL = re.compile(r"[^0-9.+\-\s]")
+# Any cleaned value that is not a plain decimal number ("1e5", "inf", "12,50", "")
+_INVALID_AMOUNT = re.compile(
+    r"^(?![-+]?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)$).*$", re.MULTILINE
+)
+_WHITESPACE = re.compile(r"\s+")
+
+# Fingerprint encoding version and SipHash key (exactly 16 ASCII characters). Changing
+# either changes every fingerprint and invalidates existing splits.csv files.
+FINGERPRINT_VERSION = 1
+_FINGERPRINT_KEY = "silver-garbanzo1"
+# Columns hashed into a fingerprint, in combination order
+_FINGERPRINT_COLUMNS = (DATE, DESCRIPTION, AMOUNT, ACCOUNT)
+_FINGERPRINT_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+def _clean_unique(values, clean, missing=None):
+    """Apply a Series -> Series cleanup to each distinct value once and broadcast back."""
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    cleaned = clean(pd.Series(uniques, dtype=object)).to_numpy()
+    # Code -1 (missing value) picks the trailing `missing` entry
+    return np.append(cleaned, np.array([missing], dtype=cleaned.dtype))[codes]
+
+
+def parse_dates(values, dates=None):
+    """
+    Parse the Date column (YYYY-MM-DD) into timezone-naive datetimes.
+    Args:
+        values: Raw Date column.
+        dates: Dates already parsed by the contract stage (see
+            contracts.validate_csv_date_range); used as-is when given.
+    Raises:
+        ValueError: If any date cannot be parsed.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if dates is not None:
+        return pd.Series(dates).to_numpy(dtype="datetime64[ns]")
+    parsed = pd.to_datetime(pd.Series(values), format="%Y-%m-%d", errors="coerce")
+    invalid = np.flatnonzero(parsed.isna().to_numpy())
+    if len(invalid):
+        i = invalid[0]
+        raise ValueError(f"Row {i + 1}: Invalid date format '{pd.Series(values).iat[i]}'")
+    return parsed.to_numpy()
+
+
+def _parse_amount_text(uniques):
+    """Parse distinct amount strings with one regex pass over all of them."""
+    import numpy as np
+    import pandas as pd
+
+    text = uniques.astype(str)
+    joined = "\n".join(text)
+    if joined.count("\n") != max(len(text) - 1, 0):
+        # A value containing a newline would shift every later value
+        joined = "\n".join(text.str.replace("\n", " ", regex=False))
+    # Joining the values lets translate() and each regex make a single call instead of
+    # one call per value
+    cleaned = _THOUSANDS_SEPARATOR.sub("", joined.translate(_AMOUNT_TRANSLATION))
+    if _NON_DECIMAL.search(cleaned) is None:
+        # Only digits, signs, dots and whitespace: float() is as strict as the full check
+        try:
+            return pd.Series(np.array(cleaned.split("\n"), dtype=object).astype(np.float64))
+        except ValueError:
+            pass
+    cleaned = _AMOUNT_PADDING.sub("", cleaned)
+    # Invalid values become NaN, which parse_amounts reports with their row numbers
+    cleaned = _INVALID_AMOUNT.sub("nan", cleaned)
+    parts = np.array(cleaned.split("\n"), dtype=object)
+    return pd.Series(parts.astype(np.float64))
+
+
+def parse_amounts(values, row_offset: int = 0):
+    """
+    Parse the Amount column into floats.
+    Currency symbols, thousands separators and surrounding whitespace are stripped, and
+    parenthesized amounts such as "(1,234.50)" are negative. Anything else that is not a
+    plain decimal number (letters, inner spaces, exponents, decimal commas) is invalid.
+    Numeric columns are returned unchanged.
+    Args:
+        values: Raw Amount column.
+        row_offset: Number of data rows preceding `values` in the file, so that row
+            numbers stay file-relative when a file is processed in chunks.
+    Raises:
+        ValueError: Listing every row whose amount cannot be parsed.
+    """
+    import numpy as np
+    import pandas as pd
+
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        amounts = values.to_numpy(dtype=np.float64)
+    else:
+        amounts = _clean_unique(values, _parse_amount_text, missing=np.nan).astype(np.float64)
+    invalid = np.flatnonzero(np.isnan(amounts))
+    if len(invalid):
+        bad = list(zip((invalid + row_offset + 1).tolist(), values.iloc[invalid].tolist()))
+        raise ValueError(f"CSV contains unparseable amounts: {bad}")
+    return amounts
+
+
+def transaction_signs(types):
+    """
+    Map Transaction_Type values to signs through their categorical codes.
+    Returns:
+        (signs, unknown_counts): float array of -1.0/+1.0 per row (NaN for unknown
+        types), and a value_counts Series of the unknown types (missing included).
+    """
+    import numpy as np
+    import pandas as pd
+
+    types = pd.Series(types).astype("category")
+    keys = types.cat.categories.astype(str).str.strip().str.upper()
+    category_signs = keys.map(TRANSACTION_TYPE_SIGNS).to_numpy(dtype=np.float64)
+    # Code -1 (missing type) picks the trailing NaN entry
+    signs = np.append(category_signs, np.nan)[types.cat.codes.to_numpy()]
+    unknown = np.isnan(signs)
+    counts = types[unknown].value_counts(dropna=False, sort=True)
+    return signs, counts[counts > 0]
+
+
+def clean_descriptions(values):
+    """Strip descriptions and collapse internal whitespace runs to a single space."""
+    return _clean_unique(
+        values,
+        lambda uniques: uniques.astype(str).str.strip().str.replace(_WHITESPACE, " ", regex=True),
+    )
+
+
+def normalize(df, account: str = None, dates=None, row_offset: int = 0):
+    """
+    Build the canonical schema from a raw bank CSV DataFrame.
+    Args:
+        df: DataFrame with the Date, Description, Amount and Transaction_Type columns.
+        account: Account the file belongs to; adds the `account` column when given.
+        dates: Dates already parsed by the contract stage (optional).
+        row_offset: Rows preceding df in its file, for file-relative row numbers in errors.
+    Returns:
+        (df, warnings): a new DataFrame with date, description, amount (signed float),
+        transaction_type (categorical, raw values) and optionally account, and a list of
+        warning strings (one per unknown Transaction_Type value, with its row count).
+    Raises:
+        ValueError: If a date or amount cannot be parsed.
+    """
+    import numpy as np
+    import pandas as pd
+
+    amounts = parse_amounts(df["Amount"], row_offset)
+    types = df["Transaction_Type"].astype("category")
+    signs, unknown_counts = transaction_signs(types)
+    # Known types set the sign of the magnitude; unknown types keep the numeric sign
+    amounts = np.where(np.isnan(signs), amounts, np.abs(amounts) * signs)
+    out = pd.DataFrame({
+        DATE: parse_dates(df["Date"], dates),
+        DESCRIPTION: clean_descriptions(df["Description"]),
+        AMOUNT: amounts,
+        TRANSACTION_TYPE: types,
+    }, index=df.index)
+    if account is not None:
+        out[ACCOUNT] = account
+    warnings = [
+        f"{count} transaction(s) with unknown Transaction_Type "
+        f"'{'<missing>' if pd.isna(value) else value}': numeric sign kept"
+        for value, count in unknown_counts.items()
+    ]
+    return out, warnings
+
+
+def _hash_component(values, render=None):
+    """
+    Keyed SipHash of each value's text, computed once per distinct value.
+    `render` turns the distinct values (a pandas Index) into their canonical texts;
+    missing values hash as "".
+    """
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    texts = uniques if render is None else render(uniques)
+    texts = np.append(np.asarray(texts, dtype=object).astype(str), "").astype(object)
+    hashes = pd.util.hash_array(texts, encoding="utf8", hash_key=_FINGERPRINT_KEY, categorize=False)
+    # Code -1 (missing value) picks the trailing hash of ""
+    return hashes[codes]
+
+
+def _fingerprint_components(df):
+    """Yield the hash of each fingerprint component, in combination order."""
+    import numpy as np
+
+    yield _hash_component(df[DATE], lambda dates: dates.strftime("%Y-%m-%d"))
+    yield _hash_component(df[DESCRIPTION])
+    # Integer cents avoid float formatting differences ("12.5" vs "12.50")
+    yield _hash_component(np.rint(df[AMOUNT].to_numpy(dtype=np.float64) * 100).astype(np.int64))
+    if ACCOUNT in df.columns:
+        yield _hash_component(df[ACCOUNT])
+    else:
+        yield _hash_component(np.full(len(df), "", dtype=object))
+
+
+def fingerprints(df):
+    """
+    Compute the stable fingerprint of each normalized transaction.
+
+    Encoding (version 1):
+      1. Each component is rendered as text: date as YYYY-MM-DD, description as cleaned
+         by normalize(), amount as signed integer cents in decimal ("-1250"), and account
+         (empty string if the column is absent or a value is missing).
+      2. Each text is hashed with pandas.util.hash_array: SipHash-2-4 of its UTF-8 bytes
+         with the 16-byte key "silver-garbanzo1", followed by pandas' 64-bit finalizer.
+      3. The four hashes are combined in order as h = (h * 0x9E3779B97F4A7C15 + c) mod 2**64,
+         starting from h = 0.
+      4. The fingerprint is h as 16 lowercase hex digits.
+    Every step is column-wise, and each component is hashed once per distinct value.
+    Args:
+        df: DataFrame in the canonical schema (see normalize()).
+    Returns:
+        numpy array of fingerprint strings aligned with df's rows.
+    """
+    import numpy as np
+
+    combined = np.zeros(len(df), dtype=np.uint64)
+    multiplier = np.uint64(_FINGERPRINT_MULTIPLIER)
+    with np.errstate(over="ignore"):
+        for component in _fingerprint_components(df):
+            combined = combined * multiplier + component
+    # Big-endian bytes hex-encode to the digits of each value, most significant first
+    digits = combined.astype(">u8").tobytes().hex().encode("ascii")
+    return np.frombuffer(digits, dtype="S16").astype(str).astype(object)
+
+
+def add_fingerprints(df):
+    """
+    Add the `fingerprint` column (see fingerprints()).
+    Returns:
+        (df, warnings): a copy of df with the fingerprint column, and a warning if some
+        transactions share a fingerprint (identical date, description, amount and
+        account), since a split for that fingerprint applies to all of them.
+    """
+    out = df.copy()
+    out[FINGERPRINT] = fingerprints(df)
+    warnings = []
+    duplicated = int(out[FINGERPRINT].duplicated(keep=False).sum())
+    if duplicated:
+        warnings.append(f"{duplicated} transaction(s) share a fingerprint with another")
+    return out, warnings
@@ -1,63 +1,190 @@
-
 """
 overlap.py — Overlap detection for ingested ranges.
 
 This module provides logic to detect overlapping date ranges for account data during
 ingestion. It ensures that no duplicate or conflicting data is ingested for the same account.
+
+The registry is loaded once into a per-account interval index (ranges sorted by start date
+with a running maximum of end dates), so each overlap check is a bisect over one account's
+ranges instead of a scan of the whole registry file.
 """
 
-import csv
-import os
-from datetime import datetime, timedelta
+from bisect import bisect_right
+from datetime import datetime
+
+from .contracts import default_registry_path, read_range_registry, registry_version
+
+
+class _AccountRanges:
+    """Sorted ranges for one account, plus a running max of end dates for bisect lookups."""
+
+    __slots__ = ("starts", "ends", "max_ends", "sources")
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.max_ends = []
+        self.sources = []
+
+    def insert(self, start_date, end_date, source_file):
+        i = bisect_right(self.starts, start_date)
+        self.starts.insert(i, start_date)
+        self.ends.insert(i, end_date)
+        self.sources.insert(i, source_file)
+        prev_max = self.max_ends[i - 1] if i else end_date
+        self.max_ends.insert(i, max(prev_max, end_date))
+        # Ranges after i normally start after end_date, so their running max is
+        # unchanged; only a hand-edited (already overlapping) registry needs the fix-up.
+        j = i + 1
+        while j < len(self.max_ends) and self.max_ends[j] < end_date:
+            self.max_ends[j] = end_date
+            j += 1
+
+    def find(self, start_date, end_date):
+        """Return the index of a range overlapping [start_date, end_date], or None."""
+        # Candidates are ranges starting on or before end_date; one of them overlaps
+        # iff the largest end date among them reaches start_date.
+        i = bisect_right(self.starts, end_date) - 1
+        if i < 0 or self.max_ends[i] < start_date:
+            return None
+        while self.ends[i] < start_date:
+            i -= 1
+        return i
+
+
+class RangeIndex:
+    """
+    In-memory interval index over the range registry, keyed by account.
+    Lookups cost O(log n) in the number of ranges recorded for that account.
+    """
+
+    def __init__(self):
+        self._accounts = {}
+
+    @classmethod
+    def from_rows(cls, rows) -> "RangeIndex":
+        """Build an index from registry row dicts (see contracts.read_range_registry)."""
+        index = cls()
+        for row in rows:
+            index.add(
+                row['account'],
+                datetime.fromisoformat(row['start_date']),
+                datetime.fromisoformat(row['end_date']),
+                row['source_file'],
+            )
+        return index
+
+    def add(self, account: str, start_date: datetime, end_date: datetime, source_file: str):
+        """Record a range for an account."""
+        ranges = self._accounts.get(account)
+        if ranges is None:
+            ranges = self._accounts[account] = _AccountRanges()
+        ranges.insert(start_date, end_date, source_file)
+
+    def accounts(self) -> list[str]:
+        """Return the accounts with at least one recorded range, sorted."""
+        return sorted(self._accounts)
+
+    def ranges(self, account: str) -> list[tuple[datetime, datetime, str]]:
+        """Return (start_date, end_date, source_file) for an account, sorted by start."""
+        ranges = self._accounts.get(account)
+        if ranges is None:
+            return []
+        return list(zip(ranges.starts, ranges.ends, ranges.sources))
+
+    def find_overlap(self, account: str, start_date: datetime, end_date: datetime):
+        """
+        Find a recorded range overlapping the given inclusive range.
+        Returns:
+            (start_date, end_date, source_file) of a conflicting range, or None.
+        """
+        ranges = self._accounts.get(account)
+        if ranges is None:
+            return None
+        i = ranges.find(start_date, end_date)
+        if i is None:
+            return None
+        return ranges.starts[i], ranges.ends[i], ranges.sources[i]
+
+    def check(self, account: str, start_date: datetime, end_date: datetime) -> None:
+        """Raise ValueError if the range overlaps a recorded range for the account."""
+        conflict = self.find_overlap(account, start_date, end_date)
+        if conflict is not None:
+            reg_start, reg_end, source_file = conflict
+            raise ValueError(
+                f"Range {start_date.date()} to {end_date.date()} for account '{account}' "
+                f"overlaps existing range {reg_start.date()} to {reg_end.date()} "
+                f"from file '{source_file}'"
+            )
+
+
+# registry path -> (registry version, RangeIndex); reloaded only when the registry changes
+_INDEX_CACHE = {}
+
+
+def load_range_index(registry_path: str = None) -> RangeIndex:
+    """
+    Return the interval index for a registry, loading it only if the file changed.
+    Args:
+        registry_path: Path to registry CSV (default: state/ingested_ranges.csv)
+    """
+    return versioned_range_index(registry_path)[1]
+
+
+def versioned_range_index(registry_path: str = None) -> tuple[tuple, RangeIndex]:
+    """
+    Return (version, index): the interval index and the registry_version it reflects.
+    Pass the version to append_ranges_registry as expected_version, so ranges checked
+    against this index are only written if nobody has written the registry since.
+    """
+    if registry_path is None:
+        registry_path = default_registry_path()
+    # Stamped before reading: a write in between makes the stamp stale, never the index
+    stamp = registry_version(registry_path)
+    cached = _INDEX_CACHE.get(registry_path)
+    if cached is not None and cached[0] == stamp:
+        return cached
+    index = RangeIndex.from_rows(read_range_registry(registry_path))
+    _INDEX_CACHE[registry_path] = (stamp, index)
+    return stamp, index
+
+
+def record_ranges(ranges, registry_path: str = None, before=None, after=None) -> None:
+    """
+    Update the cached index after one append_ranges_registry write.
+    Args:
+        ranges: The FilenameRange entries written.
+        before: expected_version passed to the write; after: the version it returned.
+            The cached index is only updated if it was at `before`, since otherwise it
+            may be missing another process's ranges; it is then dropped instead.
+    """
+    if registry_path is None:
+        registry_path = default_registry_path()
+    cached = _INDEX_CACHE.get(registry_path)
+    if cached is None:
+        return
+    if cached[0] != before:
+        del _INDEX_CACHE[registry_path]
+        return
+    for r in ranges:
+        cached[1].add(r.account, r.start_date, r.end_date, r.filename)
+    _INDEX_CACHE[registry_path] = (after, cached[1])
 
 
 def check_range_overlap(
     account: str,
     start_date: datetime,
     end_date: datetime,
-    registry_path: str = None
+    registry_path: str = None,
+    index: RangeIndex = None
 ) -> None:
     """
     Check for overlapping ranges in the registry for the given account.
     Raises ValueError if overlap is detected, with details of the conflicting file and range.
-    Touching edges (end == new_start or start == new_end) are allowed.
+    Touching edges (end == new_start - 1 day or start == new_end + 1 day) are allowed.
+    Args:
+        index: Pre-loaded RangeIndex to check against instead of the registry file.
     """
-    if registry_path is None:
-        # Default to the canonical registry path if not provided
-        registry_path = os.path.join(
-            os.path.dirname(__file__),
-            '..',
-            '..',
-            'state',
-            'ingested_ranges.csv',
-        )
-        registry_path = os.path.normpath(registry_path)
-    if not os.path.isfile(registry_path):
-        # If the registry does not exist, there can be no overlap
-        return
-    with open(registry_path, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Only check for overlap with the same account
-            if row['account'] != account:
-                continue
-            reg_start = datetime.strptime(row['start_date'], '%Y-%m-%d')
-            reg_end = datetime.strptime(row['end_date'], '%Y-%m-%d')
-            # Overlap logic: new_start <= existing_end AND new_end >= existing_start
-            # This means the ranges touch or overlap in any way
-            # Touching edges (adjacent, no overlap) are allowed:
-            #   - new_end == existing_start - 1 day
-            #   - new_start == existing_end + 1 day
-            if (start_date <= reg_end and end_date >= reg_start):
-                # Check for touching edge (adjacent, not overlapping)
-                if (
-                    end_date == reg_start - timedelta(days=1)
-                    or start_date == reg_end + timedelta(days=1)
-                ):
-                    continue
-                # If not just touching, this is a true overlap
-                raise ValueError(
-                    f"Range {start_date.date()} to {end_date.date()} for account '{account}' "
-                    f"overlaps existing range {reg_start.date()} to {reg_end.date()} "
-                    f"from file '{row['source_file']}'"
-                )
+    if index is None:
+        index = load_range_index(registry_path)
+    index.check(account, start_date, end_date)
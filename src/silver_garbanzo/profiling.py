@@ -0,0 +1,205 @@
+"""
+profiling.py — Per-stage ingest profiling.
+
+This module times the ingest stages (filename parse, CSV read, header check, date
+validation, overlap check, registry write, and the store stages) and reports per stage:
+calls, wall time, rows, rows/sec and resident-memory delta. It backs `--profile`.
+
+Stages are recorded through the module-level stage() helper, which is a no-op unless a
+Profiler is active, so instrumented code needs no extra parameters and costs nothing
+when profiling is off:
+
+    with stage("csv_read") as s:
+        df = pd.read_csv(path)
+        s.rows = len(df)
+
+Memory is measured as resident set size (from /proc or getrusage), not with tracemalloc,
+so profiling does not slow down the code it measures. Worker processes (`--jobs`)
+profile their own stages and return them for merging; their times add up across
+processes, so a stage's total can exceed the wall-clock time of the run.
+"""
+
+import os
+import sys
+import time
+
+# Stage names in pipeline order; reports list known stages in this order
+STAGES = (
+    "filename_parse",
+    "csv_read",
+    "header_check",
+    "date_validation",
+    "transform",
+    "store_write",
+    "registry_load",
+    "overlap_check",
+    "store_commit",
+    "registry_write",
+    "rollup_refresh",
+)
+
+_ACTIVE = None
+
+
+def current_rss() -> int | None:
+    """Return the current resident set size in bytes, or None where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def peak_rss() -> int | None:
+    """
+    Return the peak resident set size in bytes, or None where unavailable.
+    This is the largest of this process and its finished worker processes.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _Stage:
+    """Context manager timing one stage call; set `rows` to report throughput."""
+    __slots__ = ("profiler", "name", "rows", "_start", "_rss")
+
+    def __init__(self, profiler, name, rows=None):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        self._rss = current_rss()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self._start
+        rss = current_rss()
+        delta = rss - self._rss if rss is not None and self._rss is not None else 0
+        self.profiler.record(self.name, seconds, self.rows, delta)
+        return False
+
+
+class _NullStage:
+    """Stand-in for _Stage when profiling is off."""
+    __slots__ = ("rows",)
+
+    def __init__(self):
+        self.rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class Profiler:
+    """
+    Accumulates per-stage statistics.
+    Use `with profiler.activate():` around the profiled code; stage() calls inside record
+    into this profiler.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, name: str, seconds: float, rows=None, rss_delta: int = 0) -> None:
+        """Add one call of a stage."""
+        stats = self.stages.setdefault(
+            name, {"calls": 0, "seconds": 0.0, "rows": 0, "rss_delta_bytes": 0}
+        )
+        stats["calls"] += 1
+        stats["seconds"] += seconds
+        stats["rows"] += rows or 0
+        stats["rss_delta_bytes"] += rss_delta
+
+    def merge(self, stages: dict) -> None:
+        """Add stage statistics collected elsewhere (e.g. by a worker process)."""
+        for name, other in stages.items():
+            stats = self.stages.setdefault(
+                name, {"calls": 0, "seconds": 0.0, "rows": 0, "rss_delta_bytes": 0}
+            )
+            for key, value in other.items():
+                stats[key] += value
+
+    def stage(self, name: str, rows=None) -> _Stage:
+        return _Stage(self, name, rows)
+
+    def activate(self):
+        """Return a context manager making this the profiler stage() records into."""
+        from contextlib import contextmanager
+
+        @contextmanager
+        def active():
+            global _ACTIVE
+            previous, _ACTIVE = _ACTIVE, self
+            try:
+                yield self
+            finally:
+                _ACTIVE = previous
+                self.finished = time.perf_counter()
+
+        return active()
+
+    def report(self) -> dict:
+        """
+        Return the profile as a JSON-serializable dict: total_seconds, peak_rss_bytes and
+        a list of stages (name, calls, seconds, rows, rows_per_sec, rss_delta_bytes) in
+        pipeline order.
+        """
+        end = self.finished if self.finished is not None else time.perf_counter()
+        order = {name: i for i, name in enumerate(STAGES)}
+        stages = []
+        for name in sorted(self.stages, key=lambda n: (order.get(n, len(order)), n)):
+            stats = self.stages[name]
+            seconds = stats["seconds"]
+            rows = stats["rows"]
+            stages.append({
+                "name": name,
+                "calls": stats["calls"],
+                "seconds": round(seconds, 6),
+                "rows": rows,
+                "rows_per_sec": round(rows / seconds, 1) if rows and seconds > 0 else None,
+                "rss_delta_bytes": stats["rss_delta_bytes"],
+            })
+        return {
+            "total_seconds": round(end - self.started, 6),
+            "peak_rss_bytes": peak_rss(),
+            "stages": stages,
+        }
+
+
+def active() -> Profiler | None:
+    """Return the active Profiler, if any."""
+    return _ACTIVE
+
+
+def stage(name: str, rows=None):
+    """Time a stage in the active profiler; a no-op context manager when none is active."""
+    if _ACTIVE is None:
+        return _NullStage()
+    return _ACTIVE.stage(name, rows)
+
+
+def format_report(report: dict) -> list[str]:
+    """Return human-readable `[PROFILE]` lines for a Profiler.report() dict."""
+    lines = []
+    for s in report["stages"]:
+        line = f"[PROFILE]   {s['name']:<16} {s['seconds']:9.4f} s  {s['calls']:>5} call(s)"
+        if s["rows_per_sec"] is not None:
+            line += f"  {s['rows']:>10,} rows  {s['rows_per_sec']:>13,.0f} rows/s"
+        line += f"  RSS {s['rss_delta_bytes'] / 1024:+,.0f} KiB"
+        lines.append(line)
+    return lines
@@ -0,0 +1,218 @@
+"""
+recategorize.py — Incremental re-categorization of stored transactions.
+
+When rules.json or overrides.csv change, stored rows (see store.py) are brought up to date
+without re-matching everything. Every stored file records the digest of the config that
+categorized it, and the store keeps a snapshot of that config, so the old and new rule
+lists can be diffed:
+
+- Rules and overrides are compared by their common prefix. For rules, this is the
+  longest run of identical patterns from the start; for overrides, identical keys.
+- A row whose stored winner lies inside the prefix keeps it: every earlier entry is
+  unchanged, so none of them can match now. Only its category name is refreshed, since
+  categories may be edited in place.
+- A row won by an entry past the prefix, or by nothing, is re-matched against the new
+  entries past the prefix only. Entries inside the prefix are already known not to
+  match it.
+- A row that loses its override is matched against all rules. Its rule was never
+  computed, because overrides take precedence.
+
+Matching runs once per distinct description. Appending or editing a late rule therefore
+only touches the rows that rule could win. Files whose digest matches the current config
+are skipped.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+from .categorize import compile_overrides, compile_rules, match_overrides, match_rules
+from .schema import CATEGORY, DESCRIPTION, OVERRIDE_ID, RULE_ID, UNCATEGORIZED
+
+
+class RecategorizeResult(NamedTuple):
+    """Counts from a recategorize_store run."""
+    files: int
+    files_updated: int
+    rows: int
+    rows_changed: int
+
+
+def common_prefix(old: list, new: list) -> int:
+    """Return the length of the longest common prefix of two sequences."""
+    n = 0
+    for a, b in zip(old, new):
+        if a != b:
+            break
+        n += 1
+    return n
+
+
+@lru_cache(maxsize=8)
+def _compiled_rules(categories: tuple, patterns: tuple):
+    """Compile a rule list once per run, however many stored files use it."""
+    return compile_rules([{"category": c, "pattern": p} for c, p in zip(categories, patterns)])
+
+
+@lru_cache(maxsize=8)
+def _compiled_overrides(keys: tuple, categories: tuple):
+    return compile_overrides([{"key": k, "category": c} for k, c in zip(keys, categories)])
+
+
+def _match_unique(descriptions, match, compiled):
+    """Run a match_* function once per distinct description; -1 for missing ones."""
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(descriptions, use_na_sentinel=True)
+    ids = match(np.asarray(uniques, dtype=object), compiled)
+    return np.append(ids, -1).astype(np.int32)[codes]
+
+
+def recategorize_ids(descriptions, override_ids, rule_ids, old: dict, config):
+    """
+    Recompute (override_ids, rule_ids) under a new config, touching only affected rows.
+    Args:
+        descriptions: Canonical descriptions (array-like).
+        override_ids, rule_ids: Stored ids computed with the `old` snapshot.
+        old: Config snapshot ({"rules": [...], "overrides": [...]}, see
+            store.read_config_snapshot), or None to recompute every row.
+        config: The current Config.
+    Returns:
+        (override_ids, rule_ids, rematched): new int32 id arrays and the number of rows
+        that were re-matched.
+    """
+    import numpy as np
+
+    descriptions = np.asarray(descriptions, dtype=object)
+    override_ids = np.array(override_ids, dtype=np.int32)
+    rule_ids = np.array(rule_ids, dtype=np.int32)
+    new_keys = list(config.overrides.keys) if config.overrides is not None else []
+    new_patterns = [p.pattern for p in config.rules.patterns]
+    if old is None:
+        override_ids[:] = -1
+        rule_ids[:] = -1
+        q = p = 0
+        redo_rules = np.ones(len(descriptions), dtype=bool)
+    else:
+        q = common_prefix([o["key"] for o in old["overrides"]], new_keys)
+        p = common_prefix([r["pattern"] for r in old["rules"]], new_patterns)
+        redo_rules = np.zeros(len(descriptions), dtype=bool)
+    # Overrides: rows not claimed inside the key prefix may be claimed by a later key
+    lost_override = override_ids >= q
+    redo_overrides = lost_override.copy()
+    if len(new_keys) > q:
+        redo_overrides |= override_ids < 0
+    if redo_overrides.any():
+        rows = np.flatnonzero(redo_overrides)
+        found = np.full(len(rows), -1, dtype=np.int32)
+        if len(new_keys) > q:
+            suffix = _compiled_overrides(
+                tuple(new_keys[q:]), tuple(config.overrides.categories[q:])
+            )
+            found = _match_unique(descriptions[rows], match_overrides, suffix)
+        override_ids[rows] = np.where(found >= 0, found + q, -1)
+        # A row that lost its override has never been matched against the rules
+        redo_rules[rows[(found < 0) & lost_override[rows]]] = True
+        rule_ids[rows[found >= 0]] = -1
+    unclaimed = override_ids < 0
+    # Rules: unclaimed rows not won inside the pattern prefix may be won by a later rule
+    rematch_suffix = unclaimed & ~redo_rules & ((rule_ids < 0) | (rule_ids >= p))
+    for rows, offset in (
+        (np.flatnonzero(redo_rules & unclaimed), 0),
+        (np.flatnonzero(rematch_suffix), p),
+    ):
+        if not len(rows):
+            continue
+        if len(new_patterns) > offset:
+            suffix = _compiled_rules(
+                tuple(config.rules.categories[offset:]), tuple(new_patterns[offset:])
+            )
+            found = _match_unique(descriptions[rows], match_rules, suffix)
+            rule_ids[rows] = np.where(found >= 0, found + offset, -1)
+        else:
+            rule_ids[rows] = -1
+    rematched = int(np.count_nonzero(redo_overrides | redo_rules | rematch_suffix))
+    return override_ids, rule_ids, rematched
+
+
+def category_names(override_ids, rule_ids, config):
+    """Return the category name per row for the given ids under `config`."""
+    import numpy as np
+
+    categories = np.array(list(config.rules.categories) + [UNCATEGORIZED], dtype=object)[
+        rule_ids
+    ]
+    claimed = override_ids >= 0
+    if claimed.any():
+        categories[claimed] = np.array(config.overrides.categories, dtype=object)[
+            override_ids[claimed]
+        ]
+    return categories
+
+
+def recategorize_table(table, old: dict, config):
+    """
+    Recategorize one stored Arrow table.
+    Returns:
+        (table, changed): the table with new category/override_id/rule_id columns and the
+        number of rows whose category changed.
+    """
+    import numpy as np
+    import pyarrow as pa
+
+    descriptions = table.column(DESCRIPTION).to_numpy(zero_copy_only=False)
+    override_ids, rule_ids, _ = recategorize_ids(
+        descriptions,
+        table.column(OVERRIDE_ID).to_numpy(),
+        table.column(RULE_ID).to_numpy(),
+        old,
+        config,
+    )
+    categories = category_names(override_ids, rule_ids, config)
+    previous = table.column(CATEGORY).to_numpy(zero_copy_only=False)
+    changed = int(np.count_nonzero(previous != categories))
+    for name, values, type_ in (
+        (CATEGORY, categories, pa.string()),
+        (OVERRIDE_ID, override_ids, pa.int32()),
+        (RULE_ID, rule_ids, pa.int32()),
+    ):
+        i = table.schema.get_field_index(name)
+        table = table.set_column(i, table.schema.field(i), pa.array(values, type=type_))
+    return table, changed
+
+
+def recategorize_store(store_dir: str, config, dry_run: bool = False) -> RecategorizeResult:
+    """
+    Bring every stored file up to date with `config`.
+    Files already categorized with this config digest are skipped. Each file is rewritten
+    atomically with the new categories and digest (unless dry_run).
+    """
+    from .store import (
+        list_partitions,
+        read_config_snapshot,
+        read_table,
+        replace_table,
+        write_config_snapshot,
+    )
+
+    files = files_updated = rows = rows_changed = 0
+    snapshots = {}
+    if not dry_run:
+        write_config_snapshot(store_dir, config)
+    for _, _, path in list_partitions(store_dir):
+        files += 1
+        table = read_table(path)
+        rows += table.num_rows
+        metadata = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+        digest = metadata.get("config_digest")
+        if digest == config.digest:
+            continue
+        if digest not in snapshots:
+            snapshots[digest] = read_config_snapshot(store_dir, digest) if digest else None
+        table, changed = recategorize_table(table, snapshots[digest], config)
+        rows_changed += changed
+        files_updated += 1
+        if not dry_run:
+            metadata["config_digest"] = config.digest
+            replace_table(path, table.replace_schema_metadata(metadata))
+    return RecategorizeResult(files, files_updated, rows, rows_changed)
@@ -0,0 +1,202 @@
+"""
+registry.py — Registry queries.
+
+This module answers bulk questions about the range registry: which days of a period an
+account's exports do not cover (gaps), how much is covered, the last ingested date per
+account, and which file covers a given date. It backs `silver-garbanzo registry`.
+
+Queries run against the same per-account interval index as the overlap checks
+(overlap.load_range_index), which is loaded once and cached by registry version. Each
+account's ranges are merged into disjoint covered intervals in one pass over its
+sorted ranges; ranges that touch (one ends the day before the next starts) merge, so
+consecutive monthly exports show no gap. Point lookups (who_covers) are bisects.
+Everything here is pure Python: no pandas import.
+
+Dates are inclusive throughout, like the registry itself.
+"""
+
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from .overlap import RangeIndex, load_range_index
+
+_DAY = timedelta(days=1)
+
+
+class Gap(NamedTuple):
+    """Days of a period not covered by any recorded range of the account."""
+    account: str
+    start_date: datetime
+    end_date: datetime
+    days: int
+
+
+class Coverage(NamedTuple):
+    """
+    Coverage of one account. `ranges`, `first_date` and `last_date` (the last ingested
+    date) describe the whole registry; `covered_days` and `gap_days` the period
+    [period_start, period_end].
+    """
+    account: str
+    ranges: int
+    first_date: datetime | None
+    last_date: datetime | None
+    period_start: datetime | None
+    period_end: datetime | None
+    covered_days: int
+    gap_days: int
+
+
+class Covering(NamedTuple):
+    """A recorded range containing a queried date."""
+    date: datetime
+    account: str
+    start_date: datetime
+    end_date: datetime
+    source_file: str
+
+
+def _days(start_date: datetime, end_date: datetime) -> int:
+    return (end_date - start_date).days + 1
+
+
+def covered_intervals(index: RangeIndex, account: str) -> list[tuple[datetime, datetime]]:
+    """Return an account's covered days as disjoint, sorted (start, end) intervals."""
+    merged = []
+    for start_date, end_date, _ in index.ranges(account):
+        if merged and start_date <= merged[-1][1] + _DAY:
+            if end_date > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end_date)
+        else:
+            merged.append((start_date, end_date))
+    return merged
+
+
+def _period(intervals, start_date, end_date):
+    """Resolve an open period bound to the account's first or last covered day."""
+    if start_date is None and intervals:
+        start_date = intervals[0][0]
+    if end_date is None and intervals:
+        end_date = intervals[-1][1]
+    return start_date, end_date
+
+
+def _clip(intervals, start_date, end_date):
+    """Yield the parts of `intervals` inside [start_date, end_date]."""
+    # Intervals are disjoint and sorted, so their ends are sorted too
+    ends = [end for _, end in intervals]
+    for s, e in intervals[bisect_right(ends, start_date - _DAY):]:
+        if s > end_date:
+            break
+        yield max(s, start_date), min(e, end_date)
+
+
+def _accounts(index: RangeIndex, accounts) -> list[str]:
+    return index.accounts() if accounts is None else list(accounts)
+
+
+def coverage_gaps(
+    index: RangeIndex = None,
+    accounts=None,
+    start_date: datetime = None,
+    end_date: datetime = None,
+    registry_path: str = None,
+) -> list[Gap]:
+    """
+    Find uncovered days per account.
+    Args:
+        index: RangeIndex to query (default: the registry at registry_path).
+        accounts: Accounts to check (default: every account in the registry). An account
+            with no recorded ranges is one gap spanning the whole period.
+        start_date, end_date: Period to check (inclusive). Each open bound defaults to
+            the account's first or last covered day, so by default only gaps between
+            ingested files are reported.
+        registry_path: Registry to load when `index` is not given.
+    Returns:
+        Gaps sorted by account, then date.
+    """
+    index = index if index is not None else load_range_index(registry_path)
+    gaps = []
+    for account in _accounts(index, accounts):
+        intervals = covered_intervals(index, account)
+        start, end = _period(intervals, start_date, end_date)
+        if start is None or end is None or start > end:
+            continue
+        cursor = start
+        for s, e in _clip(intervals, start, end):
+            if s > cursor:
+                gaps.append(Gap(account, cursor, s - _DAY, _days(cursor, s - _DAY)))
+            cursor = e + _DAY
+        if cursor <= end:
+            gaps.append(Gap(account, cursor, end, _days(cursor, end)))
+    return gaps
+
+
+def coverage(
+    index: RangeIndex = None,
+    accounts=None,
+    start_date: datetime = None,
+    end_date: datetime = None,
+    registry_path: str = None,
+) -> list[Coverage]:
+    """
+    Summarize coverage per account: range count, first and last ingested date, and
+    covered and uncovered days in a period.
+    Args:
+        index, accounts, start_date, end_date, registry_path: As for coverage_gaps.
+    Returns:
+        Coverage per account, in account order.
+    """
+    index = index if index is not None else load_range_index(registry_path)
+    result = []
+    for account in _accounts(index, accounts):
+        intervals = covered_intervals(index, account)
+        start, end = _period(intervals, start_date, end_date)
+        covered = total = 0
+        if start is not None and end is not None and start <= end:
+            covered = sum(_days(s, e) for s, e in _clip(intervals, start, end))
+            total = _days(start, end)
+        result.append(Coverage(
+            account,
+            len(index.ranges(account)),
+            intervals[0][0] if intervals else None,
+            intervals[-1][1] if intervals else None,
+            start,
+            end,
+            covered,
+            total - covered,
+        ))
+    return result
+
+
+def last_ingested_dates(index: RangeIndex = None, registry_path: str = None) -> dict:
+    """Return {account: last covered date} for every account in the registry."""
+    index = index if index is not None else load_range_index(registry_path)
+    return {
+        account: max(end for _, end, _ in index.ranges(account))
+        for account in index.accounts()
+    }
+
+
+def who_covers(
+    dates, index: RangeIndex = None, accounts=None, registry_path: str = None
+) -> list[Covering]:
+    """
+    Find the recorded ranges containing each date.
+    Args:
+        dates: Dates to look up.
+        index, accounts, registry_path: As for coverage_gaps.
+    Returns:
+        Covering entries in date order, then account order; dates no range covers
+        have none.
+    """
+    index = index if index is not None else load_range_index(registry_path)
+    accounts = _accounts(index, accounts)
+    found = []
+    for date in sorted(dates):
+        for account in accounts:
+            conflict = index.find_overlap(account, date, date)
+            if conflict is not None:
+                found.append(Covering(date, account, *conflict))
+    return found
@@ -0,0 +1,188 @@
+"""
+rollups.py — Materialized monthly rollups for reports.
+
+Reports are run far more often than data changes, so split-applied totals (spend, income,
+count) per account, month and category are kept in one small Arrow file at the store
+root (`_rollups.arrow`). Monthly, quarterly and yearly reports roll these up instead of
+scanning transactions; weekly reports still scan, since weeks straddle months.
+
+The rollups are kept consistent with the store, not trusted blindly:
+
+- Each (account, month) records a stamp of its partition files (name, size, mtime and
+  inode). A refresh recomputes only the months whose stamp changed, appeared or
+  disappeared, so an ingest touching two months rereads two partitions. Recategorized
+  files get a new stamp too.
+- The file records a digest of rules.json, overrides.csv and splits.csv. When it differs
+  from the current config, every month is recomputed.
+- Split-mismatch warnings are recorded per (account, month) alongside the totals, so a
+  report still warns about months an earlier ingest or recategorize recomputed.
+
+ingest_batch refreshes the rollups after each committed store write, and the report and
+recategorize commands refresh them before use. The file is a cache: deleting it is safe.
+"""
+
+import hashlib
+import json
+import os
+
+from .categorize import combine_digests
+from .schema import ACCOUNT, AMOUNT, CATEGORY, DATE, FINGERPRINT
+
+ROLLUP_FILE = "_rollups.arrow"
+MONTH = "month"
+ROLLUP_FORMAT = 2
+
+
+def rollup_digest(config) -> str:
+    """Return the digest of everything rollups depend on: rules, overrides and splits."""
+    from .config import SPLITS_FILE
+
+    return combine_digests(config.digest, config.file_digests.get(SPLITS_FILE, ""))
+
+
+def partition_stamps(store_dir: str) -> dict[str, str]:
+    """
+    Return a stamp per stored partition, keyed by "<account>/<month>".
+    A stamp changes whenever a file in the partition is added, removed or replaced.
+    """
+    from .store import list_partitions
+
+    files = {}
+    for account, month, path in list_partitions(store_dir):
+        st = os.stat(path)
+        files.setdefault(f"{account}/{month}", []).append(
+            f"{os.path.basename(path)}:{st.st_size}:{st.st_mtime_ns}:{st.st_ino}"
+        )
+    return {
+        key: hashlib.sha256("\n".join(entries).encode()).hexdigest()[:16]
+        for key, entries in files.items()
+    }
+
+
+def month_totals(df):
+    """
+    Total transactions per account, month (YYYY-MM) and category.
+    Returns:
+        DataFrame with account, month, category, spend, income and count.
+    """
+    from .report import COUNT, INCOME, PERIOD, SPEND, daily_totals, rollup
+
+    by = (ACCOUNT, CATEGORY)
+    totals = rollup(daily_totals(df, by), "monthly", by)
+    totals[MONTH] = totals[PERIOD].dt.strftime("%Y-%m")
+    return totals[[ACCOUNT, MONTH, CATEGORY, SPEND, INCOME, COUNT]]
+
+
+def _compute(store_dir: str, config, keys):
+    """
+    Recompute month_totals for the given "<account>/<month>" partitions.
+    Returns:
+        (totals, warnings): the totals, and split-mismatch warnings keyed by partition.
+    """
+    from .splits import apply_splits, mismatch_warnings, split_mismatches
+    from .store import read_store
+
+    columns = [DATE, AMOUNT, CATEGORY, ACCOUNT] + ([FINGERPRINT] if config.splits else [])
+    partitions = [tuple(key.split("/", 1)) for key in keys]
+    df = read_store(store_dir, columns=columns, partitions=partitions)
+    warnings = {}
+    if config.splits:
+        report = split_mismatches(df, config.splits)
+        months = report[ACCOUNT].astype(str) + "/" + report[DATE].dt.strftime("%Y-%m")
+        for key, warning in zip(months, mismatch_warnings(report)):
+            warnings.setdefault(key, []).append(warning)
+        df, _ = apply_splits(df, config.splits)
+    return month_totals(df), warnings
+
+
+def _read(path: str):
+    """Return (frame, metadata) for an existing rollup file, or (None, {})."""
+    from .store import read_table
+
+    try:
+        table = read_table(path)
+    except (OSError, ValueError):
+        return None, {}
+    metadata = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+    if metadata.get("rollup_format") != str(ROLLUP_FORMAT):
+        return None, {}
+    return table.to_pandas(categories=[ACCOUNT, CATEGORY]), metadata
+
+
+def _warnings(by_month: dict, accounts=None) -> list[str]:
+    """Flatten per-month warnings in month order, keeping only `accounts` if given."""
+    return [
+        warning
+        for key in sorted(by_month)
+        if accounts is None or key.split("/", 1)[0] in accounts
+        for warning in by_month[key]
+    ]
+
+
+def refresh_rollups(store_dir: str, config, write: bool = True, accounts=None):
+    """
+    Bring the rollups up to date with the store and config, recomputing only stale months.
+    Args:
+        store_dir: Store root (see store.default_store_dir).
+        config: The current Config.
+        write: Save the refreshed rollups (atomically) if anything changed.
+        accounts: Only return the warnings of these accounts (default: all).
+    Returns:
+        (rollups, warnings): account/month/category totals and the split warnings of
+        every stored month, whether recomputed now or by an earlier refresh.
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    from .store import replace_table
+
+    path = os.path.join(store_dir, ROLLUP_FILE)
+    digest = rollup_digest(config)
+    stamps = partition_stamps(store_dir)
+    rollups, metadata = _read(path)
+    old_stamps = json.loads(metadata.get("stamps", "{}"))
+    old_warnings = json.loads(metadata.get("split_warnings", "{}"))
+    if rollups is None or metadata.get("rollup_digest") != digest:
+        old_stamps = old_warnings = {}
+    stale = sorted(
+        key for key in set(stamps) | set(old_stamps) if stamps.get(key) != old_stamps.get(key)
+    )
+    if not stale and rollups is not None:
+        return rollups, _warnings(old_warnings, accounts)
+    fresh, warnings = _compute(store_dir, config, [key for key in stale if key in stamps])
+    for key in old_warnings.keys() - set(stale):
+        warnings[key] = old_warnings[key]
+    frames = [fresh.astype({ACCOUNT: object, CATEGORY: object})]
+    if old_stamps:
+        keys = rollups[ACCOUNT].astype(object) + "/" + rollups[MONTH]
+        kept = rollups.loc[~keys.isin(stale).to_numpy()]
+        frames.insert(0, kept.astype({ACCOUNT: object, CATEGORY: object}))
+    rollups = pd.concat(frames, ignore_index=True).sort_values(
+        [ACCOUNT, MONTH, CATEGORY], kind="stable", ignore_index=True
+    )
+    if write and os.path.isdir(store_dir):
+        table = pa.Table.from_pandas(rollups, preserve_index=False).replace_schema_metadata({
+            "rollup_format": str(ROLLUP_FORMAT),
+            "rollup_digest": digest,
+            "stamps": json.dumps(stamps, sort_keys=True),
+            "split_warnings": json.dumps(warnings, sort_keys=True),
+        })
+        replace_table(path, table)
+    rollups = rollups.astype({ACCOUNT: "category", CATEGORY: "category"})
+    return rollups, _warnings(warnings, accounts)
+
+
+def rollup_frame(rollups, accounts=None):
+    """
+    Return rollups as report input: `date` (first of the month) instead of `month`.
+    Args:
+        rollups: From refresh_rollups.
+        accounts: Accounts to keep (default: all).
+    """
+    import pandas as pd
+
+    if accounts is not None:
+        rollups = rollups.loc[rollups[ACCOUNT].isin(accounts).to_numpy()]
+    frame = rollups.drop(columns=[MONTH])
+    frame.insert(0, DATE, pd.to_datetime(rollups[MONTH], format="%Y-%m"))
+    return frame.reset_index(drop=True)
@@ -0,0 +1,21 @@
+"""
+schema.py — Canonical column names.
+
+All downstream stages (normalize, categorize, splits, report) assume this schema after
+normalization. Column names are defined once here so no stage hardcodes them.
+"""
+
+DATE = "date"
+DESCRIPTION = "description"
+AMOUNT = "amount"
+TRANSACTION_TYPE = "transaction_type"
+ACCOUNT = "account"
+CATEGORY = "category"
+FINGERPRINT = "fingerprint"
+# Index of the overrides.csv row that assigned the category (-1 if none matched)
+OVERRIDE_ID = "override_id"
+# Index of the rules.json rule that assigned the category (-1 if none matched or an
+# override took precedence)
+RULE_ID = "rule_id"
+
+UNCATEGORIZED = "Uncategorized"
@@ -0,0 +1,341 @@
+"""
+server.py — Local ingest server.
+
+This module backs `silver-garbanzo serve` and `silver-garbanzo submit`. Several jobs can
+submit files at the same time without racing on the registry. One foreground process
+listens on a unix domain socket, and every registry commit goes through it:
+
+- Each request is validated as soon as it arrives, concurrently with other requests:
+  the per-file stages (CSV read, header and date checks, store staging) run in the
+  request's thread, or in a shared worker pool with `jobs` > 1.
+- Overlap checks and commits (ingest.commit_batch) run on one writer thread, one
+  request at a time, in arrival order. A range accepted for one request is therefore
+  in the registry index before the next request is checked against it, and no two
+  commits interleave.
+
+Config and registry stay loaded between requests, as in watch mode. Only the
+submitting user can use the server: the socket is created with mode 0600, and no
+network port is opened. See ADR 0010.
+
+The protocol is one JSON object per line, with one request and one response per
+connection:
+
+    {"op": "ingest", "paths": ["/abs/path/checking__2026-01.csv"], "dry_run": false}
+    {"ok": true, "accepted": [{"path": ..., "account": ..., "start_date": "2026-01-01",
+     "end_date": "2026-01-31", "filename": ...}], "rejected": [{"path": ..., "error": ...}],
+     "warnings": [{"path": ..., "warning": ...}]}
+
+"ok" is false only when the request itself failed (malformed request, invalid config);
+rejected files are reported per file. The client side (submit, batch_result) does not
+import pandas.
+"""
+
+import json
+import os
+import socket
+import threading
+from datetime import datetime
+
+from .ingest import BatchResult, commit_batch, store_target, validate_batch
+from .watch import ConfigWatcher
+
+SOCKET_FILE = "ingest.sock"
+# Requests are a list of paths; anything larger is not a request
+MAX_REQUEST_BYTES = 1 << 20
+
+
+def default_socket_path(registry_path: str = None) -> str:
+    """Return the server socket path: ingest.sock next to the registry (state/ by default)."""
+    from .contracts import default_registry_path
+
+    registry_path = registry_path or default_registry_path()
+    return os.path.join(os.path.dirname(os.path.abspath(registry_path)), SOCKET_FILE)
+
+
+def _require_unix_sockets():
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError(
+            "The ingest server needs unix domain sockets, which this platform does not "
+            "provide; run `silver-garbanzo ingest` instead"
+        )
+
+
+def batch_response(csv_paths, result: BatchResult) -> dict:
+    """Return a BatchResult for `csv_paths` as a JSON-serializable response."""
+    rejected_paths = {path for path, _ in result.rejected}
+    accepted_paths = [p for p in csv_paths if p not in rejected_paths]
+    return {
+        "ok": True,
+        "accepted": [
+            {
+                "path": path,
+                "account": r.account,
+                "start_date": r.start_date.date().isoformat(),
+                "end_date": r.end_date.date().isoformat(),
+                "filename": r.filename,
+            }
+            for path, r in zip(accepted_paths, result.accepted)
+        ],
+        "rejected": [{"path": path, "error": error} for path, error in result.rejected],
+        "warnings": [{"path": path, "warning": warning} for path, warning in result.warnings],
+    }
+
+
+def batch_result(response: dict) -> BatchResult:
+    """Return a successful ingest response as a BatchResult (for reporting like ingest)."""
+    from .contracts import FilenameRange
+
+    return BatchResult(
+        [
+            FilenameRange(
+                a["account"],
+                datetime.fromisoformat(a["start_date"]),
+                datetime.fromisoformat(a["end_date"]),
+                a["filename"],
+            )
+            for a in response["accepted"]
+        ],
+        [(r["path"], r["error"]) for r in response["rejected"]],
+        [(w["path"], w["warning"]) for w in response["warnings"]],
+    )
+
+
+class IngestServer:
+    """
+    Validates ingest requests concurrently and commits them through one writer thread.
+    handle() processes one decoded request and is safe to call from many threads;
+    bind() and serve_forever() expose it on a unix socket.
+    """
+
+    def __init__(
+        self,
+        socket_path: str = None,
+        registry_path: str = None,
+        jobs: int = 1,
+        chunksize: int = None,
+        journal: bool = False,
+        store_dir: str = None,
+        config_watcher: ConfigWatcher = None,
+        report=None,
+    ):
+        """
+        Args:
+            socket_path: Socket to listen on (default: default_socket_path()).
+            registry_path: Registry path (default: state/ingested_ranges.csv).
+            jobs: Validate files in this many shared worker processes; 1 validates in
+                each request's thread.
+            chunksize, journal: As for ingest_batch.
+            store_dir: If set, transactions are also written to the store here.
+            config_watcher: Config source (default: ConfigWatcher for the default config
+                dir); load it once before serving so a broken config fails at startup.
+            report: Called as report(event, payload) for "config" (ConfigError or None
+                when reloaded) and "batch" ((BatchResult, paths)) events.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.socket_path = socket_path or default_socket_path(registry_path)
+        self.registry_path = registry_path
+        self.chunksize = chunksize
+        self.journal = journal
+        self.store_dir = store_dir
+        self.config_watcher = config_watcher or ConfigWatcher()
+        self.report = report or (lambda event, payload: None)
+        self._config_lock = threading.Lock()
+        self._config_error = None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-writer")
+        self._pool = None
+        if jobs > 1:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Workers are started from a threaded process, so never fork them
+            self._pool = ProcessPoolExecutor(
+                max_workers=jobs, mp_context=multiprocessing.get_context("spawn")
+            )
+        self._server = None
+
+    def _config(self):
+        """Return the current Config, reporting each reload or new config problem once."""
+        from .config import ConfigError
+
+        with self._config_lock:
+            try:
+                config, reloaded = self.config_watcher.get()
+            except ConfigError as e:
+                if e.errors != self._config_error:
+                    self.report("config", e)
+                self._config_error = e.errors
+                raise
+            self._config_error = None
+            if reloaded:
+                self.report("config", None)
+            return config
+
+    def handle(self, request: dict) -> dict:
+        """
+        Process one request and return its response (see the module docstring).
+        Ops: "ingest" (paths, optional dry_run) and "ping".
+        """
+        from .config import ConfigError
+
+        try:
+            op = request.get("op") if isinstance(request, dict) else None
+            if op == "ping":
+                return {"ok": True}
+            if op != "ingest":
+                raise ValueError(f"Unknown request op: {op!r}")
+            paths = request.get("paths")
+            if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+                raise ValueError("Request paths must be a list of file paths")
+            relative = [p for p in paths if not os.path.isabs(p)]
+            if relative:
+                raise ValueError(f"Request paths must be absolute: {relative[0]}")
+            dry_run = bool(request.get("dry_run", False))
+            config = self._config()
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+        except ConfigError as e:
+            return {"ok": False, "error": "Config validation failed", "errors": e.errors}
+        paths = list(dict.fromkeys(paths))
+        store = None
+        if self.store_dir:
+            store = store_target(
+                config, None if dry_run else self.store_dir, self.config_watcher.cache_dir
+            )
+        validated = validate_batch(
+            paths, chunksize=self.chunksize, store=store, executor=self._pool
+        )
+        result = self._writer.submit(self._commit, paths, validated, dry_run, store).result()
+        return batch_response(paths, result)
+
+    def _commit(self, paths, validated, dry_run, store) -> BatchResult:
+        """Run on the writer thread only, so commits (and their reports) never interleave."""
+        result = commit_batch(
+            paths,
+            validated,
+            dry_run=dry_run,
+            registry_path=self.registry_path,
+            journal=self.journal,
+            store=store,
+        )
+        self.report("batch", (result, paths))
+        return result
+
+    def bind(self) -> None:
+        """
+        Start listening on the socket.
+        Raises:
+            RuntimeError: If unix sockets are unavailable or a server is already running.
+        """
+        import socketserver
+
+        _require_unix_sockets()
+        if os.path.exists(self.socket_path):
+            try:
+                _connect(self.socket_path, timeout=1).close()
+            except OSError:
+                os.unlink(self.socket_path)  # left behind by a server that was killed
+            else:
+                raise RuntimeError(f"An ingest server is already listening on {self.socket_path}")
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+                try:
+                    if len(line) > MAX_REQUEST_BYTES:
+                        raise ValueError("Request too large")
+                    request = json.loads(line)
+                except ValueError as e:
+                    response = {"ok": False, "error": f"Malformed request: {e}"}
+                else:
+                    try:
+                        response = server.handle(request)
+                    except Exception as e:  # e.g. the registry could not be written
+                        response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+
+        class Server(socketserver.ThreadingUnixStreamServer):
+            daemon_threads = True
+
+        # Owner-only from the moment the socket exists
+        umask = os.umask(0o177)
+        try:
+            self._server = Server(self.socket_path, Handler)
+        finally:
+            os.umask(umask)
+
+    def serve_forever(self) -> None:
+        """Serve requests until shutdown() is called (bind() first)."""
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serve_forever() (from another thread)."""
+        if self._server is not None:
+            self._server.shutdown()
+
+    def close(self) -> None:
+        """Release the socket, writer and worker pool; pending commits finish first."""
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+        self._writer.shutdown(wait=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+
+def _connect(socket_path: str, timeout: float = None):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def submit(paths, socket_path: str = None, dry_run: bool = False, timeout: float = None) -> dict:
+    """
+    Send an ingest request to a running server and wait for its response.
+    Args:
+        paths: CSV paths to ingest; relative paths are resolved against the current
+            directory.
+        socket_path: Server socket (default: default_socket_path()).
+        dry_run: Validate and check overlaps without writing anything.
+        timeout: Seconds to wait for the response (default: no limit).
+    Returns:
+        The response dict (see the module docstring).
+    Raises:
+        RuntimeError: If no server is listening on the socket.
+    """
+    return request(
+        {"op": "ingest", "paths": [os.path.abspath(p) for p in paths], "dry_run": dry_run},
+        socket_path,
+        timeout,
+    )
+
+
+def request(payload: dict, socket_path: str = None, timeout: float = None) -> dict:
+    """Send one request to the server and return its decoded response."""
+    _require_unix_sockets()
+    socket_path = socket_path or default_socket_path()
+    try:
+        sock = _connect(socket_path, timeout)
+    except (FileNotFoundError, ConnectionRefusedError):
+        raise RuntimeError(
+            f"No ingest server is listening on {socket_path}; start one with "
+            "`silver-garbanzo serve`"
+        ) from None
+    with sock, sock.makefile("rwb") as f:
+        f.write(json.dumps(payload).encode() + b"\n")
+        f.flush()
+        line = f.readline()
+    if not line:
+        raise RuntimeError("The ingest server closed the connection without a response")
+    return json.loads(line)
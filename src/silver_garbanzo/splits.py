@@ -0,0 +1,142 @@
+"""
+splits.py — Manual splits (reporting only).
+
+This module applies `config/splits.csv`: every transaction whose fingerprint appears there
+is replaced by its split rows, and a warning is emitted when a fingerprint's split total
+does not match the original amount (splits are not enforced in the MVP).
+
+Split amounts are magnitudes: each split row takes the sign of the transaction it
+replaces, so a -45.00 debit can be split as 30.00 + 15.00.
+
+The stage is one hash join: split amounts are totalled per fingerprint with a single
+groupby, matched transactions are found with isin, split rows are produced by one merge,
+and the result is assembled with a single concat, so there are no per-row lookups.
+"""
+
+from .schema import (
+    ACCOUNT,
+    AMOUNT,
+    CATEGORY,
+    DATE,
+    DESCRIPTION,
+    FINGERPRINT,
+    OVERRIDE_ID,
+    RULE_ID,
+)
+
+SPLIT_TOTAL = "split_total"
+DIFFERENCE = "difference"
+# Split totals within half a cent of the original amount match
+_TOLERANCE = 0.005
+
+
+def splits_frame(splits):
+    """
+    Return splits as a DataFrame with fingerprint, category and amount (float) columns.
+    Args:
+        splits: Config.splits (fingerprint -> [(category, amount)], see config.load_config)
+            or a DataFrame with those columns.
+    """
+    import pandas as pd
+
+    if isinstance(splits, pd.DataFrame):
+        frame = splits[[FINGERPRINT, CATEGORY, AMOUNT]].copy()
+        frame[AMOUNT] = frame[AMOUNT].astype(float)
+        return frame
+    rows = [
+        (fingerprint, category, amount)
+        for fingerprint, parts in splits.items()
+        for category, amount in parts
+    ]
+    frame = pd.DataFrame(rows, columns=[FINGERPRINT, CATEGORY, AMOUNT])
+    frame[AMOUNT] = frame[AMOUNT].astype(float)
+    return frame
+
+
+def split_mismatches(df, splits):
+    """
+    Compare split totals with the amounts of the transactions they split.
+    Args:
+        df: Transactions with `fingerprint` and signed `amount` columns.
+        splits: See splits_frame.
+    Returns:
+        DataFrame with fingerprint, date, description, amount, account (when df has
+        them), split_total and difference (split_total minus the original magnitude) for
+        each transaction whose split total differs from its amount by more than half a cent.
+    """
+    return _split_transactions(df, splits_frame(splits))[2]
+
+
+def mismatch_warnings(report) -> list[str]:
+    """Return one warning per row of a split_mismatches report."""
+    return [
+        f"Split total {row[SPLIT_TOTAL]:.2f} does not match amount {row[AMOUNT]:.2f} "
+        f"for fingerprint {row[FINGERPRINT]}"
+        for row in report.to_dict("records")
+    ]
+
+
+def _split_transactions(df, frame):
+    """Return (matched mask, split totals per fingerprint, mismatch report)."""
+    import numpy as np
+
+    totals = frame[AMOUNT].abs().groupby(frame[FINGERPRINT], sort=False).sum()
+    matched = df[FINGERPRINT].isin(totals.index).to_numpy()
+    originals = df.loc[matched]
+    split_total = originals[FINGERPRINT].map(totals).to_numpy(dtype=np.float64)
+    magnitude = originals[AMOUNT].abs().to_numpy(dtype=np.float64)
+    difference = split_total - magnitude
+    bad = np.abs(difference) > _TOLERANCE
+    columns = [c for c in (FINGERPRINT, DATE, DESCRIPTION, AMOUNT, ACCOUNT) if c in df.columns]
+    report = originals.loc[bad, columns].copy()
+    report[SPLIT_TOTAL] = split_total[bad]
+    report[DIFFERENCE] = np.round(difference[bad], 2)
+    return matched, totals, report
+
+
+def apply_splits(df, splits):
+    """
+    Replace each split transaction by its split rows.
+    Split rows keep every column of the transaction they replace except `category`
+    (from splits.csv) and `amount` (the split magnitude with the original's sign);
+    `override_id`/`rule_id`, when present, are -1 since no rule assigned the category.
+    Split rows take the place of the original row, so row order is otherwise unchanged.
+    Args:
+        df: Categorized transactions with `fingerprint`, `amount` and `category` columns.
+        splits: See splits_frame.
+    Returns:
+        (df, warnings): the split-applied transactions and one warning per transaction
+        whose split total does not match its amount.
+    """
+    import numpy as np
+    import pandas as pd
+
+    frame = splits_frame(splits)
+    matched, _, report = _split_transactions(df, frame)
+    warnings = mismatch_warnings(report)
+    if not matched.any():
+        return df.copy(), warnings
+    positions = np.arange(len(df))
+    originals = df.loc[matched].drop(columns=[CATEGORY]).assign(_position=positions[matched])
+    # Inner merge keeps the originals' order, with each transaction's splits in file order
+    split_rows = originals.merge(
+        frame.rename(columns={AMOUNT: "_split_amount"}), on=FINGERPRINT, how="inner"
+    )
+    split_rows.index = originals.index[
+        np.searchsorted(positions[matched], split_rows["_position"].to_numpy())
+    ]
+    split_rows[AMOUNT] = np.copysign(
+        split_rows["_split_amount"].abs().to_numpy(), split_rows[AMOUNT].to_numpy()
+    )
+    for column in (OVERRIDE_ID, RULE_ID):
+        if column in split_rows.columns:
+            split_rows[column] = np.full(len(split_rows), -1, dtype=df[column].dtype)
+    kept = df.loc[~matched].assign(_position=positions[~matched])
+    if isinstance(df[CATEGORY].dtype, pd.CategoricalDtype):
+        # Share one category set so the concat keeps the categorical dtype
+        categories = df[CATEGORY].cat.categories.union(pd.Index(frame[CATEGORY].unique()))
+        kept[CATEGORY] = kept[CATEGORY].cat.set_categories(categories)
+        split_rows[CATEGORY] = pd.Categorical(split_rows[CATEGORY], categories=categories)
+    out = pd.concat([kept, split_rows[kept.columns]])
+    out = out.iloc[np.argsort(out["_position"].to_numpy(), kind="stable")]
+    return out.drop(columns=["_position"]), warnings
@@ -0,0 +1,297 @@
+"""
+store.py — Columnar transaction store.
+
+This module persists ingested transactions (normalized, fingerprinted and categorized) so
+reports and re-categorization never re-read raw CSVs. Files are Arrow IPC (Feather v2),
+uncompressed so they can be memory-mapped, and partitioned by account and month:
+
+    state/store/account=<account>/month=<YYYY-MM>/<source file stem>.arrow
+
+One file per source CSV and month means an ingest only ever adds files, and re-running a
+failed ingest replaces its own files. Readers prune partitions by directory name and
+read only the columns they ask for.
+
+pyarrow is an optional dependency (`pip install 'silver-garbanzo[store]'`); it is
+imported only when the store is used.
+"""
+
+import json
+import os
+import tempfile
+
+from .schema import (
+    ACCOUNT,
+    AMOUNT,
+    CATEGORY,
+    DATE,
+    DESCRIPTION,
+    FINGERPRINT,
+    OVERRIDE_ID,
+    RULE_ID,
+    TRANSACTION_TYPE,
+)
+
+STORE_FORMAT = 1
+STORE_SUFFIX = ".arrow"
+# Config snapshots (rules and overrides by config digest) live under the store root
+SNAPSHOT_DIR = "_config"
+# String columns returned as pandas categoricals by read_store
+CATEGORICAL_COLUMNS = (TRANSACTION_TYPE, ACCOUNT, CATEGORY)
+
+
+def require_pyarrow():
+    """Return the pyarrow module, or raise RuntimeError explaining how to install it."""
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        raise RuntimeError(
+            "The transaction store requires pyarrow: pip install 'silver-garbanzo[store]'"
+        )
+    return pyarrow
+
+
+def default_store_dir(registry_path: str = None) -> str:
+    """Return the store directory: store/ next to the registry (state/store by default)."""
+    from .contracts import default_registry_path
+
+    registry_path = registry_path or default_registry_path()
+    return os.path.join(os.path.dirname(os.path.abspath(registry_path)), "store")
+
+
+def store_schema(metadata: dict = None):
+    """Return the Arrow schema of stored transactions."""
+    pa = require_pyarrow()
+    return pa.schema([
+        (DATE, pa.timestamp("ns")),
+        (DESCRIPTION, pa.string()),
+        (AMOUNT, pa.float64()),
+        (TRANSACTION_TYPE, pa.string()),
+        (ACCOUNT, pa.string()),
+        (FINGERPRINT, pa.string()),
+        (CATEGORY, pa.string()),
+        (OVERRIDE_ID, pa.int32()),
+        (RULE_ID, pa.int32()),
+    ], metadata=metadata)
+
+
+def partition_dir(store_dir: str, account: str, month: str) -> str:
+    """Return the directory holding one account's transactions for one month (YYYY-MM)."""
+    return os.path.join(store_dir, f"account={account}", f"month={month}")
+
+
+class PartitionWriter:
+    """
+    Stage one source file's transactions into per-month Arrow files.
+    Frames can be written in any number of chunks; each month's file is written to a
+    temporary name next to its final path and only appears in the store on commit.
+    """
+
+    def __init__(self, store_dir: str, account: str, source_file: str, metadata: dict = None):
+        self.store_dir = store_dir
+        self.account = account
+        self.name = os.path.splitext(source_file)[0] + STORE_SUFFIX
+        self.schema = store_schema({
+            "store_format": str(STORE_FORMAT),
+            "account": account,
+            "source_file": source_file,
+            **(metadata or {}),
+        })
+        self._writers = {}
+        self._staged = []
+
+    def write(self, df) -> None:
+        """Append canonical, categorized rows (see ingest.transform_transactions)."""
+        import pyarrow as pa
+
+        columns = {}
+        for field in self.schema:
+            values = df[field.name]
+            if values.dtype == "category":
+                values = values.astype(object)
+            columns[field.name] = values
+        dates = df[DATE].dt
+        month_keys = (dates.year * 100 + dates.month).to_numpy()
+        for key, rows in df.groupby(month_keys, sort=True).indices.items():
+            table = pa.Table.from_pydict(
+                {name: values.iloc[rows] for name, values in columns.items()},
+                schema=self.schema,
+            )
+            self._writer(f"{key // 100:04d}-{key % 100:02d}").write_table(table)
+
+    def _writer(self, month):
+        import pyarrow as pa
+
+        writer = self._writers.get(month)
+        if writer is None:
+            directory = partition_dir(self.store_dir, self.account, month)
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{self.name}.", suffix=".tmp")
+            os.close(fd)
+            self._staged.append((temp_path, os.path.join(directory, self.name)))
+            writer = self._writers[month] = pa.ipc.new_file(temp_path, self.schema)
+        return writer
+
+    def close(self) -> list[tuple[str, str]]:
+        """Finish writing and return the staged (temp path, final path) pairs."""
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+        return list(self._staged)
+
+    def abort(self) -> None:
+        """Close and remove everything staged so far."""
+        for writer in self._writers.values():
+            try:
+                writer.close()
+            except Exception:
+                pass
+        self._writers = {}
+        discard_staged(self._staged)
+        self._staged = []
+
+
+def commit_staged(staged: list[tuple[str, str]]) -> None:
+    """Move staged files into place; each is fsync'd first so a crash never exposes a torn file."""
+    for temp_path, final_path in staged:
+        with open(temp_path, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(temp_path, final_path)
+
+
+def discard_staged(staged: list[tuple[str, str]]) -> None:
+    """Remove staged files that will not be committed."""
+    for temp_path, _ in staged:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+
+
+def write_config_snapshot(store_dir: str, config) -> str:
+    """
+    Save the rules and overrides a Config was built from, named by its digest.
+    Stored files reference their config by digest (`config_digest` metadata), so the
+    snapshot lets a later run see exactly which rules categorized them.
+    Returns:
+        The snapshot path (an existing snapshot is left as is).
+    """
+    directory = os.path.join(store_dir, SNAPSHOT_DIR)
+    path = os.path.join(directory, f"{config.digest}.json")
+    if os.path.exists(path):
+        return path
+    overrides = config.overrides
+    snapshot = {
+        "rules": [
+            {"category": category, "pattern": pattern.pattern}
+            for category, pattern in zip(config.rules.categories, config.rules.patterns)
+        ],
+        "overrides": [
+            {"key": key, "category": category}
+            for key, category in zip(overrides.keys, overrides.categories)
+        ] if overrides is not None else [],
+    }
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", delete=False, dir=directory, encoding="utf-8") as tf:
+        json.dump(snapshot, tf)
+        temp_path = tf.name
+    os.replace(temp_path, path)
+    return path
+
+
+def read_config_snapshot(store_dir: str, digest: str) -> dict | None:
+    """Return the {"rules": [...], "overrides": [...]} snapshot for a digest, or None."""
+    path = os.path.join(store_dir, SNAPSHOT_DIR, f"{digest}.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def list_partitions(store_dir: str, accounts=None, months=None) -> list[tuple[str, str, str]]:
+    """
+    List stored files, pruned by account and month (YYYY-MM) using directory names only.
+    Returns:
+        Sorted (account, month, path) tuples.
+    """
+    found = []
+    if not os.path.isdir(store_dir):
+        return found
+    for account_dir in sorted(os.listdir(store_dir)):
+        if not account_dir.startswith("account="):
+            continue
+        account = account_dir[len("account="):]
+        if accounts is not None and account not in accounts:
+            continue
+        for month_dir in sorted(os.listdir(os.path.join(store_dir, account_dir))):
+            if not month_dir.startswith("month="):
+                continue
+            month = month_dir[len("month="):]
+            if months is not None and month not in months:
+                continue
+            directory = os.path.join(store_dir, account_dir, month_dir)
+            for name in sorted(os.listdir(directory)):
+                if name.endswith(STORE_SUFFIX) and not name.startswith("."):
+                    found.append((account, month, os.path.join(directory, name)))
+    return found
+
+
+def read_table(path: str, columns=None):
+    """Memory-map one stored file and return it as an Arrow table (optionally projected)."""
+    pa = require_pyarrow()
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.select(list(columns)) if columns is not None else table
+
+
+def read_metadata(path: str) -> dict:
+    """Return a stored file's schema metadata (source_file, config_digest, ...) as str."""
+    pa = require_pyarrow()
+    with pa.memory_map(path, "r") as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    return {k.decode(): v.decode() for k, v in metadata.items()}
+
+
+def replace_table(path: str, table) -> None:
+    """Atomically replace a stored file with `table` (temp file, fsync, rename)."""
+    pa = require_pyarrow()
+    directory, name = os.path.split(path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        with pa.ipc.new_file(temp_path, table.schema) as writer:
+            writer.write_table(table)
+        commit_staged([(temp_path, path)])
+    except BaseException:
+        discard_staged([(temp_path, path)])
+        raise
+
+
+def read_store(store_dir: str, columns=None, accounts=None, months=None, partitions=None):
+    """
+    Read stored transactions into a DataFrame.
+    Args:
+        store_dir: Store root (see default_store_dir).
+        columns: Columns to read (default: all).
+        accounts: Accounts to read (default: all).
+        months: Months to read, as YYYY-MM strings (default: all).
+        partitions: Exact (account, month) pairs to read (default: all).
+    Returns:
+        DataFrame with the requested columns; transaction_type, account and category are
+        categoricals.
+    """
+    pa = require_pyarrow()
+    schema = store_schema()
+    if columns is None:
+        columns = schema.names
+    found = list_partitions(store_dir, accounts, months)
+    if partitions is not None:
+        partitions = set(partitions)
+        found = [p for p in found if p[:2] in partitions]
+    tables = [read_table(path, columns) for _, _, path in found]
+    if not tables:
+        tables = [schema.empty_table().select(list(columns))]
+    table = pa.concat_tables(tables)
+    categories = [c for c in CATEGORICAL_COLUMNS if c in columns]
+    return table.to_pandas(categories=categories)
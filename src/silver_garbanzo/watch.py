@@ -0,0 +1,201 @@
+"""
+watch.py — Foreground watch mode.
+
+This module backs `silver-garbanzo watch`: one long-running process that polls the raw
+directory and ingests CSV exports as they land, instead of one CLI process per file. The
+process keeps everything that does not depend on the file resident between files:
+
+- pandas (and numpy) are imported once, at startup.
+- The compiled Config is reloaded only when a config file's size or mtime changes.
+- The registry index stays loaded (overlap.load_range_index caches it by registry
+  version), and each ingest updates it in place.
+
+So the per-file cost is the CSV work itself.
+
+A file is picked up once its size and mtime are unchanged across two polls and it has not
+been modified for `settle` seconds, so exports still being written or copied are left
+alone. Each file is handled once per content: a rejected file is retried only after it
+changes, and files already recorded in the registry under the same name and range are
+skipped. Polling (rather than inotify) works on every platform and filesystem, including
+network and synced folders. See ADR 0009.
+"""
+
+import os
+import time
+from typing import NamedTuple
+
+from .config import OVERRIDES_FILE, RULES_FILE, SPLITS_FILE, default_config_dir, load_config
+from .contracts import parse_filename_range
+from .ingest import discover_inputs, ingest_batch, store_target
+from .overlap import load_range_index
+
+POLL_INTERVAL = 2.0
+SETTLE_SECONDS = 1.0
+
+
+class FileStamp(NamedTuple):
+    """What a poll observed of a file: a change in either means it is still changing."""
+    size: int
+    mtime_ns: int
+
+
+class DirectoryWatcher:
+    """
+    Polls a directory (recursively) for CSV files that are new or changed and settled.
+    poll() returns ready files; mark_handled() records that they were processed, so they
+    are not returned again until their contents change.
+    """
+
+    def __init__(self, directory: str, settle: float = SETTLE_SECONDS):
+        self.directory = directory
+        self.settle = settle
+        self._seen = {}
+        self._handled = {}
+
+    def poll(self, now: float = None) -> list[str]:
+        """Return unhandled files whose stamp is unchanged since the last poll, in order."""
+        now = time.time() if now is None else now
+        seen = {}
+        ready = []
+        for path in discover_inputs([self.directory]):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stamp = FileStamp(st.st_size, st.st_mtime_ns)
+            seen[path] = stamp
+            if self._handled.get(path) == stamp:
+                continue
+            if self._seen.get(path) == stamp and now - stamp.mtime_ns / 1e9 >= self.settle:
+                ready.append(path)
+        self._seen = seen
+        # Forget handled files that were removed, so a re-added file is picked up again
+        self._handled = {p: s for p, s in self._handled.items() if p in seen}
+        return ready
+
+    def mark_handled(self, paths) -> None:
+        """Record files as processed at the stamp seen by the last poll."""
+        for path in paths:
+            if path in self._seen:
+                self._handled[path] = self._seen[path]
+
+
+class ConfigWatcher:
+    """Keeps the compiled Config resident, reloading it only when a config file changes."""
+
+    def __init__(self, config_dir: str = None, cache_dir: str = None):
+        self.config_dir = config_dir or default_config_dir()
+        self.cache_dir = cache_dir
+        self._stamp = None
+        self._config = None
+
+    def _current_stamp(self):
+        stamps = []
+        for name in (RULES_FILE, OVERRIDES_FILE, SPLITS_FILE):
+            try:
+                st = os.stat(os.path.join(self.config_dir, name))
+                stamps.append((st.st_size, st.st_mtime_ns))
+            except FileNotFoundError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def get(self):
+        """
+        Return (config, reloaded).
+        Raises:
+            ConfigError: If a changed config no longer validates; the previous config is
+                not used, and the next call tries again.
+        """
+        stamp = self._current_stamp()
+        if self._config is not None and stamp == self._stamp:
+            return self._config, False
+        self._config = None
+        self._config = load_config(self.config_dir, cache_dir=self.cache_dir)
+        self._stamp = stamp
+        return self._config, True
+
+
+def already_ingested(csv_path: str, registry_path: str = None) -> bool:
+    """Return True if the registry records this file's exact range under its own name."""
+    try:
+        range_info = parse_filename_range(os.path.basename(csv_path))
+    except ValueError:
+        return False
+    conflict = load_range_index(registry_path).find_overlap(
+        range_info.account, range_info.start_date, range_info.end_date
+    )
+    return conflict == (range_info.start_date, range_info.end_date, range_info.filename)
+
+
+def watch(
+    directory: str,
+    report,
+    registry_path: str = None,
+    interval: float = POLL_INTERVAL,
+    settle: float = SETTLE_SECONDS,
+    journal: bool = False,
+    jobs: int = 1,
+    chunksize: int = None,
+    store_dir: str = None,
+    config_watcher: ConfigWatcher = None,
+    max_polls: int = None,
+) -> None:
+    """
+    Poll `directory` and ingest settled CSV files until interrupted.
+    Args:
+        directory: Directory to watch (recursively) for *.csv files.
+        report: Called as report(event, payload) for "config" (ConfigError or None when
+            reloaded) and "batch" ((BatchResult, paths)) events.
+        registry_path: Registry path (default: state/ingested_ranges.csv).
+        interval: Seconds between polls.
+        settle: Seconds a file must go unmodified before it is ingested.
+        journal, jobs, chunksize: As for ingest_batch.
+        store_dir: If set, transactions are also written to the store here.
+        config_watcher: Config source (default: ConfigWatcher for the default config dir);
+            load it once before calling so a broken config fails before watching starts.
+        max_polls: Stop after this many polls (default: run until interrupted).
+    """
+    import pandas  # noqa: F401  (imported once so the first file does not pay for it)
+
+    from .config import ConfigError
+
+    config_watcher = config_watcher or ConfigWatcher()
+    watcher = DirectoryWatcher(directory, settle)
+    # Files already recorded under their own name are not new
+    watcher.poll()
+    watcher.mark_handled(
+        p for p in discover_inputs([directory]) if already_ingested(p, registry_path)
+    )
+    polls = 0
+    config_error = None
+    while max_polls is None or polls < max_polls:
+        if polls:
+            time.sleep(interval)
+        polls += 1
+        ready = watcher.poll()
+        if not ready:
+            continue
+        try:
+            config, reloaded = config_watcher.get()
+        except ConfigError as e:
+            # Leave the files pending until the config is fixed; report each problem once
+            if e.errors != config_error:
+                report("config", e)
+            config_error = e.errors
+            continue
+        config_error = None
+        if reloaded:
+            report("config", None)
+        store = None
+        if store_dir:
+            store = store_target(config, store_dir, config_watcher.cache_dir)
+        result = ingest_batch(
+            ready,
+            registry_path=registry_path,
+            journal=journal,
+            jobs=jobs,
+            chunksize=chunksize,
+            store=store,
+        )
+        watcher.mark_handled(ready)
+        report("batch", (result, ready))
@@ -0,0 +1,164 @@
+import csv
+import io
+from contextlib import redirect_stdout
+
+import pandas as pd
+import pytest
+
+from silver_garbanzo.cli import run_cli
+from silver_garbanzo.ingest import discover_inputs, ingest_batch, summarize_batch
+
+
+def make_sample_csv(path, dates):
+    df = pd.DataFrame({
+        "Date": dates,
+        "Description": ["desc"] * len(dates),
+        "Amount": ["1.0"] * len(dates),
+        "Transaction_Type": ["DEBIT"] * len(dates)
+    })
+    df.to_csv(path, index=False)
+
+
+def read_registry(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_discover_inputs_expands_globs_and_directories(tmp_path):
+    nested = tmp_path / "raw" / "2026"
+    nested.mkdir(parents=True)
+    for name in ["checking__2026-02.csv", "checking__2026-01.csv", "notes.txt"]:
+        (nested / name).write_text("x")
+    expected = [str(nested / "checking__2026-01.csv"), str(nested / "checking__2026-02.csv")]
+    assert discover_inputs([str(tmp_path / "raw" / "**" / "*.csv")]) == expected
+    assert discover_inputs([str(tmp_path / "raw")]) == expected
+    # Literal paths pass through (even if missing) and duplicates are dropped
+    assert discover_inputs([expected[1], expected[1], "missing.csv"]) == [
+        expected[1],
+        "missing.csv",
+    ]
+
+
+def test_batch_detects_overlap_within_batch(tmp_path):
+    monthly = tmp_path / "checking__2026-01.csv"
+    ranged = tmp_path / "checking__2026-01-15__2026-02-14.csv"
+    other = tmp_path / "savings__2026-01.csv"
+    make_sample_csv(monthly, ["2026-01-01", "2026-01-31"])
+    make_sample_csv(ranged, ["2026-01-15", "2026-02-14"])
+    make_sample_csv(other, ["2026-01-10"])
+    registry_path = tmp_path / "ingested_ranges.csv"
+    with redirect_stdout(io.StringIO()):
+        result = ingest_batch(
+            [str(monthly), str(ranged), str(other)], registry_path=str(registry_path)
+        )
+    assert [r.filename for r in result.accepted] == [
+        "checking__2026-01.csv",
+        "savings__2026-01.csv",
+    ]
+    assert result.rejected[0][0] == str(ranged)
+    assert "overlaps existing range" in result.rejected[0][1]
+    assert [r["source_file"] for r in read_registry(registry_path)] == [
+        "checking__2026-01.csv",
+        "savings__2026-01.csv",
+    ]
+    assert summarize_batch(result) == {"checking": (1, 1), "savings": (1, 0)}
+
+
+def test_batch_dry_run_writes_nothing(tmp_path):
+    csv_path = tmp_path / "checking__2026-01.csv"
+    make_sample_csv(csv_path, ["2026-01-01"])
+    registry_path = tmp_path / "ingested_ranges.csv"
+    with redirect_stdout(io.StringIO()):
+        result = ingest_batch([str(csv_path)], dry_run=True, registry_path=str(registry_path))
+    assert len(result.accepted) == 1
+    assert not registry_path.exists()
+
+
+def test_cli_ingest_command_reports_summary(tmp_path, monkeypatch):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    make_sample_csv(raw / "checking__2026-01.csv", ["2026-01-01"])
+    make_sample_csv(raw / "checking__2026-02.csv", ["2026-03-01"])  # out of range
+    make_sample_csv(raw / "savings__2026-01.csv", ["2026-01-05"])
+    (raw / "badname.csv").write_text("Date,Description,Amount,Transaction_Type\n")
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "rules.json").write_text('[{"category": "test", "pattern": ".*"}]')
+    registry_path = tmp_path / "ingested_ranges.csv"
+    monkeypatch.setenv("SILVER_GARBANZO_CONFIG_DIR", str(config_dir))
+    monkeypatch.setenv("SILVER_GARBANZO_REGISTRY_PATH", str(registry_path))
+    f = io.StringIO()
+    with pytest.raises(SystemExit):
+        with redirect_stdout(f):
+            run_cli(["ingest", str(raw / "*.csv")])
+    output = f.getvalue()
+    assert "Ingested: checking__2026-01.csv (2026-01-01-2026-01-31)" in output
+    assert "[ERROR] checking__2026-02.csv: CSV contains dates outside" in output
+    assert "[SUMMARY] <unknown>: 0 accepted, 1 rejected" in output
+    assert "[SUMMARY] checking: 1 accepted, 1 rejected" in output
+    assert "[SUMMARY] savings: 1 accepted, 0 rejected" in output
+    assert len(read_registry(registry_path)) == 2
+
+
+def test_parallel_validation_matches_serial(tmp_path):
+    paths = []
+    for month in range(1, 7):
+        path = tmp_path / f"checking__2025-{month:02d}.csv"
+        make_sample_csv(path, [f"2025-{month:02d}-01"])
+        paths.append(str(path))
+    bad = tmp_path / "checking__2025-07.csv"
+    make_sample_csv(bad, ["2025-08-01"])
+    paths.append(str(bad))
+    serial_registry = tmp_path / "serial.csv"
+    parallel_registry = tmp_path / "parallel.csv"
+    with redirect_stdout(io.StringIO()):
+        serial = ingest_batch(paths, registry_path=str(serial_registry))
+        parallel = ingest_batch(paths, registry_path=str(parallel_registry), jobs=3)
+    assert parallel.accepted == serial.accepted
+    assert parallel.rejected == serial.rejected
+    assert [r["source_file"] for r in read_registry(parallel_registry)] == [
+        r["source_file"] for r in read_registry(serial_registry)
+    ]
+
+
+def test_chunked_validation_matches_whole_file(tmp_path):
+    from silver_garbanzo.ingest import validate_file
+
+    csv_path = tmp_path / "checking__2026-01.csv"
+    make_sample_csv(
+        csv_path, ["2025-12-31", "2026-01-02", "2026-01-03", "2026-01-04", "2026-02-01"]
+    )
+    with pytest.raises(ValueError) as whole:
+        validate_file(str(csv_path))
+    with pytest.raises(ValueError) as chunked:
+        validate_file(str(csv_path), chunksize=2)
+    assert str(chunked.value) == str(whole.value)
+    assert "[(1, '2025-12-31'), (5, '2026-02-01')]" in str(chunked.value)
+
+
+def test_chunked_validation_reports_file_relative_rows(tmp_path):
+    from silver_garbanzo.ingest import validate_file
+
+    csv_path = tmp_path / "checking__2026-01.csv"
+    make_sample_csv(csv_path, ["2026-01-01", "2026-01-02", "2026-01-03", "bad"])
+    with pytest.raises(ValueError, match="^Row 4: Invalid date format 'bad'"):
+        validate_file(str(csv_path), chunksize=3)
+    bad_header = tmp_path / "savings__2026-01.csv"
+    bad_header.write_text("Date,Description\n2026-01-01,x\n")
+    with pytest.raises(ValueError, match="Missing required header"):
+        validate_file(str(bad_header), chunksize=3)
+
+
+def test_chunked_batch_commits_only_valid_files(tmp_path):
+    good = tmp_path / "checking__2026-01.csv"
+    bad = tmp_path / "savings__2026-01.csv"
+    make_sample_csv(good, [f"2026-01-{d:02d}" for d in range(1, 29)])
+    make_sample_csv(bad, [f"2026-01-{d:02d}" for d in range(1, 29)] + ["2026-02-01"])
+    registry_path = tmp_path / "ingested_ranges.csv"
+    with redirect_stdout(io.StringIO()):
+        result = ingest_batch(
+            [str(good), str(bad)], registry_path=str(registry_path), chunksize=5
+        )
+    assert [r.filename for r in result.accepted] == ["checking__2026-01.csv"]
+    assert "(29, '2026-02-01')" in result.rejected[0][1]
+    assert [r["source_file"] for r in read_registry(registry_path)] == ["checking__2026-01.csv"]
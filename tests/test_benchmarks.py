@@ -0,0 +1,54 @@
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.bench_suite import (  # noqa: E402
+    Scale,
+    compare,
+    load_baseline,
+    run_scale,
+    save_baseline,
+)
+from benchmarks.synthetic import write_exports, write_registry  # noqa: E402
+from silver_garbanzo.contracts import parse_filename_range, read_range_registry  # noqa: E402
+from silver_garbanzo.ingest import ingest_batch  # noqa: E402
+
+
+def test_synthetic_exports_follow_the_contracts(tmp_path):
+    paths = write_exports(str(tmp_path / "raw"), rows=1000, accounts=3, months=4)
+    assert len(paths) == 12
+    for path in paths:
+        parse_filename_range(os.path.basename(path))
+    registry = str(tmp_path / "ranges.csv")
+    write_registry(registry, ranges=50, accounts=3)
+    assert len(read_range_registry(registry)) == 50
+    with redirect_stdout(io.StringIO()):
+        result = ingest_batch(paths, registry_path=registry)
+    assert result.rejected == []
+    assert len(result.accepted) == 12
+
+
+def test_run_scale_reports_every_metric(tmp_path):
+    results = run_scale(
+        Scale(rows=500, accounts=2, months=2, registry_ranges=20, rules=5), str(tmp_path),
+        repeat=1,
+    )
+    assert {
+        "ingest", "overlap_check_cold", "overlap_check_1000", "registry_append",
+        "registry_append_journal", "config_validation",
+    } <= set(results)
+    assert all(seconds >= 0 for seconds in results.values())
+
+
+def test_compare_flags_only_real_regressions(tmp_path):
+    baseline = {"10k": {"ingest": 1.0, "config_validation": 0.001}}
+    results = {"10k": {"ingest": 1.3, "config_validation": 0.004, "new_metric": 5.0}}
+    assert compare(results, baseline, tolerance=0.25) == [("10k", "ingest", 1.0, 1.3)]
+    assert compare(results, baseline, tolerance=0.5) == []
+
+    path = str(tmp_path / "baseline.json")
+    save_baseline(path, baseline)
+    save_baseline(path, {"100k": {"ingest": 9.0}})
+    assert load_baseline(path) == {**baseline, "100k": {"ingest": 9.0}}
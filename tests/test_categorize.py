@@ -0,0 +1,202 @@
+import pandas as pd
+import pytest
+
+from silver_garbanzo.categorize import categorize, compile_rules, match_rules, rule_stats
+from silver_garbanzo.config import load_config
+from silver_garbanzo.schema import CATEGORY, DESCRIPTION, RULE_ID, UNCATEGORIZED
+
+
+def sequential_first_match(descriptions, rules):
+    """Reference implementation: try each rule in order with re.search."""
+    import re
+
+    result = []
+    for value in descriptions:
+        for i, rule in enumerate(rules):
+            if isinstance(value, str) and re.search(rule["pattern"], value):
+                result.append(i)
+                break
+        else:
+            result.append(-1)
+    return result
+
+
+RULES = [
+    {"category": "groceries", "pattern": "GROCERY|MARKET"},
+    {"category": "coffee", "pattern": "COFFEE"},
+    {"category": "income", "pattern": "^PAYROLL"},
+    {"category": "fuel", "pattern": r"SHELL \d+$"},
+]
+
+DESCRIPTIONS = [
+    "COFFEE AT THE MARKET",  # rule 0 wins although COFFEE appears first in the text
+    "BLUE BOTTLE COFFEE",
+    "PAYROLL ACME",
+    "ACME PAYROLL",  # anchored rule must not match mid-string
+    "SHELL 1234",
+    "SHELL 1234 X",
+    "",
+    None,
+]
+
+
+def test_combined_matcher_keeps_first_match_wins():
+    compiled = compile_rules(RULES)
+    assert compiled.matcher is not None
+    assert list(match_rules(DESCRIPTIONS, compiled)) == sequential_first_match(
+        DESCRIPTIONS, RULES
+    )
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [r"(A)\1", "(?i)coffee", "(?P<r0>COFFEE)"],
+)
+def test_unembeddable_patterns_fall_back_to_rule_by_rule(pattern):
+    rules = RULES + [{"category": "odd", "pattern": pattern}]
+    descriptions = DESCRIPTIONS + ["AA", "coffee shop"]
+    compiled = compile_rules(rules)
+    assert compiled.matcher is None
+    assert list(match_rules(descriptions, compiled)) == sequential_first_match(
+        descriptions, rules
+    )
+
+
+def test_categorize_adds_category_and_rule_id():
+    df = pd.DataFrame({DESCRIPTION: ["FARMERS MARKET", "COFFEE", "RENT"]})
+    out, warnings = categorize(df, compile_rules(RULES))
+    assert list(out[CATEGORY]) == ["groceries", "coffee", UNCATEGORIZED]
+    assert list(out[RULE_ID]) == [0, 1, -1]
+    assert warnings == ["1 uncategorized transaction(s)"]
+    assert CATEGORY not in df.columns
+
+
+def test_rule_stats_counts_matches_per_rule():
+    compiled = compile_rules(RULES)
+    rule_ids = match_rules(DESCRIPTIONS, compiled)
+    stats = rule_stats(DESCRIPTIONS, rule_ids, compiled)
+    assert list(stats["matches"]) == [1, 1, 1, 1]
+    assert list(stats["category"]) == ["groceries", "coffee", "income", "fuel"]
+    assert (stats["rows_per_sec"] > 0).all()
+
+
+def test_combined_matcher_agrees_with_sequential_on_random_rules():
+    import random
+
+    rng = random.Random(7)
+    pool = ["AB", "B", "^A", "A$", "C+", "A.C", r"\bBA", "(?:AC|CA)", "X?", "[BC]{2}"]
+    for _ in range(50):
+        rules = [{"category": str(i), "pattern": rng.choice(pool)} for i in range(4)]
+        descriptions = ["".join(rng.choice("ABC ") for _ in range(6)) for _ in range(30)]
+        assert list(match_rules(descriptions, compile_rules(rules))) == (
+            sequential_first_match(descriptions, rules)
+        )
+
+
+def test_override_automaton_finds_first_key_in_file_order():
+    from silver_garbanzo.categorize import OverrideAutomaton
+
+    keys = ["SHE", "HE", "HERS", "HIS", "RS"]
+    automaton = OverrideAutomaton(keys)
+    assert automaton.first_key("USHERS") == 0
+    assert automaton.first_key("THERE") == 1
+    assert automaton.first_key("HIERS") == 4
+    assert automaton.first_key("nothing") == -1
+    assert automaton.first_key("") == -1
+
+
+def test_override_automaton_agrees_with_substring_scan():
+    import random
+
+    from silver_garbanzo.categorize import OverrideAutomaton
+
+    rng = random.Random(3)
+    for _ in range(50):
+        keys = ["".join(rng.choice("ab") for _ in range(rng.randint(1, 4))) for _ in range(6)]
+        automaton = OverrideAutomaton(keys)
+        for _ in range(20):
+            text = "".join(rng.choice("abc") for _ in range(rng.randint(0, 10)))
+            expected = next((i for i, k in enumerate(keys) if k in text), -1)
+            assert automaton.first_key(text) == expected
+
+
+def test_overrides_take_precedence_over_rules():
+    from silver_garbanzo.categorize import compile_overrides
+    from silver_garbanzo.schema import OVERRIDE_ID
+
+    overrides = compile_overrides([
+        {"key": "12345", "category": "groceries"},
+        {"key": "COFFEE", "category": "treats"},
+    ])
+    df = pd.DataFrame({
+        DESCRIPTION: ["BLUE BOTTLE COFFEE", "POS 12345 COFFEE", "FARMERS MARKET", "RENT", None]
+    })
+    out, warnings = categorize(df, compile_rules(RULES), overrides)
+    assert list(out[CATEGORY]) == ["treats", "groceries", "groceries", UNCATEGORIZED,
+                                   UNCATEGORIZED]
+    assert list(out[OVERRIDE_ID]) == [1, 0, -1, -1, -1]
+    assert list(out[RULE_ID]) == [-1, -1, 0, -1, -1]
+    assert warnings == ["2 uncategorized transaction(s)"]
+
+
+def test_categorize_matches_each_distinct_description_once(monkeypatch):
+    import silver_garbanzo.categorize as categorize_module
+
+    seen = []
+    original = categorize_module.match_rules
+
+    def spy(descriptions, rules):
+        seen.extend(descriptions)
+        return original(descriptions, rules)
+
+    monkeypatch.setattr(categorize_module, "match_rules", spy)
+    df = pd.DataFrame({DESCRIPTION: ["COFFEE", "RENT", "COFFEE", None, "RENT", "COFFEE"]})
+    out, _ = categorize(df, compile_rules(RULES))
+    assert sorted(seen) == ["COFFEE", "RENT"]
+    assert list(out[RULE_ID]) == [1, -1, 1, -1, -1, 1]
+
+
+def test_category_cache_skips_matching_when_config_unchanged(tmp_path, monkeypatch):
+    import silver_garbanzo.categorize as categorize_module
+    from silver_garbanzo.categorize import CategoryCache
+
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "rules.json").write_text('[{"category": "coffee", "pattern": "COFFEE"}]')
+    config = load_config(str(config_dir))
+    cache_dir = tmp_path / "cache"
+    df = pd.DataFrame({DESCRIPTION: ["COFFEE", "RENT"]})
+
+    cache = CategoryCache(str(cache_dir), config.digest)
+    first, _ = categorize(df, config.rules, cache=cache)
+    cache.save()
+
+    def fail(*args):
+        raise AssertionError("categorization should come from the cache")
+
+    monkeypatch.setattr(categorize_module, "match_rules", fail)
+    cache = CategoryCache(str(cache_dir), config.digest)
+    second, _ = categorize(df, config.rules, cache=cache)
+    assert list(second[CATEGORY]) == list(first[CATEGORY]) == ["coffee", UNCATEGORIZED]
+
+
+def test_category_cache_invalidated_when_config_changes(tmp_path):
+    from silver_garbanzo.categorize import CategoryCache
+
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "rules.json").write_text('[{"category": "coffee", "pattern": "COFFEE"}]')
+    cache_dir = tmp_path / "cache"
+    old_digest = load_config(str(config_dir)).digest
+    cache = CategoryCache(str(cache_dir), old_digest)
+    categorize(pd.DataFrame({DESCRIPTION: ["COFFEE"]}), compile_rules([]), cache=cache)
+    cache.save()
+
+    (config_dir / "overrides.csv").write_text("key,category\nCOFFEE,treats\n")
+    new_digest = load_config(str(config_dir)).digest
+    assert new_digest != old_digest
+    cache = CategoryCache(str(cache_dir), new_digest)
+    assert len(cache) == 0
+    cache.update(["COFFEE"], [0], [-1])
+    cache.save()
+    assert [p.name for p in cache_dir.iterdir()] == [f"categorize-{new_digest}.json"]
@@ -0,0 +1,143 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from silver_garbanzo import config as config_module
+from silver_garbanzo.config import CACHE_FILE, ConfigError, load_config
+
+
+def _write_config(config_dir, rules='[{"category": "Groceries", "pattern": "MARKET"}]'):
+    config_dir.mkdir(exist_ok=True)
+    (config_dir / "rules.json").write_text(rules)
+    (config_dir / "overrides.csv").write_text("key,category\nACME,Office\n")
+    (config_dir / "splits.csv").write_text(
+        "fingerprint,category,amount\nabc,Groceries,10.5\nabc,Household,4.5\n"
+    )
+
+
+def _age(config_dir, seconds=60):
+    """Backdate config files so their stat stamps are trusted by the cache."""
+    for path in config_dir.iterdir():
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def _count_loads(monkeypatch):
+    calls = []
+    for name, (loader, required) in list(config_module._LOADERS.items()):
+        def counting(path, _loader=loader, _name=name):
+            calls.append(_name)
+            return _loader(path)
+        monkeypatch.setitem(config_module._LOADERS, name, (counting, required))
+    return calls
+
+
+def test_load_config_compiles_all_files(tmp_path):
+    _write_config(tmp_path / "config")
+    config = load_config(str(tmp_path / "config"))
+    assert config.rules.categories == ["Groceries"]
+    assert config.overrides.keys == ["ACME"]
+    assert config.splits == {"abc": [("Groceries", 10.5), ("Household", 4.5)]}
+    assert len(config.digest) == 64
+
+
+def test_load_config_reports_all_errors(tmp_path):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "overrides.csv").write_text("bad,header\n")
+    with pytest.raises(ConfigError) as excinfo:
+        load_config(str(config_dir))
+    assert excinfo.value.errors[0] == "Missing required config: rules.json"
+    assert excinfo.value.errors[1].startswith("overrides.csv:")
+
+
+def test_load_config_lists_each_bad_row(tmp_path):
+    config_dir = tmp_path / "config"
+    _write_config(config_dir)
+    (config_dir / "splits.csv").write_text(
+        "fingerprint,category,amount\nabc,Groceries,x\nabc,Groceries,y\n"
+    )
+    with pytest.raises(ConfigError) as excinfo:
+        load_config(str(config_dir))
+    assert excinfo.value.errors == [
+        "splits.csv: row 2 amount not a float: x",
+        "splits.csv: row 3 amount not a float: y",
+        "splits.csv: rows 2, 3: duplicate split of fingerprint 'abc' into 'Groceries'",
+    ]
+
+
+def test_cache_skips_revalidation_of_unchanged_files(tmp_path, monkeypatch):
+    config_dir = tmp_path / "config"
+    cache_dir = tmp_path / "cache"
+    _write_config(config_dir)
+    _age(config_dir)
+    first = load_config(str(config_dir), str(cache_dir))
+    assert (cache_dir / CACHE_FILE).exists()
+    calls = _count_loads(monkeypatch)
+    second = load_config(str(config_dir), str(cache_dir))
+    assert calls == []
+    assert second.digest == first.digest
+    assert second.splits == first.splits
+    # Touching a file without changing it costs a re-hash, not a re-validation
+    os.utime(config_dir / "rules.json")
+    load_config(str(config_dir), str(cache_dir))
+    assert calls == []
+
+
+def test_cache_revalidates_changed_file(tmp_path, monkeypatch):
+    config_dir = tmp_path / "config"
+    cache_dir = tmp_path / "cache"
+    _write_config(config_dir)
+    _age(config_dir)
+    first = load_config(str(config_dir), str(cache_dir))
+    calls = _count_loads(monkeypatch)
+    (config_dir / "rules.json").write_text('[{"category": "Fuel", "pattern": "SHELL"}]')
+    second = load_config(str(config_dir), str(cache_dir))
+    assert calls == ["rules.json"]
+    assert second.rules.categories == ["Fuel"]
+    assert second.digest != first.digest
+
+
+def test_cache_never_serves_invalid_config(tmp_path):
+    config_dir = tmp_path / "config"
+    cache_dir = tmp_path / "cache"
+    _write_config(config_dir)
+    load_config(str(config_dir), str(cache_dir))
+    (config_dir / "rules.json").write_text('[{"category": "Fuel", "pattern": "["}]')
+    with pytest.raises(ConfigError):
+        load_config(str(config_dir), str(cache_dir))
+
+
+def test_stricter_validation_rechecks_cached_files(tmp_path, monkeypatch):
+    config_dir = tmp_path / "config"
+    cache_dir = tmp_path / "cache"
+    _write_config(config_dir)
+    (config_dir / "overrides.csv").write_text("key,category\nACME,Office\nACME,Travel\n")
+    _age(config_dir)
+    # Cache the file as an older, laxer validator accepted it
+    monkeypatch.setattr(config_module, "VALIDATION_VERSION", 1)
+    monkeypatch.setitem(
+        config_module._LOADERS, "overrides.csv", (lambda path: None, False)
+    )
+    load_config(str(config_dir), str(cache_dir))
+    monkeypatch.undo()
+    with pytest.raises(ConfigError, match="duplicate key 'ACME'"):
+        load_config(str(config_dir), str(cache_dir))
+
+
+def test_write_cache_false_leaves_no_cache(tmp_path):
+    _write_config(tmp_path / "config")
+    load_config(str(tmp_path / "config"), str(tmp_path / "cache"), write_cache=False)
+    assert not (tmp_path / "cache").exists()
+
+
+def test_corrupt_cache_is_ignored(tmp_path):
+    config_dir = tmp_path / "config"
+    cache_dir = tmp_path / "cache"
+    _write_config(config_dir)
+    cache_dir.mkdir()
+    (cache_dir / CACHE_FILE).write_bytes(b"not a pickle")
+    config = load_config(str(config_dir), str(cache_dir))
+    assert config.rules.categories == ["Groceries"]
@@ -5,6 +5,8 @@ import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 from silver_garbanzo.config_validation import (
+    MAX_REPORTED_ROWS,
+    RowErrors,
     validate_overrides_csv,
     validate_rules_json,
     validate_splits_csv,
@@ -55,3 +57,70 @@ def test_invalid_splits_csv_amount(tmp_path):
     path.write_text("fingerprint,category,amount\nabc,groceries,notafloat\n")
     with pytest.raises(RuntimeError):
         validate_splits_csv(str(path))
+
+def test_splits_csv_reports_every_bad_row(tmp_path):
+    path = tmp_path / "splits.csv"
+    path.write_text(
+        "fingerprint,category,amount\n"
+        "abc,groceries,42.5\n"
+        "def,groceries,lots\n"
+        "ghi,groceries\n"
+        "jkl,groceries,1.0,extra,more\n"
+        "mno,groceries,nan\n"
+    )
+    with pytest.raises(RowErrors) as excinfo:
+        validate_splits_csv(str(path))
+    assert excinfo.value.errors == [
+        "splits.csv: row 4 missing required fields",
+        "splits.csv: row 3 amount not a float: lots",
+        "splits.csv: row 6 amount not a float: nan",
+        "splits.csv: row 5 has extra field(s): extra,more",
+    ]
+
+def test_splits_csv_duplicate_fingerprint_category(tmp_path):
+    path = tmp_path / "splits.csv"
+    path.write_text(
+        "fingerprint,category,amount\n"
+        "abc,groceries,10\n"
+        "abc,household,5\n"
+        "def,groceries,1\n"
+        "abc,groceries,3\n"
+    )
+    with pytest.raises(RowErrors) as excinfo:
+        validate_splits_csv(str(path))
+    assert excinfo.value.errors == [
+        "splits.csv: rows 2, 5: duplicate split of fingerprint 'abc' into 'groceries'"
+    ]
+
+def test_splits_csv_returns_typed_rows(tmp_path):
+    path = tmp_path / "splits.csv"
+    path.write_text("fingerprint,category,amount\nabc,groceries,42.5\n\nabc,household, 7 \n")
+    assert validate_splits_csv(str(path)) == [
+        ("abc", "groceries", 42.5),
+        ("abc", "household", 7.0),
+    ]
+    path.write_text("fingerprint,category,amount\n")
+    assert validate_splits_csv(str(path)) == []
+
+def test_bad_rows_are_capped_per_problem(tmp_path):
+    path = tmp_path / "splits.csv"
+    bad = MAX_REPORTED_ROWS + 10
+    path.write_text(
+        "fingerprint,category,amount\n" + "".join(f"f{i},c,x{i}\n" for i in range(bad))
+    )
+    with pytest.raises(RowErrors) as excinfo:
+        validate_splits_csv(str(path))
+    errors = excinfo.value.errors
+    assert len(errors) == MAX_REPORTED_ROWS + 1
+    assert errors[-1] == "splits.csv: ... and 10 more rows like: amount not a float: x0"
+
+def test_overrides_csv_reports_missing_and_duplicate_keys(tmp_path):
+    path = tmp_path / "overrides.csv"
+    path.write_text("key,category\nACME,office\n,groceries\nSHOP,\nACME,travel\n")
+    with pytest.raises(RowErrors) as excinfo:
+        validate_overrides_csv(str(path))
+    assert excinfo.value.errors == [
+        "overrides.csv: row 3 missing 'key' or 'category'",
+        "overrides.csv: row 4 missing 'key' or 'category'",
+        "overrides.csv: rows 2, 5: duplicate key 'ACME'",
+    ]
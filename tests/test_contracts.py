@@ -3,12 +3,17 @@ import csv
 import os
 from datetime import datetime
 
+import pandas as pd
 import pytest
 
 from silver_garbanzo.contracts import (
+    JOURNAL_SUFFIX,
     FilenameRange,
     append_range_registry,
+    compact_range_registry,
     parse_filename_range,
+    read_range_registry,
+    validate_csv_date_range,
 )
 
 
@@ -24,6 +29,38 @@ def make_rows(dates):
     ]
 
 
+class TestValidateCsvDateRange:
+    """Test vectorized date-range validation against the filename range."""
+
+    start = datetime(2026, 1, 1)
+    end = datetime(2026, 1, 31)
+
+    def test_dataframe_in_range(self):
+        df = pd.DataFrame(make_rows(["2026-01-01", "2026-01-15", "2026-01-31"]))
+        dates = validate_csv_date_range(df, self.start, self.end)
+        assert list(dates) == [datetime(2026, 1, 1), datetime(2026, 1, 15), datetime(2026, 1, 31)]
+
+    def test_row_dicts_still_accepted(self):
+        validate_csv_date_range(make_rows(["2026-01-02"]), self.start, self.end)
+
+    def test_out_of_range_reports_all_rows(self):
+        df = pd.DataFrame(make_rows(["2025-12-31", "2026-01-10", "2026-02-01"]))
+        with pytest.raises(ValueError) as exc:
+            validate_csv_date_range(df, self.start, self.end)
+        assert str(exc.value) == (
+            "CSV contains dates outside filename-declared range: "
+            "[(1, '2025-12-31'), (3, '2026-02-01')]"
+        )
+
+    def test_invalid_date_reports_first_row(self):
+        df = pd.DataFrame(make_rows(["2026-01-01", "2026/01/02", "nope"]))
+        with pytest.raises(ValueError, match=r"^Row 2: Invalid date format '2026/01/02' \("):
+            validate_csv_date_range(df, self.start, self.end)
+
+    def test_non_padded_date_accepted(self):
+        df = pd.DataFrame(make_rows(["2026-1-5"]))
+        dates = validate_csv_date_range(df, self.start, self.end)
+        assert dates.iloc[0] == datetime(2026, 1, 5)
 
 
 class TestParseFilenameRangeMonthly:
@@ -284,3 +321,98 @@ class TestRangeOverlap:
         append_range_registry(account1, start1, end1, "checking__2026-01.csv", str(registry_path))
         # Should not raise (different account)
         check_range_overlap(account2, start2, end2, str(registry_path))
+
+
+class TestRegistryJournal:
+    """Test append-only journal mode for the range registry."""
+
+    def _append(self, registry_path, month, journal=True):
+        append_range_registry(
+            "checking",
+            datetime(2025, month, 1),
+            datetime(2025, month, 28),
+            f"checking__2025-{month:02d}.csv",
+            str(registry_path),
+            journal=journal,
+        )
+
+    def test_journal_append_leaves_csv_untouched(self, tmp_path):
+        registry_path = tmp_path / "ingested_ranges.csv"
+        self._append(registry_path, 1, journal=False)
+        before = registry_path.read_bytes()
+        self._append(registry_path, 2)
+        assert registry_path.read_bytes() == before
+        rows = read_range_registry(str(registry_path))
+        assert [r["source_file"] for r in rows] == [
+            "checking__2025-01.csv",
+            "checking__2025-02.csv",
+        ]
+
+    def test_torn_tail_is_ignored_and_truncated(self, tmp_path):
+        registry_path = tmp_path / "ingested_ranges.csv"
+        journal_path = tmp_path / ("ingested_ranges.csv" + JOURNAL_SUFFIX)
+        self._append(registry_path, 1)
+        with open(journal_path, "ab") as f:
+            f.write(b"2,checking,2025-02-01,2025-02-2")  # crash mid-write
+        assert len(read_range_registry(str(registry_path))) == 1
+        self._append(registry_path, 3)
+        rows = read_range_registry(str(registry_path))
+        assert [r["source_file"] for r in rows] == [
+            "checking__2025-01.csv",
+            "checking__2025-03.csv",
+        ]
+
+    def test_corrupt_record_fails_checksum(self, tmp_path):
+        registry_path = tmp_path / "ingested_ranges.csv"
+        journal_path = tmp_path / ("ingested_ranges.csv" + JOURNAL_SUFFIX)
+        self._append(registry_path, 1)
+        journal_path.write_bytes(journal_path.read_bytes().replace(b"2025-01-28", b"2025-01-29"))
+        assert read_range_registry(str(registry_path)) == []
+
+    def test_compaction_folds_journal_into_csv(self, tmp_path, monkeypatch):
+        import silver_garbanzo.contracts as contracts
+
+        monkeypatch.setattr(contracts, "JOURNAL_COMPACT_THRESHOLD", 3)
+        registry_path = tmp_path / "ingested_ranges.csv"
+        journal_path = tmp_path / ("ingested_ranges.csv" + JOURNAL_SUFFIX)
+        for month in (1, 2):
+            self._append(registry_path, month)
+        assert journal_path.exists()
+        self._append(registry_path, 3)
+        assert not journal_path.exists()
+        with open(registry_path, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["account", "start_date", "end_date", "source_file", "ingested_at"]
+        assert [r[3] for r in rows[1:]] == [f"checking__2025-0{m}.csv" for m in (1, 2, 3)]
+
+    def test_crash_after_compaction_replace_does_not_duplicate(self, tmp_path):
+        registry_path = tmp_path / "ingested_ranges.csv"
+        journal_path = tmp_path / ("ingested_ranges.csv" + JOURNAL_SUFFIX)
+        self._append(registry_path, 1)
+        self._append(registry_path, 2)
+        journal = journal_path.read_bytes()
+        compact_range_registry(str(registry_path))
+        # Simulate a crash before the journal was removed
+        journal_path.write_bytes(journal)
+        assert len(read_range_registry(str(registry_path))) == 2
+
+    def test_crash_during_rewrite_append_does_not_duplicate(self, tmp_path, monkeypatch):
+        import silver_garbanzo.contracts as contracts
+
+        registry_path = tmp_path / "ingested_ranges.csv"
+        for month in (1, 2, 3):
+            self._append(registry_path, month)
+
+        def crash(path):
+            raise OSError("simulated crash before the journal unlink")
+
+        monkeypatch.setattr(contracts.os, "remove", crash)
+        with pytest.raises(OSError, match="simulated crash"):
+            self._append(registry_path, 4, journal=False)
+        monkeypatch.undo()
+        expected = [f"checking__2025-0{m}.csv" for m in (1, 2, 3)]
+        assert [r["source_file"] for r in read_range_registry(str(registry_path))] == expected
+        # Recovery: the retried append records the range once, and nothing twice
+        self._append(registry_path, 4, journal=False)
+        rows = read_range_registry(str(registry_path))
+        assert [r["source_file"] for r in rows] == expected + ["checking__2025-04.csv"]
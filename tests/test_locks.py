@@ -0,0 +1,197 @@
+import io
+import multiprocessing
+import os
+import threading
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import silver_garbanzo.ingest as ingest_module
+from silver_garbanzo.contracts import (
+    FilenameRange,
+    RegistryConflict,
+    append_range_registry,
+    append_ranges_registry,
+    read_range_registry,
+    registry_version,
+)
+from silver_garbanzo.ingest import commit_batch, ingest, ingest_batch, validate_batch
+from silver_garbanzo.locks import (
+    LOCK_STRIPES,
+    account_locks,
+    account_stripe,
+    file_lock,
+    registry_write_lock,
+)
+from silver_garbanzo.overlap import load_range_index
+
+
+def make_csv(path, dates):
+    pd.DataFrame({
+        "Date": dates,
+        "Description": ["COFFEE"] * len(dates),
+        "Amount": ["1.00"] * len(dates),
+        "Transaction_Type": ["DEBIT"] * len(dates),
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def accounts_on_distinct_stripes():
+    first = "checking"
+    second = next(
+        f"savings{i}" for i in range(100) if account_stripe(f"savings{i}") != account_stripe(first)
+    )
+    return first, second
+
+
+def acquired_within(lock, seconds=0.3):
+    """
+    Try `lock` in another thread; return whether it was acquired within `seconds`.
+    A thread still waiting finishes on its own once the lock is released.
+    """
+    acquired = threading.Event()
+
+    def hold():
+        with lock:
+            acquired.set()
+
+    thread = threading.Thread(target=hold, daemon=True)
+    thread.start()
+    if acquired.wait(seconds):
+        thread.join()
+        return True
+    return False
+
+
+def test_account_stripes_are_stable_and_bounded():
+    assert account_stripe("checking") == account_stripe("checking")
+    assert all(0 <= account_stripe(f"acct{i}") < LOCK_STRIPES for i in range(500))
+    assert len({account_stripe(f"acct{i}") for i in range(500)}) > LOCK_STRIPES // 2
+
+
+def test_file_lock_excludes_other_holders(tmp_path):
+    path = str(tmp_path / "locks" / "x.lock")
+    with file_lock(path):
+        assert not acquired_within(file_lock(path))
+    assert acquired_within(file_lock(path))
+
+
+def test_account_locks_only_block_the_same_stripe(tmp_path):
+    registry = str(tmp_path / "ranges.csv")
+    first, second = accounts_on_distinct_stripes()
+    with account_locks(registry, [first]):
+        assert acquired_within(account_locks(registry, [second]))
+        assert not acquired_within(account_locks(registry, [second, first]))
+        # The write lock is separate from every stripe
+        assert acquired_within(registry_write_lock(registry))
+
+
+def test_append_detects_a_stale_version(tmp_path):
+    registry = str(tmp_path / "ranges.csv")
+    entry = FilenameRange("checking", datetime(2026, 1, 1), datetime(2026, 1, 31), "a.csv")
+    version = registry_version(registry)
+    after = append_ranges_registry([entry], registry, expected_version=version)
+    assert after == registry_version(registry) != version
+    later = entry._replace(start_date=datetime(2026, 2, 1), end_date=datetime(2026, 2, 28))
+    with pytest.raises(RegistryConflict):
+        append_ranges_registry([later], registry, expected_version=version)
+    assert [r["source_file"] for r in read_range_registry(registry)] == ["a.csv"]
+
+
+def test_commit_rechecks_ranges_committed_after_validation(tmp_path):
+    registry = str(tmp_path / "state" / "ranges.csv")
+    path = make_csv(tmp_path / "checking__2026-01.csv", ["2026-01-02"])
+    load_range_index(registry)  # warm, as in a long-running process
+    validated = validate_batch([path])
+    # Another process records the same month between validation and commit
+    append_range_registry(
+        "checking", datetime(2026, 1, 1), datetime(2026, 1, 31), "other.csv", registry
+    )
+    with redirect_stdout(io.StringIO()):
+        result = commit_batch([path], validated, registry_path=registry)
+    assert result.accepted == []
+    assert "other.csv" in result.rejected[0][1]
+    assert len(read_range_registry(registry)) == 1
+
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_commit_retries_after_another_accounts_commit(tmp_path, journal):
+    registry = str(tmp_path / "state" / "ranges.csv")
+    path = make_csv(tmp_path / "checking__2026-01.csv", ["2026-01-02"])
+    load_range_index(registry)
+    validated = validate_batch([path])
+    append_range_registry(
+        "savings",
+        datetime(2026, 1, 1),
+        datetime(2026, 1, 31),
+        "savings.csv",
+        registry,
+        journal=journal,
+    )
+    with redirect_stdout(io.StringIO()):
+        result = commit_batch([path], validated, registry_path=registry, journal=journal)
+    assert [r.filename for r in result.accepted] == ["checking__2026-01.csv"]
+    assert sorted(r["source_file"] for r in read_range_registry(registry)) == [
+        "checking__2026-01.csv",
+        "savings.csv",
+    ]
+    # The warm index reflects both commits
+    assert load_range_index(registry).accounts() == ["checking", "savings"]
+
+
+def test_single_file_ingest_keeps_the_warm_index_complete(tmp_path, monkeypatch):
+    registry = str(tmp_path / "state" / "ranges.csv")
+    path = make_csv(tmp_path / "checking__2026-01.csv", ["2026-01-02"])
+    load_range_index(registry)
+    calls = []
+
+    def racing_append(*args, **kwargs):
+        if not calls:
+            # Another process records its range just before this write
+            append_range_registry(
+                "savings", datetime(2026, 1, 1), datetime(2026, 1, 31), "savings.csv", registry
+            )
+        calls.append(kwargs.get("expected_version"))
+        return append_ranges_registry(*args, **kwargs)
+
+    monkeypatch.setattr(ingest_module, "append_ranges_registry", racing_append)
+    with redirect_stdout(io.StringIO()):
+        assert ingest(path, registry_path=registry)
+    assert len(calls) == 2 and None not in calls
+    assert load_range_index(registry).accounts() == ["checking", "savings"]
+
+
+def _ingest_worker(args):
+    paths, registry, journal = args
+    with redirect_stdout(io.StringIO()):
+        result = ingest_batch(paths, registry_path=registry, journal=journal)
+    return len(result.accepted)
+
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_parallel_processes_lose_no_ranges_and_record_no_overlaps(tmp_path, journal):
+    registry = str(tmp_path / "state" / "ranges.csv")
+    jobs = []
+    for i in range(6):
+        sub = tmp_path / f"job{i}"
+        sub.mkdir()
+        jobs.append((
+            [
+                # Every job contends for the same shared month ...
+                make_csv(sub / "shared__2026-01.csv", ["2026-01-02"]),
+                # ... and owns two accounts nobody else writes
+                make_csv(sub / f"own{i}a__2026-01.csv", ["2026-01-02"]),
+                make_csv(sub / f"own{i}b__2026-02.csv", ["2026-02-02"]),
+            ],
+            registry,
+            journal,
+        ))
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    with multiprocessing.get_context(method).Pool(len(jobs)) as pool:
+        accepted = pool.map(_ingest_worker, jobs)
+    rows = read_range_registry(registry)
+    assert sum(accepted) == len(rows) == 6 * 2 + 1
+    assert [r["account"] for r in rows].count("shared") == 1
+    assert os.path.isdir(registry + ".locks")
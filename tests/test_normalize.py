@@ -0,0 +1,193 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from silver_garbanzo.normalize import (
+    add_fingerprints,
+    clean_descriptions,
+    fingerprints,
+    normalize,
+    parse_amounts,
+    transaction_signs,
+)
+from silver_garbanzo.schema import (
+    ACCOUNT,
+    AMOUNT,
+    DATE,
+    DESCRIPTION,
+    FINGERPRINT,
+    TRANSACTION_TYPE,
+)
+
+
+def _raw(**columns):
+    n = len(next(iter(columns.values())))
+    data = {
+        "Date": ["2024-01-01"] * n,
+        "Description": ["X"] * n,
+        "Amount": ["1.00"] * n,
+        "Transaction_Type": ["DEBIT"] * n,
+    }
+    data.update(columns)
+    return pd.DataFrame(data)
+
+
+class TestParseAmounts:
+    def test_strips_currency_and_thousands_separators(self):
+        amounts = parse_amounts(pd.Series(["$1,234.50", "€ 12", "-3.25", " 7 "]))
+        assert amounts.tolist() == [1234.5, 12.0, -3.25, 7.0]
+
+    def test_parenthesized_amounts_are_negative(self):
+        amounts = parse_amounts(pd.Series(["(12.00)", "$(1,000.10)", " (5) "]))
+        assert amounts.tolist() == [-12.0, -1000.1, -5.0]
+
+    def test_numeric_column_is_used_as_is(self):
+        assert parse_amounts(pd.Series([1.5, -2.0])).tolist() == [1.5, -2.0]
+
+    def test_repeated_values_parse_consistently(self):
+        values = pd.Series(["$1.00", "(2.00)", "$1.00", "(2.00)"])
+        assert parse_amounts(values).tolist() == [1.0, -2.0, 1.0, -2.0]
+
+    def test_all_unparseable_amounts_are_reported(self):
+        with pytest.raises(ValueError) as excinfo:
+            parse_amounts(pd.Series(["1.00", "abc", "2.00", None]))
+        message = str(excinfo.value)
+        assert "(2, 'abc')" in message
+        assert "(4, None)" in message
+
+    @pytest.mark.parametrize("value", ["12 34", "1e5", "12,50", "1,2345", "inf", "1.2.3", "--5"])
+    def test_malformed_numbers_are_rejected_not_repaired(self, value):
+        with pytest.raises(ValueError) as excinfo:
+            parse_amounts(pd.Series(["1.00", value]))
+        assert f"(2, {value!r})" in str(excinfo.value)
+
+    def test_embedded_newline_does_not_shift_values(self):
+        assert parse_amounts(pd.Series(["$1,000\n", "(3)", "4"])).tolist() == [1000, -3, 4]
+        with pytest.raises(ValueError, match="unparseable"):
+            parse_amounts(pd.Series(["1\n000", "4"]))
+
+
+class TestTransactionSigns:
+    def test_known_types_are_case_and_whitespace_insensitive(self):
+        signs, unknown = transaction_signs(
+            pd.Series(["debit", " DR ", "Withdrawal", "credit", "CR", "deposit"])
+        )
+        assert signs.tolist() == [-1, -1, -1, 1, 1, 1]
+        assert unknown.empty
+
+    def test_unknown_types_are_counted(self):
+        signs, unknown = transaction_signs(pd.Series(["FEE", "DEBIT", "FEE", None, "XFER"]))
+        assert np.isnan(signs[[0, 2, 3, 4]]).all()
+        assert unknown["FEE"] == 2
+        assert unknown["XFER"] == 1
+        assert unknown[unknown.index.isna()].tolist() == [1]
+
+
+def test_clean_descriptions():
+    cleaned = clean_descriptions(pd.Series(["  COFFEE   SHOP ", "COFFEE\tSHOP", None]))
+    assert cleaned[0] == cleaned[1] == "COFFEE SHOP"
+    assert cleaned[2] is None
+
+
+class TestNormalize:
+    def test_builds_canonical_schema(self):
+        raw = _raw(
+            Description=["  Grocery  Mart ", "Payroll"],
+            Amount=["$45.10", "1,000.00"],
+            Transaction_Type=["DEBIT", "CREDIT"],
+        )
+        out, warnings = normalize(raw, account="checking")
+        assert list(out.columns) == [DATE, DESCRIPTION, AMOUNT, TRANSACTION_TYPE, ACCOUNT]
+        assert out[DATE].dtype == "datetime64[ns]"
+        assert out[DESCRIPTION].tolist() == ["Grocery Mart", "Payroll"]
+        assert out[AMOUNT].tolist() == [-45.10, 1000.0]
+        assert isinstance(out[TRANSACTION_TYPE].dtype, pd.CategoricalDtype)
+        assert out[TRANSACTION_TYPE].tolist() == ["DEBIT", "CREDIT"]
+        assert (out[ACCOUNT] == "checking").all()
+        assert warnings == []
+
+    def test_type_sets_sign_of_magnitude(self):
+        raw = _raw(Amount=["-5", "(5)", "-5", "5"], Transaction_Type=["CR", "CR", "DR", "DR"])
+        out, _ = normalize(raw)
+        assert out[AMOUNT].tolist() == [5.0, 5.0, -5.0, -5.0]
+
+    def test_unknown_types_keep_numeric_sign_and_warn_once_per_type(self):
+        raw = _raw(Amount=["-5", "7", "(2)"], Transaction_Type=["FEE", "FEE", "ADJ"])
+        out, warnings = normalize(raw)
+        assert out[AMOUNT].tolist() == [-5.0, 7.0, -2.0]
+        assert warnings == [
+            "2 transaction(s) with unknown Transaction_Type 'FEE': numeric sign kept",
+            "1 transaction(s) with unknown Transaction_Type 'ADJ': numeric sign kept",
+        ]
+
+    def test_invalid_date_fails(self):
+        with pytest.raises(ValueError, match="Row 2: Invalid date format 'bad'"):
+            normalize(_raw(Date=["2024-01-01", "bad"]))
+
+    def test_pre_parsed_dates_are_reused(self):
+        raw = _raw(Date=["not parsed again"])
+        out, _ = normalize(raw, dates=pd.Series(pd.to_datetime(["2024-03-01"])))
+        assert out[DATE].tolist() == [pd.Timestamp("2024-03-01")]
+
+    def test_input_is_not_modified(self):
+        raw = _raw(Description=["  a  "])
+        before = raw.copy()
+        normalize(raw)
+        pd.testing.assert_frame_equal(raw, before)
+
+
+def _canonical():
+    return pd.DataFrame({
+        DATE: pd.to_datetime(["2024-01-05", "2024-01-05", "2024-02-29", "2023-12-31"]),
+        DESCRIPTION: ["COFFEE SHOP", "COFFEE SHOP", "Café Münster", "PAYROLL"],
+        AMOUNT: [-4.5, -4.5, -1234.56, 2500.0],
+        ACCOUNT: ["checking", "savings", "checking", "checking"],
+    })
+
+
+class TestFingerprints:
+    def test_golden_values(self):
+        # These values are a compatibility contract with existing splits.csv files
+        # (see docs/decisions/0007-transaction-fingerprint.md); never update them.
+        assert fingerprints(_canonical()).tolist() == [
+            "e8ac2365c5b2ce3a",
+            "ace5975a1dea6d50",
+            "c06ed9d806213628",
+            "ef51979cc292c154",
+        ]
+
+    def test_golden_values_without_account(self):
+        assert fingerprints(_canonical().drop(columns=ACCOUNT)).tolist() == [
+            "b4e37d928cfbaccc",
+            "b4e37d928cfbaccc",
+            "8ca63404cd6a14ba",
+            "bb88f1c989db9fe6",
+        ]
+
+    def test_independent_of_row_order_and_batch(self):
+        df = _canonical()
+        whole = fingerprints(df)
+        reversed_rows = fingerprints(df.iloc[::-1])[::-1]
+        one_by_one = [fingerprints(df.iloc[[i]])[0] for i in range(len(df))]
+        assert whole.tolist() == reversed_rows.tolist() == one_by_one
+
+    def test_amount_is_hashed_as_cents(self):
+        df = _canonical()
+        df[AMOUNT] = df[AMOUNT] + 1e-9
+        assert fingerprints(df).tolist() == fingerprints(_canonical()).tolist()
+
+    def test_missing_account_hashes_as_empty(self):
+        df = _canonical()
+        df[ACCOUNT] = [None, "", None, ""]
+        assert fingerprints(df).tolist() == fingerprints(df.drop(columns=ACCOUNT)).tolist()
+
+    def test_add_fingerprints_warns_on_shared_fingerprints(self):
+        out, warnings = add_fingerprints(_canonical().drop(columns=ACCOUNT))
+        assert out[FINGERPRINT].str.len().eq(16).all()
+        assert warnings == ["2 transaction(s) share a fingerprint with another"]
+        _, warnings = add_fingerprints(_canonical())
+        assert warnings == []
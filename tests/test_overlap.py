@@ -4,7 +4,8 @@ from datetime import datetime
 
 import pytest
 
-from silver_garbanzo.overlap import check_range_overlap
+from silver_garbanzo.contracts import append_range_registry
+from silver_garbanzo.overlap import RangeIndex, check_range_overlap, load_range_index
 
 
 def write_registry(rows, path):
@@ -112,3 +113,41 @@ def test_different_account(tmp_path):
         check_range_overlap('checking', datetime(2026,2,1), datetime(2026,2,28), str(registry))
         # Touching before (end_date == reg_start - 1)
         check_range_overlap('checking', datetime(2025,12,1), datetime(2025,12,31), str(registry))
+
+
+def test_index_reports_conflicting_file(tmp_path):
+    registry = tmp_path / 'ingested_ranges.csv'
+    rows = [
+        ['checking', '2026-03-01', '2026-03-31', 'march.csv', '2026-04-01T00:00:00Z'],
+        ['checking', '2026-01-01', '2026-01-31', 'january.csv', '2026-02-01T00:00:00Z'],
+        ['savings', '2026-02-01', '2026-02-28', 'feb.csv', '2026-03-01T00:00:00Z'],
+    ]
+    write_registry(rows, registry)
+    # February is free for checking even though savings covers it
+    check_range_overlap('checking', datetime(2026, 2, 1), datetime(2026, 2, 28), str(registry))
+    with pytest.raises(ValueError, match="from file 'january.csv'"):
+        check_range_overlap('checking', datetime(2026, 1, 31), datetime(2026, 2, 5), str(registry))
+    with pytest.raises(ValueError, match="from file 'march.csv'"):
+        check_range_overlap('checking', datetime(2026, 2, 1), datetime(2026, 3, 1), str(registry))
+
+
+def test_index_spanning_range_detected():
+    index = RangeIndex()
+    # A long legacy range followed by a short one: the running max end must still catch it
+    index.add('checking', datetime(2025, 1, 1), datetime(2025, 12, 31), 'year.csv')
+    index.add('checking', datetime(2025, 3, 1), datetime(2025, 3, 31), 'march.csv')
+    assert index.find_overlap('checking', datetime(2025, 6, 1), datetime(2025, 6, 30))[2] == (
+        'year.csv'
+    )
+    assert index.find_overlap('checking', datetime(2026, 1, 1), datetime(2026, 1, 31)) is None
+
+
+def test_index_reloads_when_registry_changes(tmp_path):
+    registry = tmp_path / 'ingested_ranges.csv'
+    write_registry([], registry)
+    assert load_range_index(str(registry)) is load_range_index(str(registry))
+    append_range_registry(
+        'checking', datetime(2026, 1, 1), datetime(2026, 1, 31), 'jan.csv', str(registry)
+    )
+    with pytest.raises(ValueError):
+        check_range_overlap('checking', datetime(2026, 1, 1), datetime(2026, 1, 31), str(registry))
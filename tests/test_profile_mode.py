@@ -33,3 +33,59 @@ def test_profile_mode_outputs(tmp_path):
     assert "[PROFILE] Profiling ingest performance and memory usage..." in result.stdout
     assert re.search(r"\[PROFILE\] Time elapsed: [0-9.]+ seconds", result.stdout)
     assert re.search(r"\[PROFILE\] Peak memory usage: [0-9.]+ KiB", result.stdout)
+
+
+def test_profile_json_and_cprofile_dump(tmp_path, monkeypatch):
+    import io
+    import json
+    import pstats
+    from contextlib import redirect_stdout
+
+    from silver_garbanzo.cli import run_cli
+
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "rules.json").write_text('[{"category": "test", "pattern": ".*"}]')
+    monkeypatch.setenv("SILVER_GARBANZO_CONFIG_DIR", str(config_dir))
+    monkeypatch.setenv("SILVER_GARBANZO_REGISTRY_PATH", str(tmp_path / "ranges.csv"))
+    csv_path = tmp_path / "checking__2026-01.csv"
+    make_sample_csv(csv_path, ["2026-01-01", "2026-01-15", "2026-01-31"])
+    json_path = tmp_path / "profile.json"
+    cprofile_path = tmp_path / "profile.prof"
+    out = io.StringIO()
+    with redirect_stdout(out):
+        run_cli([
+            str(csv_path), "--chunksize", "2",
+            "--profile-json", str(json_path), "--profile-cprofile", str(cprofile_path),
+        ])
+    assert re.search(r"\[PROFILE\] Time elapsed: [0-9.]+ seconds", out.getvalue())
+    assert re.search(r"\[PROFILE\]   csv_read .* 3 rows", out.getvalue())
+    report = json.loads(json_path.read_text())
+    stages = {s["name"]: s for s in report["stages"]}
+    assert [s["name"] for s in report["stages"]] == [
+        "filename_parse", "csv_read", "header_check", "date_validation",
+        "registry_load", "overlap_check", "registry_write",
+    ]
+    assert stages["csv_read"]["calls"] == 3  # two chunks and the end-of-file read
+    assert stages["date_validation"]["rows"] == 3
+    assert stages["date_validation"]["rows_per_sec"] > 0
+    assert report["total_seconds"] >= sum(s["seconds"] for s in report["stages"])
+    assert pstats.Stats(str(cprofile_path)).total_calls > 0
+
+
+def test_stages_are_no_ops_without_active_profiler():
+    from silver_garbanzo.profiling import Profiler, active, stage
+
+    with stage("csv_read") as s:
+        s.rows = 10
+    profiler = Profiler()
+    with profiler.activate():
+        assert active() is profiler
+        with stage("csv_read") as s:
+            s.rows = 10
+        with stage("csv_read", rows=5):
+            pass
+    assert active() is None
+    profiler.merge({"csv_read": {"calls": 1, "seconds": 0.0, "rows": 1, "rss_delta_bytes": 0}})
+    stats = profiler.stages["csv_read"]
+    assert (stats["calls"], stats["rows"]) == (3, 16)
@@ -0,0 +1,163 @@
+import io
+import json
+import random
+from contextlib import redirect_stdout
+
+import pandas as pd
+import pytest
+
+from silver_garbanzo.categorize import categorize, compile_overrides, compile_rules
+from silver_garbanzo.cli import run_cli
+from silver_garbanzo.config import Config, load_config
+from silver_garbanzo.recategorize import common_prefix, recategorize_ids
+from silver_garbanzo.schema import CATEGORY, DESCRIPTION, OVERRIDE_ID, RULE_ID
+
+WORDS = ["COFFEE", "MARKET", "SHELL", "PAYROLL", "ACME", "RENT", "GYM", "BOOKS"]
+
+
+def make_config(rules, overrides=()):
+    return Config(
+        rules=compile_rules(rules),
+        overrides=compile_overrides(list(overrides)) if overrides else None,
+        splits={},
+        file_digests={},
+        digest="",
+    )
+
+
+def snapshot(rules, overrides=()):
+    return {"rules": list(rules), "overrides": list(overrides)}
+
+
+def full(descriptions, config):
+    out, _ = categorize(pd.DataFrame({DESCRIPTION: descriptions}), config.rules, config.overrides)
+    return out[OVERRIDE_ID].tolist(), out[RULE_ID].tolist(), out[CATEGORY].tolist()
+
+
+def test_common_prefix():
+    assert common_prefix([1, 2, 3], [1, 2, 4]) == 2
+    assert common_prefix([1, 2], [1, 2, 3]) == 2
+    assert common_prefix([], [1]) == 0
+
+
+def random_rules(rng, n):
+    return [{"category": f"c{rng.randrange(5)}", "pattern": rng.choice(WORDS)} for _ in range(n)]
+
+
+def random_overrides(rng, n):
+    return [{"key": rng.choice(WORDS)[:3], "category": f"o{rng.randrange(3)}"} for _ in range(n)]
+
+
+def edit(rng, entries, make):
+    entries = list(entries)
+    action = rng.choice(["append", "insert", "delete", "replace", "recategorize"])
+    if action == "append" or not entries:
+        entries.append(make(rng, 1)[0])
+    elif action == "insert":
+        entries.insert(rng.randrange(len(entries)), make(rng, 1)[0])
+    elif action == "delete":
+        del entries[rng.randrange(len(entries))]
+    elif action == "replace":
+        entries[rng.randrange(len(entries))] = make(rng, 1)[0]
+    else:
+        i = rng.randrange(len(entries))
+        entries[i] = dict(entries[i], category="edited")
+    return entries
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_incremental_matches_full_recategorization(seed):
+    rng = random.Random(seed)
+    descriptions = [
+        " ".join(rng.sample(WORDS, rng.randrange(1, 3))) for _ in range(200)
+    ] + [None]
+    old_rules = random_rules(rng, rng.randrange(0, 6))
+    old_overrides = random_overrides(rng, rng.randrange(0, 3))
+    new_rules, new_overrides = old_rules, old_overrides
+    while (new_rules, new_overrides) == (old_rules, old_overrides):
+        if rng.random() < 0.7:
+            new_rules = edit(rng, new_rules, random_rules)
+        else:
+            new_overrides = edit(rng, new_overrides, random_overrides)
+    old_override_ids, old_rule_ids, _ = full(descriptions, make_config(old_rules, old_overrides))
+    new_config = make_config(new_rules, new_overrides)
+    override_ids, rule_ids, _ = recategorize_ids(
+        descriptions,
+        old_override_ids,
+        old_rule_ids,
+        snapshot(old_rules, old_overrides),
+        new_config,
+    )
+    expected_override_ids, expected_rule_ids, _ = full(descriptions, new_config)
+    assert override_ids.tolist() == expected_override_ids
+    assert rule_ids.tolist() == expected_rule_ids
+
+
+def test_appended_rule_only_rematches_unmatched_rows():
+    rules = [{"category": "coffee", "pattern": "COFFEE"}]
+    descriptions = ["COFFEE"] * 5 + ["GYM"] * 3
+    override_ids, rule_ids, _ = full(descriptions, make_config(rules))
+    new_rules = rules + [{"category": "fitness", "pattern": "GYM"}]
+    _, new_rule_ids, rematched = recategorize_ids(
+        descriptions, override_ids, rule_ids, snapshot(rules), make_config(new_rules)
+    )
+    assert new_rule_ids.tolist() == [0] * 5 + [1] * 3
+    assert rematched == 3
+
+
+def test_missing_snapshot_recomputes_everything():
+    rules = [{"category": "coffee", "pattern": "COFFEE"}]
+    override_ids, rule_ids, rematched = recategorize_ids(
+        ["COFFEE", "GYM"], [-1, 0], [5, -1], None, make_config(rules)
+    )
+    assert override_ids.tolist() == [-1, -1]
+    assert rule_ids.tolist() == [0, -1]
+    assert rematched == 2
+
+
+def test_cli_recategorize_updates_store(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    from silver_garbanzo.store import read_store
+
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    rules = [{"category": "Coffee", "pattern": "COFFEE"}]
+    (config_dir / "rules.json").write_text(json.dumps(rules))
+    monkeypatch.setenv("SILVER_GARBANZO_CONFIG_DIR", str(config_dir))
+    monkeypatch.setenv("SILVER_GARBANZO_REGISTRY_PATH", str(tmp_path / "state" / "ranges.csv"))
+    csv_path = tmp_path / "checking__2026-01.csv"
+    pd.DataFrame({
+        "Date": ["2026-01-02", "2026-01-03", "2026-01-04"],
+        "Description": ["COFFEE", "GYM", "COFFEE"],
+        "Amount": ["4.50", "30", "3.00"],
+        "Transaction_Type": ["DEBIT"] * 3,
+    }).to_csv(csv_path, index=False)
+    store_dir = str(tmp_path / "state" / "store")
+    with redirect_stdout(io.StringIO()):
+        run_cli([str(csv_path), "--store"])
+    assert read_store(store_dir)[CATEGORY].tolist() == ["Coffee", "Uncategorized", "Coffee"]
+
+    rules.append({"category": "Fitness", "pattern": "GYM"})
+    (config_dir / "rules.json").write_text(json.dumps(rules))
+    out = io.StringIO()
+    with redirect_stdout(out):
+        run_cli(["recategorize", "--dry-run"])
+    assert "Would recategorize: 1 of 3 rows changed category" in out.getvalue()
+    assert read_store(store_dir)[CATEGORY].tolist() == ["Coffee", "Uncategorized", "Coffee"]
+
+    out = io.StringIO()
+    with redirect_stdout(out):
+        run_cli(["recategorize"])
+    assert "Recategorized: 1 of 3 rows changed category (1 of 1 files out of date)" in (
+        out.getvalue()
+    )
+    stored = read_store(store_dir)
+    assert stored[CATEGORY].tolist() == ["Coffee", "Fitness", "Coffee"]
+    assert stored[RULE_ID].tolist() == [0, 1, 0]
+
+    # Up-to-date files are skipped
+    out = io.StringIO()
+    with redirect_stdout(out):
+        run_cli(["recategorize"])
+    assert "(0 of 1 files out of date)" in out.getvalue()
+    assert load_config(str(config_dir)).digest
@@ -0,0 +1,135 @@
+import io
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import pytest
+
+from silver_garbanzo.cli import run_cli
+from silver_garbanzo.contracts import append_range_registry
+from silver_garbanzo.overlap import RangeIndex
+from silver_garbanzo.registry import (
+    Gap,
+    coverage,
+    coverage_gaps,
+    covered_intervals,
+    last_ingested_dates,
+    who_covers,
+)
+
+
+def d(day):
+    return datetime.fromisoformat(day)
+
+
+def make_index(ranges):
+    index = RangeIndex()
+    for account, start, end, source in ranges:
+        index.add(account, d(start), d(end), source)
+    return index
+
+
+@pytest.fixture
+def index():
+    return make_index([
+        ("checking", "2026-01-01", "2026-01-31", "checking__2026-01.csv"),
+        ("checking", "2026-02-01", "2026-02-28", "checking__2026-02.csv"),
+        ("checking", "2026-04-01", "2026-04-30", "checking__2026-04.csv"),
+        ("savings", "2026-01-01", "2026-03-31", "savings__2026-Q1.csv"),
+    ])
+
+
+def test_touching_ranges_merge_into_one_interval(index):
+    assert covered_intervals(index, "checking") == [
+        (d("2026-01-01"), d("2026-02-28")),
+        (d("2026-04-01"), d("2026-04-30")),
+    ]
+    assert covered_intervals(index, "unknown") == []
+
+
+def test_overlapping_ranges_merge(index):
+    # A hand-edited registry may hold overlaps; they must not double count
+    index = make_index([
+        ("checking", "2026-01-01", "2026-01-31", "a.csv"),
+        ("checking", "2026-01-10", "2026-01-20", "b.csv"),
+        ("checking", "2026-01-15", "2026-02-10", "c.csv"),
+    ])
+    assert covered_intervals(index, "checking") == [(d("2026-01-01"), d("2026-02-10"))]
+    assert coverage(index)[0].covered_days == 41
+
+
+def test_gaps_default_to_the_covered_span(index):
+    assert coverage_gaps(index) == [
+        Gap("checking", d("2026-03-01"), d("2026-03-31"), 31),
+    ]
+
+
+def test_gaps_over_an_explicit_period(index):
+    gaps = coverage_gaps(
+        index, accounts=["checking", "brokerage"], start_date=d("2026-01-15"),
+        end_date=d("2026-05-10"),
+    )
+    assert gaps == [
+        Gap("checking", d("2026-03-01"), d("2026-03-31"), 31),
+        Gap("checking", d("2026-05-01"), d("2026-05-10"), 10),
+        # An account with no ranges is uncovered for the whole period
+        Gap("brokerage", d("2026-01-15"), d("2026-05-10"), 116),
+    ]
+    assert coverage_gaps(index, start_date=d("2026-04-05"), end_date=d("2026-04-06")) == [
+        Gap("savings", d("2026-04-05"), d("2026-04-06"), 2),
+    ]
+
+
+def test_coverage_statistics(index):
+    by_account = {c.account: c for c in coverage(index)}
+    checking = by_account["checking"]
+    assert checking.ranges == 3
+    assert (checking.first_date, checking.last_date) == (d("2026-01-01"), d("2026-04-30"))
+    assert (checking.covered_days, checking.gap_days) == (89, 31)
+    clipped = coverage(
+        index, accounts=["savings"], start_date=d("2026-03-01"), end_date=d("2026-04-30")
+    )[0]
+    assert (clipped.covered_days, clipped.gap_days) == (31, 30)
+    assert last_ingested_dates(index) == {
+        "checking": d("2026-04-30"),
+        "savings": d("2026-03-31"),
+    }
+
+
+def test_who_covers(index):
+    found = who_covers([d("2026-03-15"), d("2026-02-28")], index)
+    assert [(c.date, c.account, c.source_file) for c in found] == [
+        (d("2026-02-28"), "checking", "checking__2026-02.csv"),
+        (d("2026-02-28"), "savings", "savings__2026-Q1.csv"),
+        (d("2026-03-15"), "savings", "savings__2026-Q1.csv"),
+    ]
+    assert who_covers([d("2026-03-15")], index, accounts=["checking"]) == []
+
+
+def run(args):
+    out = io.StringIO()
+    with redirect_stdout(out):
+        run_cli(["registry", *args])
+    return out.getvalue()
+
+
+def test_cli_registry_queries(tmp_path, monkeypatch):
+    registry = str(tmp_path / "ranges.csv")
+    monkeypatch.setenv("SILVER_GARBANZO_REGISTRY_PATH", registry)
+    for start, end in (("2026-01-01", "2026-01-31"), ("2026-03-01", "2026-03-31")):
+        append_range_registry(
+            "checking", d(start), d(end), f"checking__{start[:7]}.csv", registry
+        )
+    assert "checking: 2026-02-01 to 2026-02-28 (28 days)" in run(["gaps"])
+    assert "No coverage gaps" in run(["gaps", "--from", "2026-03-01", "--to", "2026-03-31"])
+    table = run(["coverage", "--account", "checking"]).splitlines()
+    assert table[0].split() == [
+        "account", "ranges", "first", "last", "covered_days", "gap_days"
+    ]
+    assert table[1].split() == ["checking", "2", "2026-01-01", "2026-03-31", "62", "28"]
+    out = run(["who-covers", "2026-03-05", "2026-02-05"])
+    assert out.splitlines() == [
+        "2026-02-05: not covered",
+        "2026-03-05: checking checking__2026-03.csv (2026-03-01-2026-03-31)",
+    ]
+    with redirect_stdout(io.StringIO()), pytest.raises(SystemExit):
+        run_cli(["registry", "gaps", "--from", "March"])
@@ -0,0 +1,173 @@
+import io
+import json
+from contextlib import redirect_stdout
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from silver_garbanzo.cli import run_cli
+from silver_garbanzo.report import (
+    COUNT,
+    INCOME,
+    NET,
+    PERIOD,
+    SPEND,
+    daily_totals,
+    period_reports,
+    period_totals,
+    rollup,
+    uncategorized,
+)
+from silver_garbanzo.schema import ACCOUNT, AMOUNT, CATEGORY, DATE, DESCRIPTION, UNCATEGORIZED
+
+
+def _transactions():
+    return pd.DataFrame({
+        DATE: pd.to_datetime([
+            "2025-12-30", "2026-01-02", "2026-01-02", "2026-01-20", "2026-02-03", "2026-04-01",
+        ]),
+        DESCRIPTION: ["RENT", "COFFEE", "PAYROLL", "GYM", "COFFEE", "REFUND"],
+        AMOUNT: [-800.0, -4.5, 2000.0, -30.0, -3.5, 12.0],
+        CATEGORY: pd.Categorical(
+            ["Housing", "Coffee", "Income", UNCATEGORIZED, "Coffee", UNCATEGORIZED]
+        ),
+        ACCOUNT: ["checking", "checking", "checking", "card", "card", "card"],
+    })
+
+
+def test_monthly_totals():
+    totals = period_totals(_transactions(), "monthly")
+    assert totals[PERIOD].astype(str).tolist() == ["2025-12", "2026-01", "2026-02", "2026-04"]
+    assert totals[SPEND].tolist() == [800.0, 34.5, 3.5, 0.0]
+    assert totals[INCOME].tolist() == [0.0, 2000.0, 0.0, 12.0]
+    assert totals[NET].tolist() == [-800.0, 1965.5, -3.5, 12.0]
+    assert totals[COUNT].tolist() == [1, 3, 1, 1]
+
+
+def test_totals_by_period_and_category_are_categorical():
+    totals = period_totals(_transactions(), "quarterly", by=(CATEGORY,))
+    assert isinstance(totals[CATEGORY].dtype, pd.CategoricalDtype)
+    q1 = totals[totals[PERIOD].astype(str) == "2026Q1"].set_index(CATEGORY)
+    assert q1.loc["Coffee", SPEND] == 8.0
+    assert q1.loc["Coffee", COUNT] == 2
+    assert q1.loc["Income", NET] == 2000.0
+    assert "Housing" not in q1.index
+
+
+def test_object_keys_and_missing_values_are_grouped():
+    df = _transactions()
+    df[CATEGORY] = df[CATEGORY].astype(object)
+    df.loc[0, CATEGORY] = None
+    totals = period_totals(df, "yearly", by=(CATEGORY, ACCOUNT))
+    assert isinstance(totals[ACCOUNT].dtype, pd.CategoricalDtype)
+    assert totals[CATEGORY].isna().sum() == 1
+    assert totals[COUNT].sum() == len(df)
+
+
+def test_all_frequencies_match_independent_groupby():
+    rng = np.random.default_rng(1)
+    n = 5000
+    df = pd.DataFrame({
+        DATE: pd.Timestamp("2016-01-01") + pd.to_timedelta(rng.integers(0, 3650, n), "D"),
+        AMOUNT: rng.normal(-10, 50, n).round(2),
+        CATEGORY: pd.Categorical.from_codes(rng.integers(0, 6, n), list("abcdef")),
+    })
+    reports = period_reports(df, by=(CATEGORY,))
+    for freq, code in [("weekly", "W"), ("monthly", "M"), ("quarterly", "Q"), ("yearly", "Y")]:
+        expected = df.groupby(
+            [df[DATE].dt.to_period(code), CATEGORY], observed=True
+        )[AMOUNT].agg(["sum", "size"])
+        got = reports[freq].set_index([PERIOD, CATEGORY])
+        np.testing.assert_allclose(got[NET].to_numpy(), expected["sum"].to_numpy())
+        assert got[COUNT].tolist() == expected["size"].tolist()
+
+
+def test_rollup_from_coarser_totals():
+    daily = daily_totals(_transactions(), by=(CATEGORY,))
+    monthly = rollup(daily, "monthly", by=(CATEGORY,))
+    monthly[DATE] = monthly[PERIOD].dt.start_time
+    yearly = rollup(monthly, "yearly", by=())
+    assert yearly[NET].tolist() == [-800.0, 1974.0]
+
+
+def test_empty_and_unknown_frequency():
+    empty = _transactions().iloc[:0]
+    assert period_totals(empty, "monthly", by=(CATEGORY,)).empty
+    with pytest.raises(ValueError, match="Unknown report frequency 'daily'"):
+        period_totals(_transactions(), "daily")
+
+
+def test_uncategorized_listing():
+    listing = uncategorized(_transactions())
+    assert listing[DESCRIPTION].tolist() == ["GYM", "REFUND"]
+    assert CATEGORY not in listing.columns
+
+
+def test_cli_report_applies_splits(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    from silver_garbanzo.store import read_store
+
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "rules.json").write_text(
+        json.dumps([{"category": "Groceries", "pattern": "MARKET"}])
+    )
+    monkeypatch.setenv("SILVER_GARBANZO_CONFIG_DIR", str(config_dir))
+    monkeypatch.setenv("SILVER_GARBANZO_REGISTRY_PATH", str(tmp_path / "state" / "ranges.csv"))
+    csv_path = tmp_path / "checking__2026-01.csv"
+    pd.DataFrame({
+        "Date": ["2026-01-02", "2026-01-03"],
+        "Description": ["MARKET", "GYM"],
+        "Amount": ["45.00", "30.00"],
+        "Transaction_Type": ["DEBIT", "DEBIT"],
+    }).to_csv(csv_path, index=False)
+    with redirect_stdout(io.StringIO()):
+        run_cli([str(csv_path), "--store"])
+    fingerprint = read_store(str(tmp_path / "state" / "store"))["fingerprint"][0]
+    (config_dir / "splits.csv").write_text(
+        f"fingerprint,category,amount\n{fingerprint},Groceries,30\n{fingerprint},Household,15\n"
+    )
+    out = io.StringIO()
+    with redirect_stdout(out):
+        run_cli(["report", "--by-category", "--uncategorized"])
+    lines = out.getvalue().splitlines()
+    assert lines[0].split() == ["period", "category", "spend", "income", "net", "count"]
+    assert lines[1].split() == ["2026-01", "Groceries", "30.00", "0.00", "-30.00", "1"]
+    assert lines[2].split() == ["2026-01", "Household", "15.00", "0.00", "-15.00", "1"]
+    assert lines[3].split() == ["2026-01", "Uncategorized", "30.00", "0.00", "-30.00", "1"]
+    assert "Uncategorized transactions: 1" in out.getvalue()
+
+
+def test_cli_report_rule_stats_uses_current_rules(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "rules.json").write_text(
+        json.dumps([{"category": "Groceries", "pattern": "MARKET"}])
+    )
+    monkeypatch.setenv("SILVER_GARBANZO_CONFIG_DIR", str(config_dir))
+    monkeypatch.setenv("SILVER_GARBANZO_REGISTRY_PATH", str(tmp_path / "state" / "ranges.csv"))
+    csv_path = tmp_path / "checking__2026-01.csv"
+    pd.DataFrame({
+        "Date": ["2026-01-02", "2026-01-03", "2026-01-04"],
+        "Description": ["MARKET", "GYM", "MARKET"],
+        "Amount": ["45.00", "30.00", "5.00"],
+        "Transaction_Type": ["DEBIT", "DEBIT", "DEBIT"],
+    }).to_csv(csv_path, index=False)
+    with redirect_stdout(io.StringIO()):
+        run_cli([str(csv_path), "--store"])
+    (config_dir / "rules.json").write_text(json.dumps([
+        {"category": "Groceries", "pattern": "MARKET"},
+        {"category": "Fitness", "pattern": "GYM"},
+    ]))
+    out = io.StringIO()
+    with redirect_stdout(out):
+        run_cli(["report", "--rule-stats"])
+    lines = out.getvalue().splitlines()
+    start = lines.index("Rule matches over 3 stored transactions:")
+    assert lines[start + 1].split() == [
+        "rule", "category", "pattern", "matches", "share", "rows_per_sec"
+    ]
+    assert lines[start + 2].split()[:5] == ["0", "Groceries", "MARKET", "2", "66.7%"]
+    assert lines[start + 3].split()[:5] == ["1", "Fitness", "GYM", "1", "33.3%"]
@@ -0,0 +1,173 @@
+import io
+import json
+import os
+from contextlib import redirect_stdout
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from silver_garbanzo import rollups as rollups_module  # noqa: E402
+from silver_garbanzo.cli import run_cli  # noqa: E402
+from silver_garbanzo.config import load_config  # noqa: E402
+from silver_garbanzo.report import period_totals, rollup  # noqa: E402
+from silver_garbanzo.rollups import (  # noqa: E402
+    ROLLUP_FILE,
+    month_totals,
+    refresh_rollups,
+    rollup_frame,
+)
+from silver_garbanzo.schema import CATEGORY  # noqa: E402
+from silver_garbanzo.store import read_store  # noqa: E402
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "rules.json").write_text(
+        json.dumps([{"category": "Groceries", "pattern": "MARKET"}])
+    )
+    monkeypatch.setenv("SILVER_GARBANZO_CONFIG_DIR", str(config_dir))
+    monkeypatch.setenv("SILVER_GARBANZO_REGISTRY_PATH", str(tmp_path / "state" / "ranges.csv"))
+    return tmp_path
+
+
+def ingest(tmp_path, name, rows):
+    path = tmp_path / name
+    pd.DataFrame(rows, columns=["Date", "Description", "Amount", "Transaction_Type"]).to_csv(
+        path, index=False
+    )
+    with redirect_stdout(io.StringIO()):
+        run_cli([str(path), "--store"])
+
+
+def store_dir(tmp_path):
+    return str(tmp_path / "state" / "store")
+
+
+def record_computed(monkeypatch):
+    computed = []
+    compute = rollups_module._compute
+
+    def spy(store_dir, config, keys):
+        computed.append(sorted(keys))
+        return compute(store_dir, config, keys)
+
+    monkeypatch.setattr(rollups_module, "_compute", spy)
+    return computed
+
+
+def plain(frame):
+    """Compare frames by value: categoricals as objects, default index."""
+    return frame.astype(
+        {c: object for c in frame.columns if frame[c].dtype == "category"}
+    ).reset_index(drop=True)
+
+
+def assert_matches_store(tmp_path, config):
+    rollups, _ = refresh_rollups(store_dir(tmp_path), config, write=False)
+    expected = month_totals(read_store(store_dir(tmp_path)))
+    pd.testing.assert_frame_equal(plain(rollups), plain(expected))
+
+
+def test_ingest_refreshes_only_touched_months(env, monkeypatch):
+    ingest(env, "checking__2026-01-01__2026-02-28.csv", [
+        ("2026-01-05", "MARKET", "10.00", "DEBIT"),
+        ("2026-02-05", "MARKET", "20.00", "DEBIT"),
+    ])
+    assert os.path.exists(os.path.join(store_dir(env), ROLLUP_FILE))
+    computed = record_computed(monkeypatch)
+    ingest(env, "savings__2026-02.csv", [("2026-02-10", "INTEREST", "1.25", "CREDIT")])
+    assert computed == [["savings/2026-02"]]
+    config = load_config()
+    assert_matches_store(env, config)
+    computed.clear()
+    refresh_rollups(store_dir(env), config)
+    assert computed == []
+
+
+def test_config_change_recomputes_every_month(env, monkeypatch):
+    ingest(env, "checking__2026-01-01__2026-02-28.csv", [
+        ("2026-01-05", "MARKET", "10.00", "DEBIT"),
+        ("2026-02-05", "CAFE", "20.00", "DEBIT"),
+    ])
+    computed = record_computed(monkeypatch)
+    (env / "config" / "rules.json").write_text(
+        json.dumps([{"category": "Food", "pattern": "MARKET|CAFE"}])
+    )
+    with redirect_stdout(io.StringIO()):
+        run_cli(["recategorize"])
+    assert computed == [["checking/2026-01", "checking/2026-02"]]
+    rollups, _ = refresh_rollups(store_dir(env), load_config())
+    assert rollups[CATEGORY].tolist() == ["Food", "Food"]
+
+
+def test_splits_change_invalidates_rollups(env):
+    ingest(env, "checking__2026-01.csv", [("2026-01-05", "MARKET", "45.00", "DEBIT")])
+    fingerprint = read_store(store_dir(env))["fingerprint"][0]
+    (env / "config" / "splits.csv").write_text(
+        f"fingerprint,category,amount\n{fingerprint},Groceries,30\n{fingerprint},Household,20\n"
+    )
+    rollups, warnings = refresh_rollups(store_dir(env), load_config())
+    assert rollups[CATEGORY].tolist() == ["Groceries", "Household"]
+    assert rollups["spend"].tolist() == [30.0, 20.0]
+    assert warnings == [f"Split total 50.00 does not match amount -45.00 for fingerprint "
+                        f"{fingerprint}"]
+
+
+def test_report_warns_about_mismatches_found_during_ingest(env):
+    ingest(env, "checking__2026-01.csv", [("2026-01-05", "MARKET", "45.00", "DEBIT")])
+    fingerprint = read_store(store_dir(env))["fingerprint"][0]
+    (env / "config" / "splits.csv").write_text(
+        f"fingerprint,category,amount\n{fingerprint},Groceries,30\n{fingerprint},Household,20\n"
+    )
+    # The next ingest recomputes every month and refreshes the rollups itself ...
+    ingest(env, "card__2026-01.csv", [("2026-01-09", "MARKET", "15", "DEBIT")])
+    warning = (
+        f"[WARNING] Split total 50.00 does not match amount -45.00 for fingerprint {fingerprint}"
+    )
+
+    def report(*args):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            run_cli(["report", *args])
+        return out.getvalue()
+
+    # ... so the report finds every month fresh, and still warns, once
+    assert report().count(warning) == 1
+    assert report("--uncategorized").count(warning) == 1
+    assert warning not in report("--account", "card")
+
+
+def test_deleted_or_corrupt_rollups_are_rebuilt(env):
+    ingest(env, "checking__2026-01.csv", [("2026-01-05", "MARKET", "45.00", "DEBIT")])
+    path = os.path.join(store_dir(env), ROLLUP_FILE)
+    with open(path, "wb") as f:
+        f.write(b"not arrow")
+    assert_matches_store(env, load_config())
+    os.remove(path)
+    refresh_rollups(store_dir(env), load_config())
+    assert os.path.exists(path)
+
+
+def test_rollup_reports_match_transaction_scan(env):
+    ingest(env, "checking__2025-12-01__2026-04-30.csv", [
+        ("2025-12-30", "RENT", "800", "DEBIT"),
+        ("2026-01-02", "MARKET", "4.50", "DEBIT"),
+        ("2026-01-02", "PAYROLL", "2000", "CREDIT"),
+        ("2026-03-20", "MARKET", "30", "DEBIT"),
+        ("2026-04-01", "REFUND", "12", "CREDIT"),
+    ])
+    ingest(env, "card__2026-01.csv", [("2026-01-09", "MARKET", "15", "DEBIT")])
+    rollups, _ = refresh_rollups(store_dir(env), load_config())
+    transactions = read_store(store_dir(env))
+    for freq in ("monthly", "quarterly", "yearly"):
+        for by in ((), (CATEGORY,)):
+            pd.testing.assert_frame_equal(
+                plain(rollup(rollup_frame(rollups), freq, by)),
+                plain(period_totals(transactions, freq, by)),
+            )
+    card = rollup(rollup_frame(rollups, accounts=["card"]), "monthly", ())
+    assert card["spend"].tolist() == [15.0]
@@ -0,0 +1,209 @@
+import io
+import json
+import os
+import stat
+import threading
+from contextlib import redirect_stdout
+
+import pandas as pd
+import pytest
+
+from silver_garbanzo.cli import run_cli
+from silver_garbanzo.contracts import read_range_registry
+from silver_garbanzo.ingest import ingest_batch
+from silver_garbanzo.server import IngestServer, batch_response, batch_result, request, submit
+from silver_garbanzo.watch import ConfigWatcher
+
+
+def make_csv(path, dates):
+    pd.DataFrame({
+        "Date": dates,
+        "Description": ["COFFEE"] * len(dates),
+        "Amount": ["1.00"] * len(dates),
+        "Transaction_Type": ["DEBIT"] * len(dates),
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def make_config(tmp_path):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "rules.json").write_text(json.dumps([{"category": "Coffee", "pattern": "COF"}]))
+    return config_dir
+
+
+def make_server(tmp_path, **kwargs):
+    registry = str(tmp_path / "state" / "ranges.csv")
+    server = IngestServer(
+        str(tmp_path / "ingest.sock"),
+        registry_path=registry,
+        config_watcher=ConfigWatcher(str(make_config(tmp_path))),
+        **kwargs,
+    )
+    return server, registry
+
+
+@pytest.fixture
+def running(tmp_path):
+    """A bound server serving in a background thread."""
+    server, registry = make_server(tmp_path)
+    server.bind()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, registry
+    server.shutdown()
+    thread.join()
+    server.close()
+
+
+def test_handle_ingests_and_reports_structured_results(tmp_path):
+    server, registry = make_server(tmp_path)
+    good = make_csv(tmp_path / "checking__2026-01.csv", ["2026-01-02"])
+    bad = make_csv(tmp_path / "checking__2026-02.csv", ["2026-03-02"])
+    try:
+        with redirect_stdout(io.StringIO()):
+            response = server.handle({"op": "ingest", "paths": [good, bad]})
+    finally:
+        server.close()
+    assert response["ok"]
+    assert response["accepted"] == [{
+        "path": good,
+        "account": "checking",
+        "start_date": "2026-01-01",
+        "end_date": "2026-01-31",
+        "filename": "checking__2026-01.csv",
+    }]
+    assert [r["path"] for r in response["rejected"]] == [bad]
+    assert [r["source_file"] for r in read_range_registry(registry)] == ["checking__2026-01.csv"]
+
+
+def test_handle_rejects_malformed_requests(tmp_path):
+    server, _ = make_server(tmp_path)
+    try:
+        assert server.handle({"op": "ping"}) == {"ok": True}
+        assert "Unknown request op" in server.handle({"op": "delete"})["error"]
+        assert "list of file paths" in server.handle({"op": "ingest", "paths": "x.csv"})["error"]
+        response = server.handle({"op": "ingest", "paths": ["checking__2026-01.csv"]})
+        assert not response["ok"] and "must be absolute" in response["error"]
+    finally:
+        server.close()
+
+
+def test_invalid_config_fails_requests_until_fixed(tmp_path):
+    events = []
+    server, registry = make_server(tmp_path, report=lambda event, payload: events.append(event))
+    path = make_csv(tmp_path / "checking__2026-01.csv", ["2026-01-02"])
+    rules = tmp_path / "config" / "rules.json"
+    try:
+        server.config_watcher.get()
+        rules.write_text("{not json")
+        response = server.handle({"op": "ingest", "paths": [path]})
+        assert not response["ok"] and response["errors"]
+        assert not os.path.exists(registry)
+        rules.write_text(json.dumps([{"category": "Coffee", "pattern": "COFFEE"}]))
+        with redirect_stdout(io.StringIO()):
+            assert server.handle({"op": "ingest", "paths": [path]})["accepted"]
+    finally:
+        server.close()
+    assert events == ["config", "config", "batch"]
+
+
+def test_response_round_trips_to_batch_result(tmp_path):
+    path = make_csv(tmp_path / "checking__2026-01.csv", ["2026-01-02"])
+    with redirect_stdout(io.StringIO()):
+        result = ingest_batch(
+            [path, str(tmp_path / "bad.csv")], registry_path=str(tmp_path / "r.csv")
+        )
+    response = json.loads(json.dumps(batch_response([path, str(tmp_path / "bad.csv")], result)))
+    round_trip = batch_result(response)
+    assert [r.filename for r in round_trip.accepted] == ["checking__2026-01.csv"]
+    assert round_trip.accepted[0].end_date.date() == result.accepted[0].end_date.date()
+    assert round_trip.rejected == result.rejected
+
+
+def test_socket_is_private_and_exclusive(running):
+    server, _ = running
+    assert stat.S_IMODE(os.stat(server.socket_path).st_mode) == 0o600
+    assert request({"op": "ping"}, server.socket_path) == {"ok": True}
+    second = IngestServer(server.socket_path, config_watcher=server.config_watcher)
+    with pytest.raises(RuntimeError, match="already listening"):
+        second.bind()
+    second.close()
+
+
+def test_stale_socket_is_replaced(tmp_path):
+    server, _ = make_server(tmp_path)
+    with open(server.socket_path, "w"):
+        pass
+    server.bind()
+    server.close()
+    assert not os.path.exists(server.socket_path)
+
+
+def test_concurrent_submitters_never_record_overlaps(running, tmp_path):
+    server, registry = running
+    # Every submitter sends an overlapping file for each month; one per month may win
+    paths = []
+    for i in range(8):
+        sub = tmp_path / f"job{i}"
+        sub.mkdir()
+        paths.append([
+            make_csv(sub / f"checking__2026-0{m}.csv", [f"2026-0{m}-0{i + 1}"]) for m in (1, 2, 3)
+        ])
+    responses = [None] * len(paths)
+
+    def run(i):
+        responses[i] = submit(paths[i], server.socket_path, timeout=60)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(paths))]
+    with redirect_stdout(io.StringIO()):
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    assert all(r["ok"] for r in responses)
+    accepted = [a for r in responses for a in r["accepted"]]
+    assert sorted(a["start_date"] for a in accepted) == ["2026-01-01", "2026-02-01", "2026-03-01"]
+    assert sum(len(r["rejected"]) for r in responses) == len(paths) * 3 - 3
+    assert len(read_range_registry(registry)) == 3
+
+
+def test_worker_pool_validates_requests(tmp_path):
+    server, registry = make_server(tmp_path, jobs=2)
+    paths = [
+        make_csv(tmp_path / f"checking__2026-0{m}.csv", [f"2026-0{m}-02"]) for m in (1, 2, 3)
+    ]
+    try:
+        with redirect_stdout(io.StringIO()):
+            response = server.handle({"op": "ingest", "paths": paths})
+    finally:
+        server.close()
+    assert [a["path"] for a in response["accepted"]] == paths
+    assert len(read_range_registry(registry)) == 3
+
+
+def test_cli_submit(running, tmp_path, monkeypatch):
+    server, registry = running
+    path = make_csv(tmp_path / "checking__2026-01.csv", ["2026-01-02"])
+    monkeypatch.chdir(tmp_path)
+    out = io.StringIO()
+    with redirect_stdout(out):
+        run_cli(["submit", "--dry-run", "--socket", server.socket_path, "checking__2026-01.csv"])
+    assert "[DRY-RUN] Would append to registry: checking, 2026-01-01-2026-01-31" in out.getvalue()
+    assert not os.path.exists(registry)
+    out = io.StringIO()
+    with redirect_stdout(out):
+        run_cli(["submit", "--socket", server.socket_path, path])
+    assert "Ingested: checking__2026-01.csv (2026-01-01-2026-01-31)" in out.getvalue()
+    out = io.StringIO()
+    with redirect_stdout(out), pytest.raises(SystemExit):
+        run_cli(["submit", "--socket", server.socket_path, path])
+    assert "[ERROR]" in out.getvalue() and "overlap" in out.getvalue().lower()
+
+
+def test_cli_submit_without_server(tmp_path):
+    path = make_csv(tmp_path / "checking__2026-01.csv", ["2026-01-02"])
+    out = io.StringIO()
+    with redirect_stdout(out), pytest.raises(SystemExit):
+        run_cli(["submit", "--socket", str(tmp_path / "none.sock"), path])
+    assert "No ingest server is listening" in out.getvalue()
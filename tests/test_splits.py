@@ -0,0 +1,95 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from silver_garbanzo.schema import (
+    AMOUNT,
+    CATEGORY,
+    DATE,
+    DESCRIPTION,
+    FINGERPRINT,
+    OVERRIDE_ID,
+    RULE_ID,
+)
+from silver_garbanzo.splits import apply_splits, split_mismatches, splits_frame
+
+
+def _transactions():
+    return pd.DataFrame({
+        DATE: pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]),
+        DESCRIPTION: ["GROCERY MART", "PAYROLL", "BIG BOX STORE", "COFFEE"],
+        AMOUNT: [-45.0, 2500.0, -100.0, -4.5],
+        FINGERPRINT: ["fp-a", "fp-b", "fp-c", "fp-d"],
+        CATEGORY: pd.Categorical(["Groceries", "Income", "Shopping", "Dining"]),
+        OVERRIDE_ID: [-1, -1, 0, -1],
+        RULE_ID: [0, 1, -1, 2],
+    }, index=[10, 11, 12, 13])
+
+
+def test_splits_frame_from_config_map():
+    frame = splits_frame({"fp-a": [("Groceries", 30.0), ("Household", 15.0)]})
+    assert frame.to_dict("list") == {
+        FINGERPRINT: ["fp-a", "fp-a"],
+        CATEGORY: ["Groceries", "Household"],
+        AMOUNT: [30.0, 15.0],
+    }
+
+
+def test_split_rows_replace_original_in_place():
+    splits = {
+        "fp-a": [("Groceries", 30.0), ("Household", 15.0)],
+        "fp-c": [("Shopping", 60.0), ("Gifts", 40.0)],
+    }
+    out, warnings = apply_splits(_transactions(), splits)
+    assert warnings == []
+    assert out[DESCRIPTION].tolist() == [
+        "GROCERY MART", "GROCERY MART", "PAYROLL", "BIG BOX STORE", "BIG BOX STORE", "COFFEE",
+    ]
+    assert out[CATEGORY].tolist() == [
+        "Groceries", "Household", "Income", "Shopping", "Gifts", "Dining",
+    ]
+    # Split amounts take the sign of the transaction they replace
+    assert out[AMOUNT].tolist() == [-30.0, -15.0, 2500.0, -60.0, -40.0, -4.5]
+    assert out.index.tolist() == [10, 10, 11, 12, 12, 13]
+    assert out[OVERRIDE_ID].tolist() == [-1, -1, -1, -1, -1, -1]
+    assert out[RULE_ID].tolist() == [-1, -1, 1, -1, -1, 2]
+    assert isinstance(out[CATEGORY].dtype, pd.CategoricalDtype)
+
+
+def test_signed_split_amounts_are_treated_as_magnitudes():
+    out, _ = apply_splits(_transactions(), {"fp-a": [("Groceries", -30.0), ("Home", -15.0)]})
+    assert out[AMOUNT].tolist()[:2] == [-30.0, -15.0]
+
+
+def test_mismatched_totals_warn_and_are_reported():
+    splits = {"fp-a": [("Groceries", 30.0), ("Household", 10.0)], "fp-b": [("Income", 2500.0)]}
+    out, warnings = apply_splits(_transactions(), splits)
+    assert warnings == ["Split total 40.00 does not match amount -45.00 for fingerprint fp-a"]
+    # Splits are not enforced: the mismatched split is still applied
+    assert out[AMOUNT].tolist()[:2] == [-30.0, -10.0]
+    report = split_mismatches(_transactions(), splits)
+    assert report[FINGERPRINT].tolist() == ["fp-a"]
+    assert report["split_total"].tolist() == [40.0]
+    assert report["difference"].tolist() == [-5.0]
+
+
+def test_sub_cent_rounding_is_not_a_mismatch():
+    _, warnings = apply_splits(_transactions(), {"fp-d": [("Dining", 1.5), ("Tips", 3.0000001)]})
+    assert warnings == []
+
+
+def test_unknown_fingerprints_are_ignored():
+    df = _transactions()
+    out, warnings = apply_splits(df, {"not-in-this-file": [("Other", 1.0)]})
+    assert warnings == []
+    pd.testing.assert_frame_equal(out, df)
+
+
+def test_transactions_sharing_a_fingerprint_are_all_split():
+    df = _transactions()
+    df[FINGERPRINT] = ["fp-a", "fp-b", "fp-a", "fp-d"]
+    df[AMOUNT] = [-45.0, 2500.0, -45.0, -4.5]
+    out, _ = apply_splits(df, {"fp-a": [("Groceries", 30.0), ("Household", 15.0)]})
+    assert out[AMOUNT].tolist() == [-30.0, -15.0, 2500.0, -30.0, -15.0, -4.5]
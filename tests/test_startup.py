@@ -0,0 +1,138 @@
+"""
+test_startup.py — Startup-time regression tests for the CLI.
+
+The CLI is run thousands of times from cron and hooks, so fast-fail paths must not
+import pandas/numpy. Each case runs in a fresh interpreter to observe real imports.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("pandas", "numpy")
+
+SCRIPT = """
+import sys
+from silver_garbanzo.cli import run_cli
+try:
+    run_cli(sys.argv[1:])
+except SystemExit:
+    pass
+print("HEAVY:" + ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def run_and_list_heavy_imports(args, config_dir, registry_path):
+    env = os.environ.copy()
+    env["SILVER_GARBANZO_CONFIG_DIR"] = str(config_dir)
+    env["SILVER_GARBANZO_REGISTRY_PATH"] = str(registry_path)
+    cmd = [sys.executable, "-c", SCRIPT.format(heavy=HEAVY_MODULES), *args]
+    result = subprocess.run(cmd, capture_output=True, text=True, env=env)
+    line = [ln for ln in result.stdout.splitlines() if ln.startswith("HEAVY:")][-1]
+    return result.stdout, line[len("HEAVY:"):]
+
+
+def make_config(tmp_path, overrides=None, splits=None):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "rules.json").write_text('[{"category": "test", "pattern": ".*"}]')
+    if overrides is not None:
+        (config_dir / "overrides.csv").write_text("key,category\n" + overrides)
+    if splits is not None:
+        (config_dir / "splits.csv").write_text("fingerprint,category,amount\n" + splits)
+    return config_dir
+
+
+def make_full_config(tmp_path):
+    return make_config(tmp_path, overrides="ACME,office\n", splits="abc,groceries,42.5\n")
+
+
+def test_help_does_not_import_pandas(tmp_path):
+    stdout, heavy = run_and_list_heavy_imports(
+        ["--help"], make_config(tmp_path), tmp_path / "ingested_ranges.csv"
+    )
+    assert "usage:" in stdout
+    assert heavy == ""
+
+
+def test_config_failure_does_not_import_pandas(tmp_path):
+    csv_path = tmp_path / "checking__2026-01.csv"
+    csv_path.write_text("Date,Description,Amount,Transaction_Type\n2026-01-01,x,1.0,DEBIT\n")
+    stdout, heavy = run_and_list_heavy_imports(
+        [str(csv_path)], tmp_path / "no_config", tmp_path / "ingested_ranges.csv"
+    )
+    assert "[CONFIG VALIDATION FAILED]" in stdout
+    assert heavy == ""
+
+
+def test_filename_contract_failure_does_not_import_pandas(tmp_path):
+    csv_path = tmp_path / "badfile.csv"
+    csv_path.write_text("Date,Description,Amount,Transaction_Type\n2026-01-01,x,1.0,DEBIT\n")
+    stdout, heavy = run_and_list_heavy_imports(
+        [str(csv_path)], make_config(tmp_path), tmp_path / "ingested_ranges.csv"
+    )
+    assert "does not match supported formats" in stdout
+    assert heavy == ""
+
+
+@pytest.mark.parametrize("dry_run", [False, True])
+def test_config_csvs_are_validated_without_pandas(tmp_path, dry_run):
+    # Cold cache (and dry runs never write one), so overrides and splits are validated
+    csv_path = tmp_path / "badfile.csv"
+    csv_path.write_text("Date,Description,Amount,Transaction_Type\n2026-01-01,x,1.0,DEBIT\n")
+    stdout, heavy = run_and_list_heavy_imports(
+        [str(csv_path), *(["--dry-run"] if dry_run else [])],
+        make_full_config(tmp_path),
+        tmp_path / "ingested_ranges.csv",
+    )
+    assert "does not match supported formats" in stdout
+    assert heavy == ""
+
+
+def test_bad_config_csvs_fail_without_pandas(tmp_path):
+    csv_path = tmp_path / "checking__2026-01.csv"
+    csv_path.write_text("Date,Description,Amount,Transaction_Type\n2026-01-01,x,1.0,DEBIT\n")
+    stdout, heavy = run_and_list_heavy_imports(
+        [str(csv_path), "--dry-run"],
+        make_config(tmp_path, overrides="ACME,office\n", splits="abc,groceries,lots\n"),
+        tmp_path / "ingested_ranges.csv",
+    )
+    assert "splits.csv: row 2 amount not a float: lots" in stdout
+    assert heavy == ""
+
+
+def test_valid_ingest_still_loads_pandas(tmp_path):
+    # Guard against the checks above passing because the script never reached ingest
+    csv_path = tmp_path / "checking__2026-01.csv"
+    csv_path.write_text("Date,Description,Amount,Transaction_Type\n2026-01-01,x,1.0,DEBIT\n")
+    stdout, heavy = run_and_list_heavy_imports(
+        [str(csv_path), "--dry-run"], make_full_config(tmp_path), tmp_path / "ingested_ranges.csv"
+    )
+    assert "[DRY-RUN] Would append to registry" in stdout
+    assert "pandas" in heavy
+
+
+def test_submit_client_does_not_import_pandas(tmp_path):
+    csv_path = tmp_path / "checking__2026-01.csv"
+    csv_path.write_text("Date,Description,Amount,Transaction_Type\n2026-01-01,x,1.0,DEBIT\n")
+    stdout, heavy = run_and_list_heavy_imports(
+        ["submit", str(csv_path)], make_config(tmp_path), tmp_path / "ingested_ranges.csv"
+    )
+    assert "No ingest server is listening" in stdout
+    assert heavy == ""
+
+
+def test_registry_queries_do_not_import_pandas(tmp_path):
+    registry = tmp_path / "ingested_ranges.csv"
+    registry.write_text(
+        "account,start_date,end_date,source_file,ingested_at\n"
+        "checking,2026-01-01T00:00:00,2026-01-31T00:00:00,checking__2026-01.csv,"
+        "2026-02-01T00:00:00\n"
+    )
+    stdout, heavy = run_and_list_heavy_imports(
+        ["registry", "coverage"], make_config(tmp_path), registry
+    )
+    assert "checking" in stdout and "2026-01-31" in stdout
+    assert heavy == ""
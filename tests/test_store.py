@@ -0,0 +1,177 @@
+import io
+import os
+from contextlib import redirect_stdout
+
+import pandas as pd
+import pytest
+
+from silver_garbanzo.cli import run_cli
+from silver_garbanzo.config import load_config
+from silver_garbanzo.ingest import StoreTarget, ingest_batch, store_target
+from silver_garbanzo.schema import ACCOUNT, AMOUNT, CATEGORY, DESCRIPTION, RULE_ID
+
+pytest.importorskip("pyarrow")
+
+from silver_garbanzo.store import (  # noqa: E402
+    list_partitions,
+    read_metadata,
+    read_store,
+)
+
+
+def make_csv(path, rows):
+    pd.DataFrame(rows, columns=["Date", "Description", "Amount", "Transaction_Type"]).to_csv(
+        path, index=False
+    )
+
+
+@pytest.fixture
+def target(tmp_path):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "rules.json").write_text(
+        '[{"category": "Groceries", "pattern": "GROCERY"},'
+        ' {"category": "Income", "pattern": "PAY"}]'
+    )
+    return StoreTarget(load_config(str(config_dir)), str(tmp_path / "store"))
+
+
+def test_ingest_writes_partitioned_store(tmp_path, target):
+    csv_path = tmp_path / "checking__2026-01-15__2026-02-14.csv"
+    make_csv(csv_path, [
+        ("2026-01-15", "  GROCERY   MART ", "$30.00", "DEBIT"),
+        ("2026-01-20", "PAYROLL", "1,000.00", "CREDIT"),
+        ("2026-02-14", "UTILITY CO", "(40.00)", "FEE"),
+    ])
+    with redirect_stdout(io.StringIO()):
+        result = ingest_batch(
+            [str(csv_path)], registry_path=str(tmp_path / "ranges.csv"), store=target
+        )
+    assert result.rejected == []
+    assert [w for _, w in result.warnings] == [
+        "1 transaction(s) with unknown Transaction_Type 'FEE': numeric sign kept",
+        "1 uncategorized transaction(s)",
+    ]
+    partitions = list_partitions(target.store_dir)
+    assert [(a, m) for a, m, _ in partitions] == [("checking", "2026-01"), ("checking", "2026-02")]
+    assert os.path.basename(partitions[0][2]) == "checking__2026-01-15__2026-02-14.arrow"
+    stored = read_store(target.store_dir)
+    assert stored[DESCRIPTION].tolist() == ["GROCERY MART", "PAYROLL", "UTILITY CO"]
+    assert stored[AMOUNT].tolist() == [-30.0, 1000.0, -40.0]
+    assert stored[CATEGORY].tolist() == ["Groceries", "Income", "Uncategorized"]
+    assert stored[RULE_ID].tolist() == [0, 1, -1]
+    assert isinstance(stored[ACCOUNT].dtype, pd.CategoricalDtype)
+    metadata = read_metadata(partitions[0][2])
+    assert metadata["source_file"] == "checking__2026-01-15__2026-02-14.csv"
+    assert metadata["config_digest"] == target.config.digest
+
+
+def test_read_store_prunes_partitions_and_columns(tmp_path, target):
+    files = [("checking__2026-01.csv", "2026-01-05"), ("savings__2026-02.csv", "2026-02-05")]
+    for name, date in files:
+        make_csv(tmp_path / name, [(date, "GROCERY", "1.00", "DEBIT")])
+    with redirect_stdout(io.StringIO()):
+        ingest_batch(
+            [str(tmp_path / "checking__2026-01.csv"), str(tmp_path / "savings__2026-02.csv")],
+            registry_path=str(tmp_path / "ranges.csv"),
+            store=target,
+        )
+    stored = read_store(target.store_dir, columns=[ACCOUNT, AMOUNT], months=["2026-02"])
+    assert list(stored.columns) == [ACCOUNT, AMOUNT]
+    assert stored[ACCOUNT].tolist() == ["savings"]
+    assert read_store(target.store_dir, accounts=["nobody"]).empty
+
+
+def test_chunked_store_matches_whole_file(tmp_path, target):
+    rows = [(f"2026-01-{d:02d}", f"GROCERY {d % 3}", f"{d}.00", "DEBIT") for d in range(1, 29)]
+    whole_csv = tmp_path / "checking__2026-01.csv"
+    make_csv(whole_csv, rows)
+    chunked_target = target._replace(store_dir=str(tmp_path / "chunked"))
+    with redirect_stdout(io.StringIO()):
+        ingest_batch([str(whole_csv)], registry_path=str(tmp_path / "a.csv"), store=target)
+        result = ingest_batch(
+            [str(whole_csv)], registry_path=str(tmp_path / "b.csv"), store=chunked_target,
+            chunksize=5,
+        )
+    assert result.warnings == []
+    pd.testing.assert_frame_equal(
+        read_store(target.store_dir), read_store(chunked_target.store_dir)
+    )
+
+
+def test_rejected_and_dry_run_files_leave_no_store_files(tmp_path, target):
+    ok = tmp_path / "checking__2026-01.csv"
+    overlapping = tmp_path / "checking__2026-01-15__2026-02-14.csv"
+    bad_amount = tmp_path / "savings__2026-01.csv"
+    make_csv(ok, [("2026-01-05", "GROCERY", "1.00", "DEBIT")])
+    make_csv(overlapping, [("2026-01-20", "GROCERY", "1.00", "DEBIT")])
+    make_csv(bad_amount, [("2026-01-05", "GROCERY", "1.00", "DEBIT"),
+                          ("2026-01-06", "GROCERY", "twelve", "DEBIT")])
+    with redirect_stdout(io.StringIO()):
+        ingest_batch([str(ok)], registry_path=str(tmp_path / "dry.csv"), store=target,
+                     dry_run=True)
+        assert not os.path.exists(target.store_dir)
+        result = ingest_batch(
+            [str(ok), str(overlapping), str(bad_amount)],
+            registry_path=str(tmp_path / "ranges.csv"),
+            store=target,
+            chunksize=1,
+        )
+    assert [r.filename for r in result.accepted] == ["checking__2026-01.csv"]
+    assert "unparseable amounts: [(2, 'twelve')]" in result.rejected[1][1]
+    stored_files = [os.path.basename(path) for _, _, path in list_partitions(target.store_dir)]
+    assert stored_files == ["checking__2026-01.arrow"]
+    assert not [
+        name for _, _, names in os.walk(target.store_dir) for name in names
+        if name.endswith(".tmp")
+    ]
+
+
+def test_category_cache_saved_after_commit_only(tmp_path, target, monkeypatch):
+    import silver_garbanzo.categorize as categorize_module
+
+    cache_dir = tmp_path / "cache"
+    csv_path = tmp_path / "checking__2026-01.csv"
+    make_csv(csv_path, [("2026-01-05", "GROCERY", "1.00", "DEBIT")])
+    with redirect_stdout(io.StringIO()):
+        ingest_batch(
+            [str(csv_path)],
+            registry_path=str(tmp_path / "dry.csv"),
+            store=store_target(target.config, target.store_dir, str(cache_dir)),
+            dry_run=True,
+        )
+        assert not cache_dir.exists()
+        ingest_batch(
+            [str(csv_path)],
+            registry_path=str(tmp_path / "ranges.csv"),
+            store=store_target(target.config, target.store_dir, str(cache_dir)),
+        )
+    assert [p.name for p in cache_dir.iterdir()] == [f"categorize-{target.config.digest}.json"]
+
+    def fail(*args):
+        raise AssertionError("categorization should come from the cache")
+
+    monkeypatch.setattr(categorize_module, "match_rules", fail)
+    with redirect_stdout(io.StringIO()):
+        result = ingest_batch(
+            [str(csv_path)],
+            registry_path=str(tmp_path / "other.csv"),
+            store=store_target(target.config, str(tmp_path / "other"), str(cache_dir)),
+        )
+    assert result.rejected == []
+    assert read_store(str(tmp_path / "other"))[CATEGORY].tolist() == ["Groceries"]
+
+
+def test_cli_store_flag(tmp_path, monkeypatch):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "rules.json").write_text('[{"category": "Groceries", "pattern": "GROCERY"}]')
+    monkeypatch.setenv("SILVER_GARBANZO_CONFIG_DIR", str(config_dir))
+    monkeypatch.setenv("SILVER_GARBANZO_REGISTRY_PATH", str(tmp_path / "state" / "ranges.csv"))
+    csv_path = tmp_path / "checking__2026-01.csv"
+    make_csv(csv_path, [("2026-01-05", "GROCERY", "1.00", "DEBIT"), ("2026-01-06", "X", "2", "CR")])
+    out = io.StringIO()
+    with redirect_stdout(out):
+        run_cli([str(csv_path), "--store"])
+    assert "[WARNING] 1 uncategorized transaction(s)" in out.getvalue()
+    assert len(read_store(str(tmp_path / "state" / "store"))) == 2
@@ -0,0 +1,144 @@
+import io
+import json
+import os
+import time
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+from silver_garbanzo.config import ConfigError
+from silver_garbanzo.contracts import read_range_registry
+from silver_garbanzo.watch import ConfigWatcher, DirectoryWatcher, already_ingested, watch
+
+
+def make_csv(path, dates):
+    pd.DataFrame({
+        "Date": dates,
+        "Description": ["COFFEE"] * len(dates),
+        "Amount": ["1.00"] * len(dates),
+        "Transaction_Type": ["DEBIT"] * len(dates),
+    }).to_csv(path, index=False)
+
+
+def age(path, seconds):
+    """Backdate a file's mtime so it counts as settled."""
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def make_config(tmp_path):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "rules.json").write_text(json.dumps([{"category": "Coffee", "pattern": "COF"}]))
+    return config_dir
+
+
+class TestDirectoryWatcher:
+    def test_file_is_ready_once_stable_and_settled(self, tmp_path):
+        path = tmp_path / "checking__2026-01.csv"
+        make_csv(path, ["2026-01-02"])
+        watcher = DirectoryWatcher(str(tmp_path), settle=5)
+        now = time.time()
+        assert watcher.poll(now) == []  # first sighting
+        assert watcher.poll(now) == []  # stable but modified too recently
+        assert watcher.poll(now + 10) == [str(path)]
+
+    def test_growing_file_is_not_ready(self, tmp_path):
+        path = tmp_path / "checking__2026-01.csv"
+        make_csv(path, ["2026-01-02"])
+        age(path, 60)
+        watcher = DirectoryWatcher(str(tmp_path), settle=0)
+        watcher.poll()
+        with open(path, "a") as f:
+            f.write("2026-01-03,COFFEE,2.00,DEBIT\n")
+        age(path, 30)
+        assert watcher.poll() == []
+        assert watcher.poll() == [str(path)]
+
+    def test_handled_files_return_only_when_changed(self, tmp_path):
+        path = tmp_path / "checking__2026-01.csv"
+        make_csv(path, ["2026-01-02"])
+        age(path, 60)
+        watcher = DirectoryWatcher(str(tmp_path), settle=0)
+        watcher.poll()
+        assert watcher.poll() == [str(path)]
+        watcher.mark_handled([str(path)])
+        assert watcher.poll() == []
+        make_csv(path, ["2026-01-02", "2026-01-03"])
+        age(path, 30)
+        watcher.poll()
+        assert watcher.poll() == [str(path)]
+
+
+def test_config_watcher_reloads_only_on_change(tmp_path):
+    config_dir = make_config(tmp_path)
+    watcher = ConfigWatcher(str(config_dir))
+    config, reloaded = watcher.get()
+    assert reloaded
+    assert watcher.get() == (config, False)
+    (config_dir / "rules.json").write_text("not json")
+    try:
+        watcher.get()
+    except ConfigError as e:
+        assert "rules.json" in " ".join(e.errors)
+    else:
+        raise AssertionError("expected ConfigError")
+    (config_dir / "rules.json").write_text(json.dumps([{"category": "X", "pattern": "X"}]))
+    config, reloaded = watcher.get()
+    assert reloaded and config.rules.categories == ["X"]
+
+
+def test_watch_ingests_new_files_and_skips_ingested_ones(tmp_path):
+    config_dir = make_config(tmp_path)
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    registry = str(tmp_path / "state" / "ranges.csv")
+    old = raw / "checking__2025-12.csv"
+    make_csv(old, ["2025-12-02"])
+    age(old, 60)
+    from silver_garbanzo.ingest import ingest_batch
+
+    with redirect_stdout(io.StringIO()):
+        ingest_batch([str(old)], registry_path=registry)
+    assert already_ingested(str(old), registry)
+    new = raw / "checking__2026-01.csv"
+    bad = raw / "savings__2026-01.csv"
+    make_csv(new, ["2026-01-05"])
+    make_csv(bad, ["2026-02-05"])
+    age(new, 60)
+    age(bad, 60)
+    events = []
+    with redirect_stdout(io.StringIO()):
+        watch(
+            str(raw),
+            lambda event, payload: events.append((event, payload)),
+            registry_path=registry,
+            interval=0,
+            settle=0,
+            config_watcher=ConfigWatcher(str(config_dir)),
+            max_polls=3,
+        )
+    batches = [payload for event, payload in events if event == "batch"]
+    assert len(batches) == 1
+    result, paths = batches[0]
+    assert sorted(paths) == [str(new), str(bad)]
+    assert [r.filename for r in result.accepted] == ["checking__2026-01.csv"]
+    assert [os.path.basename(p) for p, _ in result.rejected] == ["savings__2026-01.csv"]
+    assert [r["source_file"] for r in read_range_registry(registry)] == [
+        "checking__2025-12.csv", "checking__2026-01.csv",
+    ]
+
+
+def test_cli_report_event_prints_config_changes_with_prefix():
+    from silver_garbanzo.cli import _report_event
+
+    out = io.StringIO()
+    with redirect_stdout(out):
+        _report_event("[WATCH]", "New files wait", "config", None)
+        _report_event("[SERVE]", "Requests fail", "config", ConfigError(["a", "b"]))
+    assert out.getvalue().splitlines() == [
+        "[WATCH] Config changed; reloaded",
+        "[CONFIG VALIDATION FAILED] Requests fail",
+        "  - a",
+        "  - b",
+    ]